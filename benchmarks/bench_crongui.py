@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# Benchmarks for crongui against synthetic crontabs.
+#
+# Times load_crontab, update_entries_display, on_entry_select, import_crontab,
+# export_crontab and save_crontab for crontabs of 10 to 100k entries, with a
+# fake `crontab` binary on PATH so the real crontab is never touched.
+#
+# Runs headless by default with the Tk layer stubbed out. Use --tk to drive
+# real Tk widgets instead (needs a display, e.g. under xvfb-run).
+#
+#   python3 benchmarks/bench_crongui.py --sizes 10,1000,100000 --output bench.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (weight, schedule) pairs roughly like a real server's crontab
+SCHEDULE_MIX = [
+    (20, lambda rnd: "* * * * *"),
+    (20, lambda rnd: f"*/{rnd.choice([2, 5, 10, 15, 30])} * * * *"),
+    (20, lambda rnd: f"{rnd.randrange(60)} * * * *"),
+    (15, lambda rnd: f"{rnd.randrange(60)} {rnd.randrange(24)} * * *"),
+    (10, lambda rnd: f"{rnd.randrange(60)} {rnd.randrange(24)} * * {rnd.randrange(7)}"),
+    (5, lambda rnd: f"{rnd.randrange(60)} {rnd.randrange(24)} {rnd.randrange(1, 29)} * *"),
+    (5, lambda rnd: "0,15,30,45 8-17 * * mon-fri"),
+    (3, lambda rnd: f"{rnd.randrange(60)} {rnd.randrange(24)} 1 jan,jul *"),
+    (2, lambda rnd: "0 0 30 2 *"),
+]
+
+COMMANDS = [
+    "/usr/local/bin/backup.sh --target /srv/backup/{n}",
+    "rsync -a /var/www/site{n}/ backup:/srv/www/site{n}/",
+    "/usr/bin/php /var/www/app{n}/artisan schedule:run > /dev/null 2>&1",
+    "find /tmp/cache{n} -mtime +7 -delete",
+    "curl -fsS https://example.com/ping/{n} > /dev/null",
+    "nice -n 10 ionice -c3 /opt/jobs/report{n}.py",
+    "pg_dump db{n} | gzip > /var/backups/db{n}.sql.gz",
+]
+
+
+def make_crontab(size, seed=0):
+    rnd = random.Random(seed)
+    weights = [weight for weight, _ in SCHEDULE_MIX]
+    makers = [maker for _, maker in SCHEDULE_MIX]
+    
+    lines = ["# synthetic crontab generated by bench_crongui.py", "MAILTO=\"\"", ""]
+    for n in range(size):
+        line = f"{rnd.choices(makers, weights)[0](rnd)} {rnd.choice(COMMANDS).format(n=n)}"
+        if rnd.random() < 0.3:
+            line += f" # job {n}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def install_fake_crontab(work_dir):
+    # a `crontab` that reads and writes a plain file instead of the spool
+    bin_dir = os.path.join(work_dir, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    path = os.path.join(bin_dir, "crontab")
+    with open(path, 'w') as file:
+        file.write(
+            "#!/bin/sh\n"
+            "F=\"$CRONGUI_BENCH_CRONTAB\"\n"
+            "if [ \"$1\" = \"-l\" ]; then\n"
+            "  [ -f \"$F\" ] || { echo \"no crontab for $USER\" >&2; exit 1; }\n"
+            "  exec cat \"$F\"\n"
+            "fi\n"
+            "if [ \"$1\" = \"-\" ]; then exec cat > \"$F\"; fi\n"
+            "exec cp \"$1\" \"$F\"\n"
+        )
+    os.chmod(path, 0o755)
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+    return path
+
+
+class StubWidget:
+    # stands in for any Tk widget, every method is a no-op
+    def __init__(self, *args, **kwargs):
+        self._text = ""
+    
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: StubWidget()
+    
+    def __call__(self, *args, **kwargs):
+        return StubWidget()
+    
+    def get(self, *args):
+        return self._text
+    
+    def insert(self, index, text=""):
+        self._text = str(text)
+    
+    def delete(self, *args):
+        self._text = ""
+
+
+class StubTreeview(StubWidget):
+    # keeps rows in a dict so the Treeview calls crongui makes cost something
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.rows = {"": {"values": (), "children": [], "parent": None}}
+        self.selected = ()
+        self.counter = 0
+        self.headings = {}
+    
+    def insert(self, parent, index, iid=None, **kwargs):
+        if iid is None:
+            self.counter += 1
+            iid = f"I{self.counter}"
+        self.rows[iid] = {"values": tuple(kwargs.get("values", ())), "text": kwargs.get("text", ""), "children": [],
+                          "parent": parent}
+        children = self.rows[parent]["children"]
+        if index == "end":
+            children.append(iid)
+        else:
+            children.insert(int(index), iid)
+        return iid
+    
+    def delete(self, *items):
+        for iid in items:
+            row = self.rows.pop(iid)
+            for child in row["children"]:
+                self.rows.pop(child, None)
+            if row["parent"] is not None:
+                self.rows[row["parent"]]["children"].remove(iid)
+        self.selected = tuple(iid for iid in self.selected if iid in self.rows)
+    
+    def get_children(self, item=""):
+        return tuple(self.rows[item]["children"])
+    
+    def item(self, iid, option=None, **kwargs):
+        if kwargs:
+            self.rows[iid].update(kwargs)
+            return None
+        values = {"values": list(self.rows[iid]["values"]), "text": self.rows[iid]["text"], "open": True}
+        return values[option] if option else values
+    
+    def exists(self, iid):
+        return iid in self.rows
+    
+    def parent(self, iid):
+        return self.rows[iid]["parent"]
+    
+    def index(self, iid):
+        return self.rows[self.rows[iid]["parent"]]["children"].index(iid)
+    
+    def set_children(self, parent, *items):
+        for iid in self.rows[parent]["children"]:
+            self.rows[iid]["parent"] = None
+        moved = set(items)
+        for old in {self.rows[iid]["parent"] for iid in items} - {None, parent}:
+            self.rows[old]["children"] = [iid for iid in self.rows[old]["children"] if iid not in moved]
+        for iid in items:
+            self.rows[iid]["parent"] = parent
+        self.rows[parent]["children"] = list(items)
+    
+    def move(self, iid, parent, index):
+        self.rows[self.rows[iid]["parent"]]["children"].remove(iid)
+        children = self.rows[parent]["children"]
+        if index == "end":
+            children.append(iid)
+        else:
+            children.insert(int(index), iid)
+        self.rows[iid]["parent"] = parent
+    
+    def heading(self, column, option=None, **kwargs):
+        heading = self.headings.setdefault(column, {"text": ""})
+        heading.update(kwargs)
+        return heading[option] if option else None
+    
+    def selection(self):
+        return self.selected
+    
+    def selection_set(self, *items):
+        if len(items) == 1 and isinstance(items[0], (list, tuple)):
+            items = items[0]
+        self.selected = tuple(items)
+    
+    def identify_row(self, y):
+        return ""
+
+
+class StubVar:
+    def __init__(self, master=None, value=None, **kwargs):
+        self.value = value
+    
+    def get(self):
+        return self.value
+    
+    def set(self, value):
+        self.value = value
+
+
+def install_stub_tk():
+    # a fake tkinter package, installed before crongui is imported
+    tk = types.ModuleType("tkinter")
+    ttk = types.ModuleType("tkinter.ttk")
+    for module in (tk, ttk):
+        module.__getattr__ = lambda name: type(name, (StubWidget,), {})
+    ttk.Treeview = StubTreeview
+    tk.StringVar = tk.BooleanVar = tk.IntVar = StubVar
+    tk.TclError = RuntimeError
+    for name in ("END", "LEFT", "RIGHT", "TOP", "BOTTOM", "BOTH", "X", "Y", "W", "E", "N", "S", "EW", "NSEW",
+                 "VERTICAL", "HORIZONTAL", "NORMAL", "DISABLED", "WORD", "NONE", "INSERT"):
+        setattr(tk, name, name.lower())
+    
+    tk.ttk = ttk
+    tk.messagebox = types.ModuleType("tkinter.messagebox")
+    tk.filedialog = types.ModuleType("tkinter.filedialog")
+    tk.simpledialog = types.ModuleType("tkinter.simpledialog")
+    for name in ("ttk", "messagebox", "filedialog", "simpledialog"):
+        sys.modules[f"tkinter.{name}"] = getattr(tk, name)
+    sys.modules["tkinter"] = tk
+
+
+def answer_dialogs(crongui, answers):
+    # dialogs answer themselves: yes to every question, files from answers
+    for name in ("showinfo", "showwarning", "showerror"):
+        setattr(crongui.messagebox, name, lambda *args, **kwargs: "ok")
+    for name in ("askyesno", "askokcancel", "askyesnocancel"):
+        setattr(crongui.messagebox, name, lambda *args, **kwargs: True)
+    crongui.filedialog.askopenfilename = lambda *args, **kwargs: answers["open"]
+    crongui.filedialog.asksaveasfilename = lambda *args, **kwargs: answers["save"]
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "max": max(times)}
+
+
+def bench_size(crongui, root, work_dir, size, repeat, seed):
+    crontab_path = os.environ["CRONGUI_BENCH_CRONTAB"]
+    import_path = os.path.join(work_dir, f"import-{size}.cron")
+    export_path = os.path.join(work_dir, f"export-{size}.cron")
+    
+    with open(crontab_path, 'w') as file:
+        file.write(make_crontab(size, seed))
+    # a different crontab of the same size, so import has real changes to apply
+    with open(import_path, 'w') as file:
+        file.write(make_crontab(size, seed + 1))
+    
+    answers = {"open": import_path, "save": export_path}
+    answer_dialogs(crongui, answers)
+    
+    # start from a full load, not the last size's snapshot
+    snapshot_path = crongui.snapshot_path(crongui.effective_user())
+    if os.path.exists(snapshot_path):
+        os.unlink(snapshot_path)
+    
+    app = crongui.ModernCronGUI(root)
+    entries = len(app.crontab_entries)
+    middle = str(entries // 2)
+    
+    def select():
+        app.entries_tree.selection_set(middle)
+        app.on_entry_select(None)
+    
+    def sort_and_group():
+        app.group_by.set("Owner")
+        app.sort_by("schedule")
+        app.group_by.set("None")
+        app.sort_by("command")
+    
+    def import_and_revert():
+        app.import_crontab()
+        app.undo()
+    
+    # the same entries spread over 50 directory hosts, fetched all at once
+    hosts_dir = os.path.join(work_dir, f"hosts-{size}")
+    for number in range(50):
+        os.makedirs(os.path.join(hosts_dir, f"host{number}"), exist_ok=True)
+        with open(os.path.join(hosts_dir, f"host{number}", "crontab"), 'w') as file:
+            file.write(make_crontab(max(1, size // 50), seed + number))
+    transports = [crongui.host_transport(spec) for spec in crongui.directory_hosts(hosts_dir)]
+    
+    results = {
+        "entries": entries,
+        "load_crontab": timed(app.load_crontab, repeat),
+        # the part of a reopen that happens before the window shows
+        "open_snapshot": timed(app.open_snapshot, repeat),
+        "update_entries_display": timed(app.update_entries_display, repeat),
+        "on_entry_select": timed(select, repeat),
+        "import_crontab": timed(import_and_revert, repeat),
+        "export_crontab": timed(app.export_crontab, repeat),
+        "save_crontab": timed(app.save_crontab, repeat),
+        "find_duplicates": timed(lambda: crongui.find_duplicates(app.crontab_entries, app.entry_meta, app.entry_zones),
+                                 repeat),
+        "sort_and_group": timed(sort_and_group, repeat),
+        # the imported crontab against the loaded one, lined up by job
+        "crontab_diff": timed(lambda: crongui.crontab_diff(
+            [[(line, None) for line in app.crontab_entries],
+             crongui.parse_crontab_lines(crongui.read_text(import_path))]), repeat),
+        "fetch_one_host": timed(lambda: crongui.fetch_host(transports[0]), repeat),
+        "fetch_50_hosts": timed(lambda: crongui.for_hosts(crongui.fetch_host, transports), repeat),
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark crongui against synthetic crontabs")
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000", help="comma separated entry counts")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic crontabs")
+    parser.add_argument("--tk", action="store_true", help="use real Tk widgets (needs a display)")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory(prefix="crongui-bench-") as work_dir:
+        run_benchmarks(args, work_dir)
+
+
+def run_benchmarks(args, work_dir):
+    # keep caches, stats and settings out of the real home directory
+    for name in ("HOME", "XDG_CACHE_HOME", "XDG_DATA_HOME", "XDG_CONFIG_HOME"):
+        os.environ[name] = os.path.join(work_dir, "home") if name == "HOME" else os.path.join(work_dir, name.lower())
+    os.environ["CRONGUI_BENCH_CRONTAB"] = os.path.join(work_dir, "crontab")
+    install_fake_crontab(work_dir)
+    
+    if not args.tk:
+        install_stub_tk()
+    
+    sys.path.insert(0, REPO_DIR)
+    import crongui
+    
+    # the host's real cron logs, /etc/cron.d and other users' crontabs would
+    # make timings depend on the machine
+    crongui.DEFAULT_CRON_LOGS = []
+    crongui.CRON_D_DIR = os.path.join(work_dir, "cron.d")
+    crongui.SPOOL_DIRS = []
+    
+    root = crongui.tk.Tk()
+    if args.tk:
+        root.withdraw()
+    
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tk": "real" if args.tk else "stub",
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "sizes": {},
+    }
+    
+    for size in (int(size) for size in args.sizes.split(",")):
+        results["sizes"][str(size)] = bench_size(crongui, root, work_dir, size, args.repeat, args.seed)
+        print(f"{size} entries done", file=sys.stderr)
+    
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
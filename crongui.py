@@ -1,14 +1,2552 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+except ImportError:
+    # the headless modes (e.g. crongui record) don't need python3-tk
+    tk = None
 import subprocess
 import re
 import os
 import sys
 import tempfile
+import difflib
+import json
+import mmap
+import threading
+import time
+import shlex
+import signal
+import hashlib
+import argparse
+import bisect
+import math
+import functools
+import queue
+import select
+import codecs
+import struct
+import ctypes
+import ctypes.util
+import calendar
+import heapq
+import base64
+import secrets
+import statistics
+from collections import deque, Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    # before python 3.9 only the host's own time zone can be used
+    ZoneInfo = None
+
+# where crongui keeps its caches and indexes
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "crongui")
+
+# user settings
+CONFIG_DIR = os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "crongui")
+SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.json")
+
+# where crongui keeps data that should survive a cache clear
+DATA_DIR = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "crongui")
+STATS_DB = os.path.join(DATA_DIR, "stats.db")
+
+# the current user's crontab, as opposed to files under /etc/cron.d
+USER_SOURCE = "crontab"
+
+# system crontabs, these have a user field before the command
+CRON_D_DIR = "/etc/cron.d"
+
+# where `crontab` keeps per-user crontabs on debian, rhel and bsd/mac
+SPOOL_DIRS = ["/var/spool/cron/crontabs", "/var/spool/cron", "/var/spool/cron/tabs", "/usr/lib/cron/tabs"]
+
+# cron's own log output, debian/ubuntu then rhel style
+DEFAULT_CRON_LOGS = ["/var/log/syslog", "/var/log/cron"]
+
+
+def invert_op(op):
+    # the op that undoes op
+    if op[0] == "insert":
+        return ("delete",) + op[1:]
+    if op[0] == "delete":
+        return ("insert",) + op[1:]
+    return ("modify", op[1], op[3], op[2], op[4])
+
+
+def diff_ops(old, new, start=0, meta=None):
+    # turn old -> new into a short list of insert/delete/modify ops, worked
+    # back to front so each op's index is still valid when it is applied.
+    # old sits at start in the full entry list and all of it shares meta
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        common = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for k in range(common):
+            ops.append(("modify", start + i1 + k, old[i1 + k], new[j1 + k], meta))
+        for k in range(i2 - 1, i1 + common - 1, -1):
+            ops.append(("delete", start + k, old[k], meta))
+        for k in range(j1 + common, j2):
+            ops.append(("insert", start + i1 + k - j1, new[k], meta))
+    return ops
+
+
+def split_entry(entry):
+    # schedule, command and comment of a crontab line, schedule is None if
+    # the line doesn't have one
+    comment = ""
+    if '#' in entry:
+        entry_parts, comment = entry.split('#', 1)
+        entry_parts = entry_parts.strip()
+        comment = comment.strip()
+    else:
+        entry_parts = entry
+    
+    # @reboot, @daily and the like stand in for all five fields
+    if entry_parts.startswith('@'):
+        parts = entry_parts.split(None, 1)
+        if len(parts) == 2 and parts[0] in SCHEDULE_MACROS:
+            return parts[0], parts[1], comment
+        return None, entry_parts, comment
+    
+    parts = entry_parts.split(None, 5)
+    
+    if len(parts) >= 6:
+        return " ".join(parts[:5]), parts[5], comment
+    return None, entry_parts, comment
+
+
+def join_entry(schedule, command, comment=""):
+    entry = f"{schedule} {command}"
+    if comment:
+        entry = f"{entry} # {comment}"
+    return entry
+
+
+# a command wrapped by "crongui record", see wrap_recorded()
+QUOTED_ARG = r"(?:'[^']*'|\S+)"
+RECORD_RE = re.compile(rf"^{QUOTED_ARG} {QUOTED_ARG} record --db ({QUOTED_ARG}) --job (\w+) -- /bin/sh -c (.+)$")
+
+
+def job_id(command):
+    # runtime stats are keyed by the unwrapped command so they survive re-wrapping
+    return hashlib.sha1(command.encode("utf-8")).hexdigest()[:12]
+
+
+def unwrap_recorded(command):
+    # a boot stagger goes in front of the record wrapper, see wrap_recorded()
+    match = RECORD_RE.match(split_stagger(command)[1])
+    if not match:
+        return command
+    return shlex.split(match.group(3))[0]
+
+
+def recorded_db(command):
+    # the stats database a recorded command writes to
+    return shlex.split(RECORD_RE.match(split_stagger(command)[1]).group(1))[0]
+
+
+def wrap_recorded(command, db_path=STATS_DB):
+    # a boot stagger stays in front, so the sleep isn't timed as part of the job
+    prefix, command = split_stagger(command)
+    if RECORD_RE.match(command):
+        return prefix + command
+    
+    # cron turns unescaped % into newlines before the shell sees it, which
+    # would break the quoting below
+    if re.search(r"(?<!\\)%", command):
+        raise ValueError("commands containing % can't be wrapped")
+    
+    return prefix + " ".join([
+        shlex.quote(sys.executable),
+        shlex.quote(os.path.abspath(__file__)),
+        "record --db", shlex.quote(db_path),
+        "--job", job_id(command),
+        "-- /bin/sh -c", shlex.quote(command),
+    ])
+
+
+class RunStats:
+    # runtime stats recorded by "crongui record". each run is appended as one
+    # line to a spool file, which is cheap enough to do every minute, and the
+    # spool is folded into sqlite in batches
+    FLUSH_SIZE = 64 * 1024
+    
+    def __init__(self, path=STATS_DB):
+        self.path = path
+        self.spool_path = path + ".spool"
+    
+    def append(self, job, start, duration, exit_code, cpu, max_rss):
+        line = f"{job}\t{start:.3f}\t{duration:.3f}\t{exit_code}\t{cpu:.3f}\t{max_rss}\n"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        
+        # a single O_APPEND write, so concurrent jobs don't interleave
+        fd = os.open(self.spool_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line.encode("utf-8"))
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        
+        if size >= self.FLUSH_SIZE:
+            self.flush(blocking=False)
+    
+    def connect(self):
+        import sqlite3
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        db = sqlite3.connect(self.path)
+        db.execute("CREATE TABLE IF NOT EXISTS runs (job TEXT, start REAL, duration REAL, "
+                   "exit_code INTEGER, cpu REAL, max_rss INTEGER)")
+        # covers the count, failure and percentile queries in summary()
+        db.execute("CREATE INDEX IF NOT EXISTS runs_by_job ON runs (job, duration, exit_code)")
+        return db
+    
+    def flush(self, blocking=True):
+        if not os.path.exists(self.spool_path):
+            return
+        
+        import fcntl
+        
+        with open(self.path + ".lock", 'a') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                # someone else is already flushing
+                return
+            
+            # move the spool aside so jobs can keep appending to a new one
+            batch_path = self.spool_path + ".batch"
+            if not os.path.exists(batch_path):
+                try:
+                    os.rename(self.spool_path, batch_path)
+                except FileNotFoundError:
+                    return
+            
+            db = self.connect()
+            done = 0
+            with open(batch_path, 'rb') as batch:
+                while True:
+                    # pick up anything a job wrote just before the rename
+                    batch.seek(done)
+                    data = batch.read()
+                    if not data:
+                        break
+                    complete = data[:data.rfind(b"\n") + 1]
+                    rows = [line.split("\t") for line in complete.decode("utf-8").splitlines()]
+                    with db:
+                        db.executemany("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                                       [row for row in rows if len(row) == 6])
+                    done += len(complete)
+                    if len(complete) < len(data):
+                        break
+            db.close()
+            os.unlink(batch_path)
+    
+    def summary(self, jobs):
+        # run count, failure rate and duration p50/p95 for each job
+        if not os.path.exists(self.path) and not os.path.exists(self.spool_path):
+            return {}
+        
+        self.flush()
+        db = self.connect()
+        results = {}
+        
+        for job in jobs:
+            count, failures = db.execute(
+                "SELECT COUNT(*), SUM(exit_code != 0) FROM runs WHERE job = ?", (job,)).fetchone()
+            if not count:
+                continue
+            
+            def percentile(fraction):
+                return db.execute(
+                    "SELECT duration FROM runs WHERE job = ? ORDER BY duration LIMIT 1 OFFSET ?",
+                    (job, min(count - 1, int(count * fraction)))).fetchone()[0]
+            
+            results[job] = {
+                "runs": count,
+                "failure_rate": (failures or 0) / count,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+            }
+        
+        db.close()
+        return results
+
+
+def record_run(db_path, job, argv):
+    # run argv, pass its exit status back to cron and record how it went
+    start = time.time()
+    pid = os.posix_spawnp(argv[0], argv, os.environ)
+    
+    # let timeout/kill on the wrapper reach the job itself
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(sig, lambda signum, frame: os.kill(pid, signum))
+    
+    while True:
+        try:
+            _, status, usage = os.wait4(pid, 0)
+            break
+        except InterruptedError:
+            continue
+    
+    duration = time.time() - start
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code < 0:
+        exit_code = 128 - exit_code
+    
+    try:
+        RunStats(db_path).append(job, start, duration, exit_code,
+                                 usage.ru_utime + usage.ru_stime, usage.ru_maxrss)
+    except OSError as e:
+        # never fail the job because the stats couldn't be written
+        print(f"crongui record: {e}", file=sys.stderr)
+    
+    return exit_code
+
+
+def format_duration(seconds):
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def load_settings():
+    try:
+        with open(SETTINGS_FILE, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_settings(settings):
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile(mode='w', dir=CONFIG_DIR, delete=False) as temp_file:
+        json.dump(settings, temp_file, indent=2)
+    os.replace(temp_file.name, SETTINGS_FILE)
+
+
+# defaults for the resource limit wrappers, overridden by "governor" in settings.json
+GOVERNOR_DEFAULTS = {"nice": 10, "ionice_class": 3, "timeout": "1h", "flock": True, "lock_dir": "/tmp"}
+
+# how crongui spreads out @reboot jobs: a sleep before the job starts, or a
+# lock from a small set the jobs queue on, see stagger_command()
+STAGGER_RE = re.compile(r"^sleep\s+(\d+)([smh]?)\s*&&\s*")
+BOOT_LOCK_RE = re.compile(r"^flock\s+(\S*crongui-boot-\d+\.lock)\s+")
+
+# resource limit wrappers, in the order crongui adds them. a boot stagger
+# comes first so the limits apply to the job rather than the sleep
+WRAPPER_RES = [
+    ("stagger", STAGGER_RE),
+    ("nice", re.compile(r"^(?:\S*/)?nice(?:\s+-n\s*-?\d+|\s+--adjustment=-?\d+|\s+-\d+)?\s+")),
+    ("ionice", re.compile(r"^(?:\S*/)?ionice(?:\s+-[cn]\s*\d|\s+-t|\s+--class(?:=|\s+)\w+|\s+--classdata(?:=|\s+)\d)*\s+")),
+    ("timeout", re.compile(r"^(?:\S*/)?timeout(?:\s+-[sk]\s*\S+|\s+--\S+|\s+-v)*\s+\d+(?:\.\d+)?[smhd]?\s+")),
+    ("flock", re.compile(r"^(?:\S*/)?flock(?:\s+-[nsxuoFE]+|\s+-w\s*\S+|\s+--(?:nonblock|shared|exclusive|unlock|close|wait=\S+|timeout=\S+))*\s+(?!-)\S+\s+")),
+]
+
+# the wrappers that are resource limits, which the limits audit looks for
+LIMIT_KINDS = ("nice", "ionice", "timeout", "flock")
+
+
+def strip_wrappers(command):
+    # split a command into its leading resource wrappers and what they run
+    wrappers = []
+    while True:
+        for kind, regex in WRAPPER_RES:
+            match = regex.match(command)
+            if match:
+                wrappers.append((kind, match.group(0)))
+                command = command[match.end():]
+                break
+        else:
+            return wrappers, command
+
+
+# what nice, timeout and the rest can't exec on their own: lists, pipes,
+# redirections, substitutions, leading VAR=value and shell builtins
+SHELL_SYNTAX_RE = re.compile(r"[;&|<>()`$\n]|^\s*[A-Za-z_][A-Za-z0-9_]*=")
+SHELL_BUILTINS = {"cd", ".", "source", "export", "unset", "set", "exec", "eval", "ulimit", "umask",
+                  "if", "for", "while", "until", "case", "{", "!"}
+# a command crongui handed to a shell, see wrap_command()
+SHELL_WRAP_RE = re.compile(r"^/bin/sh -c ((?:'[^']*'|\"'\")+)$")
+
+
+def needs_shell(command):
+    words = command.split(None, 1)
+    return bool(SHELL_SYNTAX_RE.search(command)) or bool(words) and words[0] in SHELL_BUILTINS
+
+
+def unwrap_shell(command):
+    # the command wrap_command() put under /bin/sh -c, or command as it is
+    match = SHELL_WRAP_RE.match(command)
+    return shlex.split(match.group(1))[0] if match else command
+
+
+def wrap_command(command, settings, kinds=LIMIT_KINDS):
+    # add whichever wrappers are missing, after any that are already there.
+    # a recorded job keeps its record wrapper outermost, so it still reads
+    # as recorded and the limits apply to the job rather than the recorder
+    original = unwrap_recorded(command)
+    if original != command:
+        wrapped = wrap_command(original, settings, kinds)
+        if wrapped == original:
+            return command
+        return wrap_recorded(split_stagger(command)[0] + wrapped, recorded_db(command))
+    
+    wrappers, inner = strip_wrappers(command)
+    present = {kind for kind, _ in wrappers}
+    
+    added = []
+    for kind in kinds:
+        if kind in present:
+            continue
+        if kind == "nice" and settings.get("nice") not in (None, ""):
+            added.append(f"nice -n {settings['nice']}")
+        elif kind == "ionice" and settings.get("ionice_class") not in (None, ""):
+            added.append(f"ionice -c{settings['ionice_class']}")
+        elif kind == "timeout" and settings.get("timeout"):
+            added.append(f"timeout {settings['timeout']}")
+        elif kind == "flock" and settings.get("flock"):
+            lock = os.path.join(settings.get("lock_dir") or "/tmp", f"crongui-{job_id(unwrap_recorded(inner))}.lock")
+            added.append(f"flock -n {lock}")
+    
+    if not added:
+        return command
+    
+    # the wrappers exec their argument, anything more needs a shell. cron
+    # would cut the quoted command short at a bare %
+    if needs_shell(inner) and not SHELL_WRAP_RE.match(inner):
+        if re.search(r"(?<!\\)%", inner):
+            raise ValueError("commands containing % can't be wrapped")
+        inner = "/bin/sh -c " + shlex.quote(inner)
+    return "".join(text for _, text in wrappers) + " ".join(added) + " " + inner
+
+
+def unwrap_command(command):
+    return strip_wrappers(command)[1]
+
+
+
+def split_stagger(command):
+    # (the boot stagger stagger_command() put in front, the rest)
+    end = 0
+    match = STAGGER_RE.match(command)
+    if match:
+        end = match.end()
+    match = BOOT_LOCK_RE.match(command[end:])
+    if match:
+        end += match.end()
+    return command[:end], command[end:]
+
+
+def boot_stagger(command):
+    # (delay in seconds, boot lock or None) a command was staggered with
+    match = STAGGER_RE.match(command)
+    delay = 0
+    if match:
+        delay = int(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+        command = command[match.end():]
+    match = BOOT_LOCK_RE.match(command)
+    return delay, match.group(1) if match else None
+
+
+def stagger_command(command, delay=0, lock=None):
+    # a command with its boot stagger swapped for a sleep of delay seconds
+    # and/or waiting its turn on lock. stagger_command(command) removes it
+    match = STAGGER_RE.match(command)
+    if match:
+        command = command[match.end():]
+    match = BOOT_LOCK_RE.match(command)
+    if match:
+        command = command[match.end():]
+    
+    if lock:
+        command = f"flock {lock} {command}"
+    if delay:
+        command = f"sleep {delay} && {command}"
+    return command
+
+
+def boot_burst(commands):
+    # most of these @reboot commands that can be running at once: those with
+    # the same sleep start together, and each boot lock lets one through
+    delays = Counter()
+    locks = set()
+    for command in commands:
+        delay, lock = boot_stagger(command)
+        if lock:
+            locks.add(lock)
+        else:
+            delays[delay] += 1
+    return max(delays.values(), default=0) + len(locks)
+
+
+# what cron's @ schedules stand for. @reboot runs once when cron starts and
+# never by the clock
+SCHEDULE_MACROS = {
+    "@reboot": None,
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# schedule fields, their value ranges and the names cron accepts
+CRON_FIELDS = [("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7)]
+MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+WEEKDAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+
+def field_value(text, names):
+    text = text.lower()
+    if names and text in names:
+        return names[text]
+    return int(text)
+
+
+def parse_cron_field(text, low, high, names=None):
+    # one schedule field as a bitmask with bit n set when value n matches
+    mask = 0
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+        
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (field_value(value, names) for value in part.split('-', 1))
+        else:
+            start = field_value(part, names)
+            # "5/15" means from 5 to the end in steps of 15
+            end = high if step != 1 else start
+        
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"bad field: {text}")
+        
+        for value in range(start, end + 1, step):
+            mask |= 1 << value
+    return mask
+
+
+def mask_values(mask):
+    return [value for value in range(mask.bit_length()) if mask >> value & 1]
+
+
+def field_text(mask, low, high, star=None):
+    # shortest way to write a field's values. star=True only allows forms
+    # starting with *, star=False rules them out, None if there isn't one
+    values = mask_values(mask)
+    options = []
+    
+    if len(values) > 2:
+        step = values[1] - values[0]
+        if all(b - a == step for a, b in zip(values, values[1:])):
+            if values[0] == low and values[-1] + step > high:
+                options.append("*" if step == 1 else f"*/{step}")
+            options.append(f"{values[0]}-{values[-1]}" if step == 1 else f"{values[0]}-{values[-1]}/{step}")
+    elif values == list(range(low, high + 1)):
+        options.append("*")
+    
+    # runs of three or more as ranges, the rest as a list
+    parts = []
+    run_start = 0
+    for i in range(1, len(values) + 1):
+        if i == len(values) or values[i] != values[i - 1] + 1:
+            run = values[run_start:i]
+            parts += [f"{run[0]}-{run[-1]}"] if len(run) > 2 else [str(value) for value in run]
+            run_start = i
+    options.append(",".join(parts))
+    
+    if star is not None:
+        options = [option for option in options if option.startswith('*') == star]
+    return min(options, key=len, default=None)
+
+
+@lru_cache(maxsize=None)
+def month_weekdays(year, month):
+    # day of month bitmasks for each weekday of a month, sunday first
+    masks = [0] * 7
+    first = date(year, month, 1).isoweekday() % 7
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        masks[(first + day - 1) % 7] |= 1 << day
+    return masks
+
+
+class CronSchedule:
+    # a five field schedule compiled to bitmasks
+    def __init__(self, minutes, hours, days, months, weekdays, day_star, weekday_star, reboot=False):
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        # 7 is another way of saying sunday
+        self.weekdays = (weekdays | (weekdays >> 7)) & 0x7f
+        # cron only ANDs day of month and weekday when one of them starts with *
+        self.day_star = day_star
+        self.weekday_star = weekday_star
+        self.every_hour = hours == 0xffffff
+        # @reboot, which has no times at all
+        self.reboot = reboot
+        self._times = None
+        self._day_gap = None
+        self._gap = None
+        self._runs = None
+    
+    def matches_date(self, day):
+        if not self.months >> day.month & 1:
+            return False
+        
+        day_ok = self.days >> day.day & 1
+        weekday_ok = self.weekdays >> (day.isoweekday() % 7) & 1
+        if self.day_star or self.weekday_star:
+            return bool(day_ok and weekday_ok)
+        return bool(day_ok or weekday_ok)
+    
+    def times_of_day(self):
+        # minutes past midnight the job starts at, in order
+        if self._times is None:
+            minutes = mask_values(self.minutes)
+            self._times = [hour * 60 + minute for hour in mask_values(self.hours) for minute in minutes]
+        return self._times
+    
+    def min_day_gap(self):
+        # fewest days between two days the job runs on, checked across a leap year
+        if self._day_gap is None:
+            if self.months == 0x1ffe and self.day_star and self.weekday_star:
+                self._day_gap = 1
+            else:
+                start = date(2024, 1, 1)
+                days = [n for n in range(366 + 366) if self.matches_date(start + timedelta(days=n))]
+                gaps = [b - a for a, b in zip(days, days[1:])]
+                self._day_gap = min(gaps) if gaps else None
+        return self._day_gap
+    
+    def days_in_year(self, year):
+        # how many days of the year the job runs on, a month and weekday at a
+        # time from bitmasks rather than a date at a time
+        either = not (self.day_star or self.weekday_star)
+        total = 0
+        for month in mask_values(self.months):
+            for weekday, days in enumerate(month_weekdays(year, month)):
+                if self.weekdays >> weekday & 1:
+                    total += bin(days if either else days & self.days).count("1")
+                elif either:
+                    total += bin(days & self.days).count("1")
+        return total
+    
+    def runs_per_day(self):
+        # average starts per day over a leap year and a normal one
+        if self._runs is None:
+            if self.months == 0x1ffe and self.day_star and self.weekday_star:
+                days = 1.0
+            else:
+                days = (self.days_in_year(2024) + self.days_in_year(2025)) / 731
+            self._runs = len(self.times_of_day()) * days
+        return self._runs
+    
+    def min_gap(self):
+        # shortest time between two starts, in minutes
+        if self._gap is None:
+            times = self.times_of_day()
+            day_gap = self.min_day_gap()
+            gaps = [b - a for a, b in zip(times, times[1:])]
+            if day_gap:
+                gaps.append(times[0] + day_gap * 1440 - times[-1])
+            self._gap = min(gaps) if gaps else -1
+        return self._gap if self._gap >= 0 else None
+    
+    def key(self):
+        # the same for any two schedules that run at the same times, however
+        # they're written
+        days, weekdays = self.days, self.weekdays
+        both = not (self.day_star or self.weekday_star)
+        if both and (days == 0xfffffffe or weekdays == 0x7f):
+            # either one matching every day means every day
+            days, weekdays, both = 0xfffffffe, 0x7f, False
+        return (self.minutes, self.hours, days, self.months, weekdays, both)
+    
+    def canonical(self):
+        # shortest schedule string with the same key, None if the day fields
+        # can't be written so cron reads them the same way
+        if self.reboot:
+            return "@reboot"
+        minutes, hours, days, months, weekdays, both = self.key()
+        fields = [field_text(minutes, 0, 59), field_text(hours, 0, 23)]
+        
+        if both:
+            # matching either day field, so neither can start with *
+            day_text, weekday_text = field_text(days, 1, 31, False), field_text(weekdays, 0, 6, False)
+        elif days == 0xfffffffe or weekdays == 0x7f:
+            day_text, weekday_text = field_text(days, 1, 31), field_text(weekdays, 0, 6)
+        else:
+            # matching both day fields, so one of them has to start with *
+            pairs = [(field_text(days, 1, 31, True), field_text(weekdays, 0, 6)),
+                     (field_text(days, 1, 31), field_text(weekdays, 0, 6, True))]
+            pairs = [pair for pair in pairs if None not in pair]
+            if not pairs:
+                return None
+            day_text, weekday_text = min(pairs, key=lambda pair: len(pair[0]) + len(pair[1]))
+        
+        return " ".join(fields + [day_text, field_text(months, 1, 12), weekday_text])
+    
+    def run_times(self, start, end, zone):
+        # utc timestamps in [start, end) the job starts at, reading the schedule
+        # in zone's wall clock time. like cron, a time skipped when the clocks go
+        # forward runs as they change, and in an hour that repeats when they go
+        # back only jobs that run every hour run twice
+        times = self.times_of_day()
+        if not times:
+            return
+        low = start + min(zone.offset(start - 86400), zone.offset(start + 86400))
+        high = end + max(zone.offset(end - 86400), zone.offset(end + 86400))
+        day = date(*time.gmtime(low)[:3])
+        midnight = calendar.timegm(day.timetuple())
+        
+        while midnight < high:
+            # a month the job doesn't run in is skipped whole
+            if not self.months >> day.month & 1:
+                following = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+                midnight += (following - day).days * 86400
+                day = following
+                continue
+            
+            if self.matches_date(day):
+                first = bisect.bisect_left(times, -(-(low - midnight) // 60))
+                last = bisect.bisect_left(times, -(-(high - midnight) // 60))
+                runs = set()
+                for minute in times[first:last]:
+                    local = midnight + minute * 60
+                    utc = zone.to_utc(local)
+                    if not utc:
+                        runs.add(zone.gap_end(local))
+                    else:
+                        runs.update(utc if self.every_hour else utc[:1])
+                
+                for run in sorted(runs):
+                    if start <= run < end:
+                        yield run
+            
+            day += timedelta(days=1)
+            midnight += 86400
+    
+    def run_count(self, start, end, zone):
+        # how many starts run_times would give, counting a whole day with no
+        # clock change straight from times_of_day() rather than listing it
+        per_day = len(self.times_of_day())
+        if not per_day:
+            return 0
+        day = date(*time.gmtime(start + zone.offset(start))[:3])
+        low, count = start, 0
+        while low < end:
+            day += timedelta(days=1)
+            midnight = calendar.timegm(day.timetuple())
+            utc = zone.to_utc(midnight)
+            high = min(utc[0] if utc else zone.gap_end(midnight), end)
+            if high - low == 86400 and zone.offset(low) == zone.offset(high - 1):
+                count += per_day if self.matches_date(day - timedelta(days=1)) else 0
+            else:
+                count += sum(1 for _ in self.run_times(low, high, zone))
+            low = high
+        return count
+    
+    def last_run(self, start, end, zone):
+        # latest start in [start, end), looking further back only when the
+        # near windows are empty. None if there isn't one
+        for back in (3600, 2 * 86400, end - start):
+            runs = deque(self.run_times(max(start, end - back), end, zone), maxlen=1)
+            if runs:
+                return runs[0]
+        return None
+    
+    def next_run(self, after, zone):
+        # first start after the timestamp, looking further ahead only when the
+        # near windows are empty. None if it never runs (e.g. 30 february)
+        for ahead in (60, 3600, 2 * 86400, 4 * 366 * 86400):
+            run = next(self.run_times(after + 1, after + 1 + ahead, zone), None)
+            if run is not None:
+                return run
+        return None
+
+
+@lru_cache(maxsize=65536)
+def compile_schedule(schedule):
+    # CronSchedule for a schedule string, or None if it isn't valid
+    if schedule in SCHEDULE_MACROS:
+        if SCHEDULE_MACROS[schedule] is None:
+            return CronSchedule(0, 0, 0, 0, 0, True, True, reboot=True)
+        return compile_schedule(SCHEDULE_MACROS[schedule])
+    
+    fields = schedule.split()
+    if len(fields) != 5:
+        return None
+    
+    try:
+        masks = [parse_cron_field(text, low, high, MONTH_NAMES if name == "month" else
+                                  WEEKDAY_NAMES if name == "weekday" else None)
+                 for text, (name, low, high) in zip(fields, CRON_FIELDS)]
+    except ValueError:
+        return None
+    
+    return CronSchedule(*masks, day_star=fields[2].startswith('*'), weekday_star=fields[4].startswith('*'))
+
+
+@lru_cache(maxsize=65536)
+def canonical_schedule(schedule):
+    # the shortest way to write a schedule, or the schedule as it is if it
+    # isn't valid or can't be written any other way
+    compiled = compile_schedule(schedule)
+    return compiled and compiled.canonical() or schedule
+
+
+def job_hash(schedule, command):
+    # the same for two jobs running the same command at the same times
+    return hashlib.sha1(f"{canonical_schedule(schedule)}\n{command}".encode("utf-8")).hexdigest()[:16]
+
+
+class ZoneTable:
+    # a zone's utc offset changes over a span of years, found once up front so
+    # converting a time is a bisect rather than a zoneinfo lookup each time.
+    # offset_at(timestamp) gives the zone's utc offset in seconds
+    def __init__(self, offset_at, first_year, last_year):
+        self.offset_at = offset_at
+        self.start = calendar.timegm((first_year, 1, 1, 0, 0, 0))
+        self.end = calendar.timegm((last_year + 1, 1, 1, 0, 0, 0))
+        self.transitions = [self.start]
+        self.offsets = [offset_at(self.start)]
+        
+        # zones change at most once a day, so step a day at a time and narrow
+        # down to the second whenever the offset differs
+        time_point = self.start
+        while time_point < self.end:
+            following = min(time_point + 86400, self.end)
+            offset = offset_at(following)
+            if offset != self.offsets[-1]:
+                low, high = time_point, following
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if offset_at(middle) == self.offsets[-1]:
+                        low = middle
+                    else:
+                        high = middle
+                self.transitions.append(high)
+                self.offsets.append(offset)
+            time_point = following
+    
+    def offset(self, timestamp):
+        if not self.start <= timestamp < self.end:
+            return self.offset_at(timestamp)
+        return self.offsets[bisect.bisect_right(self.transitions, timestamp) - 1]
+    
+    def to_utc(self, local):
+        # utc timestamps for a wall clock time (given as seconds since the epoch
+        # as if it were utc): one normally, two in an hour that repeats, none
+        # in an hour that is skipped
+        times = []
+        for offset in {self.offset(local - 86400), self.offset(local + 86400)}:
+            if self.offset(local - offset) == offset:
+                times.append(local - offset)
+        return sorted(times)
+    
+    def gap_end(self, local):
+        # when the clocks went forward over a skipped wall clock time
+        before = local - self.offset(local - 86400)
+        if not self.start <= before < self.end:
+            return before
+        return self.transitions[bisect.bisect_right(self.transitions, before) - 1]
+
+
+@lru_cache(maxsize=None)
+def zone_table(name=""):
+    # ZoneTable for a CRON_TZ value, or host local time when it's empty.
+    # None if the zone isn't known here
+    if not name:
+        offset_at = lambda timestamp: time.localtime(timestamp).tm_gmtoff
+    else:
+        if ZoneInfo is None:
+            return None
+        try:
+            zone = ZoneInfo(name)
+        except (KeyError, ValueError, OSError):
+            return None
+        offset_at = lambda timestamp: int(datetime.fromtimestamp(timestamp, zone).utcoffset().total_seconds())
+    
+    year = date.today().year
+    return ZoneTable(offset_at, year - 1, year + 5)
+
+
+# crontabs (cronie's at least) pick the time zone for the lines below with CRON_TZ=
+CRON_TZ_RE = re.compile(r"^CRON_TZ\s*=\s*['\"]?([^'\"\s]*)")
+
+
+# entry columns a header click can sort by, see entry_sort_keys()
+SORT_COLUMNS = ("schedule", "next_run", "command", "comment", "owner", "p50")
+
+# ways the entries view can be grouped
+GROUPINGS = ("None", "Owner", "Source", "Next Run Hour")
+
+
+def entry_zones(entries, meta):
+    # the CRON_TZ in force for each entry, the last one set above it in the same file
+    zones = []
+    source = zone = None
+    for entry, (entry_source, _) in zip(entries, meta):
+        if entry_source != source:
+            source, zone = entry_source, ""
+        match = CRON_TZ_RE.match(entry)
+        if match:
+            zone = match.group(1)
+        zones.append(zone)
+    return zones
+
+
+# (schedule, zone) -> (after, until, run): run is the next start for any time
+# from after up to until, which is run itself unless it never runs
+NEXT_RUNS = {}
+
+
+def next_run(schedule, zone_name, after):
+    # next start of a schedule string after a timestamp, None when it never
+    # runs or can't be worked out. entries sharing a schedule share the
+    # answer, and it holds until that start has passed
+    known = NEXT_RUNS.get((schedule, zone_name))
+    if known and known[0] <= after < known[1]:
+        return known[2]
+    
+    compiled = compile_schedule(schedule)
+    zone = zone_table(zone_name)
+    if not compiled or not zone:
+        return None
+    run = compiled.next_run(after, zone)
+    # next_run() looks four years ahead, so "never" holds for a good while
+    NEXT_RUNS[(schedule, zone_name)] = (after, run if run is not None else after + 366 * 86400, run)
+    return run
+
+
+# a declared run time in an entry's comment, e.g. "# nightly backup duration=7m"
+DURATION_RE = re.compile(r"\bduration=(\d+(?:\.\d+)?)([smh]?)\b")
+
+
+def declared_duration(comment):
+    match = DURATION_RE.search(comment)
+    if not match:
+        return None
+    return float(match.group(1)) * {"": 60, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def flock_lock(command):
+    # (lock file, skips when held) of a command run under flock, or (None, False).
+    # with -n a run that finds the lock held gives up instead of waiting
+    command = unwrap_recorded(command)
+    if "flock" not in command:
+        return None, False
+    
+    try:
+        words = shlex.split(command)
+    except ValueError:
+        return None, False
+    
+    for i, word in enumerate(words):
+        if os.path.basename(word) != "flock":
+            continue
+        rest = words[i + 1:]
+        nonblock = False
+        while rest and rest[0].startswith('-'):
+            option = rest.pop(0)
+            if option == "--nonblock" or not option.startswith("--") and "n" in option:
+                nonblock = True
+            if option in ("-w", "--wait", "--timeout", "-E", "--conflict-exit-code") and rest:
+                rest.pop(0)
+        return (rest[0], nonblock) if rest else (None, False)
+    return None, False
+
+
+def flock_path(command):
+    # lock file of a command run under flock, if it is
+    return flock_lock(command)[0]
+
+
+def find_overlaps(entries, durations):
+    # jobs whose runs can overlap themselves, or another job holding the same
+    # flock lock. durations maps entry index -> run time in seconds
+    results = []
+    by_lock = {}
+    
+    for index, duration in durations.items():
+        schedule, command, _ = split_entry(entries[index])
+        compiled = compile_schedule(schedule) if schedule else None
+        if not compiled:
+            continue
+        
+        # flock -n already skips a run while the last one holds the lock
+        lock, nonblock = flock_lock(command)
+        gap = compiled.min_gap()
+        if gap is not None and duration > gap * 60 and not nonblock:
+            results.append({"index": index, "problem": "overlaps itself", "gap": gap, "duration": duration})
+        
+        if lock:
+            by_lock.setdefault(lock, []).append((index, compiled, duration))
+    
+    # does a job start while another job holding the same lock is still running
+    for lock, jobs in by_lock.items():
+        for index, compiled, _ in jobs:
+            for other, other_compiled, other_duration in jobs:
+                if other == index:
+                    continue
+                other_times = other_compiled.times_of_day()
+                for start in compiled.times_of_day():
+                    # latest start of the other job at or before this one, wrapping over midnight
+                    pos = bisect.bisect_right(other_times, start) - 1
+                    previous = other_times[pos] if pos >= 0 else other_times[-1] - 1440
+                    if (start - previous) * 60 < other_duration:
+                        results.append({"index": index, "problem": f"waits on {lock}",
+                                        "gap": start - previous, "duration": other_duration})
+                        break
+                else:
+                    continue
+                break
+    
+    return results
+
+
+def suggest_interval(schedule, duration):
+    # the same kind of schedule with a step long enough for the job to finish.
+    # a macro is suggested for as the fields it stands for
+    schedule = SCHEDULE_MACROS.get(schedule, schedule)
+    compiled = compile_schedule(schedule) if schedule else None
+    fields = schedule.split() if schedule else []
+    if not compiled or len(fields) != 5 or fields[1] != '*':
+        return None
+    
+    minutes = mask_values(compiled.minutes)
+    for step in (2, 3, 4, 5, 6, 10, 12, 15, 20, 30, 60):
+        if step * 60 > duration:
+            if step == 60:
+                break
+            first = minutes[0] % step
+            minute = f"*/{step}" if first == 0 else f"{first}-59/{step}"
+            return " ".join([minute] + fields[1:])
+    
+    for step in (2, 3, 4, 6, 8, 12, 24):
+        if step * 3600 > duration:
+            hour = f"*/{step}" if step < 24 else "0"
+            return " ".join([str(minutes[0]), hour] + fields[2:])
+    return None
+
+
+def find_duplicates(entries, meta, zones):
+    # groups of entry indices running the same command as the same user at the
+    # same times, in one pass over the entries keyed by job_hash
+    groups = {}
+    for index, entry in enumerate(entries):
+        schedule, command, _ = split_entry(entry)
+        if schedule is None or not compile_schedule(schedule):
+            continue
+        key = (job_hash(schedule, unwrap_recorded(command)), meta[index][1], zones[index])
+        groups.setdefault(key, []).append(index)
+    return [indices for indices in groups.values() if len(indices) > 1]
+
+
+def diff_keys(line, owner):
+    # (exact, loose) keys of an entry for lining crontabs up. entries with the
+    # same exact key are the same job, the same loose key the same command
+    # (or setting) with a different schedule (or value)
+    owner = owner or ""
+    if ENV_RE.match(line):
+        return ("line", line, owner), ("env", line.split("=", 1)[0].strip(), owner)
+    schedule, command, _ = split_entry(line)
+    if schedule is None or not compile_schedule(schedule):
+        return ("line", line, owner), ("line", line, owner)
+    command = unwrap_recorded(command)
+    return (job_hash(schedule, command), owner), (job_id(command), owner)
+
+
+def crontab_diff(sides):
+    # line up several crontabs, each a list of (line, owner), by what their
+    # entries run rather than where they are. one row per job, holding its
+    # (line, owner) on each side or None. a pass keyed by job_hash pairs up the
+    # same jobs, then the rows left incomplete are joined by command, which
+    # makes them a changed schedule. dict lookups all the way, so it stays
+    # linear and moving entries around changes nothing
+    rows = []
+    exact_rows = {}
+    for side, entries in enumerate(sides):
+        seen = Counter()
+        for line, owner in entries:
+            exact, loose = diff_keys(line, owner)
+            # the nth copy of a job on one side pairs with its nth copy elsewhere
+            matches = exact_rows.setdefault(exact, [])
+            if seen[exact] == len(matches):
+                matches.append((loose, [None] * len(sides)))
+                rows.append(matches[-1])
+            matches[seen[exact]][1][side] = (line, owner)
+            seen[exact] += 1
+    
+    joined = []
+    incomplete = {}
+    for loose, cells in rows:
+        if None not in cells:
+            joined.append(cells)
+            continue
+        for other in incomplete.get(loose, []):
+            if all(a is None or b is None for a, b in zip(other, cells)):
+                other[:] = [a or b for a, b in zip(other, cells)]
+                break
+        else:
+            incomplete.setdefault(loose, []).append(cells)
+            joined.append(cells)
+    return joined
+
+
+def diff_status(cells, labels):
+    # what a crontab_diff() row means. with two sides the first is the old one
+    missing = [label for label, cell in zip(labels, cells) if cell is None]
+    present = [cell for cell in cells if cell]
+    if len(cells) == 2 and missing:
+        return "added" if cells[0] is None else "removed"
+    
+    status = []
+    if missing:
+        status.append("missing on " + ", ".join(missing))
+    if len({diff_keys(*cell)[0] for cell in present}) > 1:
+        status.append("changed")
+    elif not missing and len({line for line, _ in present}) > 1:
+        status.append("equivalent")
+    return ", ".join(status) or "same"
+
+
+def diff_cell(cell):
+    # (what, how) of a crontab_diff() cell for showing side by side: the
+    # command or setting, and its schedule or value on that side
+    if cell is None:
+        return "", "—"
+    line, owner = cell
+    if ENV_RE.match(line):
+        name, _, value = line.partition("=")
+        return name.strip(), value.strip()
+    schedule, command, comment = split_entry(line)
+    if schedule is None:
+        return line, "invalid"
+    how = f"{schedule} # {comment}" if comment else schedule
+    return unwrap_recorded(command), f"{how} (as {owner})" if owner else how
+
+
+def view_diff_entries(entries, meta):
+    # entries as crongui holds them, for crontab_diff(): the user's own
+    # crontab and the system files, with owners only where cron reads them
+    return [(line, None if source == USER_SOURCE else owner) for line, (source, owner) in zip(entries, meta)
+            if source == USER_SOURCE or not is_user_crontab(source)]
+
+
+def host_diff_entries(texts):
+    # every entry on a host, from fetch_host() texts, for crontab_diff()
+    return [entry for source, text in texts.items()
+            for entry in parse_crontab_lines(text or "", system=source != USER_SOURCE)]
+
+
+class ActionProfiler:
+    # opt-in timing of user actions, turned on with --profile or CRONGUI_PROFILE=1.
+    # each action's wall time is split into subprocess, dialog and tk render time
+    def __init__(self, trace_path=None, stats_path=None):
+        self.current = None
+        self.started = 0.0
+        self.last = None
+        self.listeners = []
+        self.trace = open(trace_path, 'a') if trace_path else None
+        self.stats_path = stats_path
+        self.cprofile = None
+        if stats_path:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+    
+    def begin(self, name):
+        self.current = {"action": name, "start": time.time(), "subprocess": 0.0, "dialog": 0.0, "render": 0.0}
+        self.started = time.perf_counter()
+        if self.cprofile:
+            self.cprofile.enable()
+    
+    def add(self, bucket, seconds):
+        if self.current is not None:
+            self.current[bucket] += seconds
+    
+    def end(self):
+        if self.cprofile:
+            self.cprofile.disable()
+        
+        record = self.current
+        record["wall"] = time.perf_counter() - self.started
+        record["other"] = max(0.0, record["wall"] - record["subprocess"] - record["dialog"] - record["render"])
+        self.current = None
+        self.last = record
+        
+        if self.trace:
+            self.trace.write(json.dumps(record) + "\n")
+            self.trace.flush()
+        for listener in self.listeners:
+            listener(record)
+    
+    def time_dialogs(self, *modules):
+        # count time spent waiting on the user separately, it isn't crongui being slow
+        for module in modules:
+            for name in dir(module):
+                function = getattr(module, name)
+                if name.startswith(("show", "ask")) and callable(function):
+                    setattr(module, name, self.timed("dialog", function))
+    
+    def timed(self, bucket, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(bucket, time.perf_counter() - start)
+        return wrapper
+    
+    def close(self):
+        if self.trace:
+            self.trace.close()
+        if self.cprofile:
+            self.cprofile.dump_stats(self.stats_path)
+
+
+def profiled(name):
+    # time a ModernCronGUI method as one user action when profiling is on
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            # actions called from other actions count towards the outer one
+            if profiler is None or profiler.current is not None:
+                return method(self, *args, **kwargs)
+            
+            profiler.begin(name)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                # let tk draw whatever the action changed
+                start = time.perf_counter()
+                self.root.update_idletasks()
+                profiler.add("render", time.perf_counter() - start)
+                profiler.end()
+        return wrapper
+    return decorator
+
+
+class EditHistory:
+    # undo/redo stacks holding small edit ops instead of copies of the whole list:
+    # ("insert", index, line, meta), ("delete", index, line, meta) or
+    # ("modify", index, before, after, meta), where meta is the entry's (source, owner).
+    # one user action is recorded as one group of ops
+    def __init__(self, limit=1000):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+
+    def record(self, ops):
+        if not ops:
+            return
+        self.undo_stack.append(tuple(ops))
+        self.redo_stack.clear()
+
+    def undo(self):
+        if not self.undo_stack:
+            return None
+        group = self.undo_stack.pop()
+        self.redo_stack.append(group)
+        return [invert_op(op) for op in reversed(group)]
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        group = self.redo_stack.pop()
+        self.undo_stack.append(group)
+        return list(group)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+    
+    def reaches(self, index):
+        # whether any recorded op is at or past index
+        return any(op[1] >= index for stack in (self.undo_stack, self.redo_stack)
+                   for group in stack for op in group)
+
+
+# a VAR=value line in a crontab
+ENV_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*\s*=")
+
+
+def parse_crontab_lines(text, system=False):
+    # (line, owner) for every entry in a crontab, blank lines and comments are
+    # dropped. system crontabs have the owner before the command, it is taken
+    # out so every entry reads like a user crontab line
+    entries = []
+    for line in text.split('\n'):
+        line = line.strip()
+        
+        if not line or line.startswith('#'):
+            continue
+        
+        owner = None
+        if system and not ENV_RE.match(line):
+            # the owner comes after the schedule, a macro is one field
+            fields = 1 if line.startswith('@') else 5
+            parts = line.split(None, fields + 1)
+            if len(parts) == fields + 2:
+                owner = parts[fields]
+                line = " ".join(parts[:fields] + parts[fields + 1:])
+        
+        entries.append((line, owner))
+    return entries
+
+
+def valid_entry(line):
+    # whether cron accepts a line: a setting, or an entry with a valid schedule
+    schedule = split_entry(line)[0]
+    return bool(ENV_RE.match(line) or schedule and compile_schedule(schedule))
+
+
+def check_crontab(text, system=False):
+    # the (line, owner) pairs of a crontab split into lines cron accepts
+    # (settings and entries with a valid schedule) and ones it doesn't
+    valid, invalid = [], []
+    for line, owner in parse_crontab_lines(text, system):
+        if valid_entry(line):
+            valid.append((line, owner))
+        else:
+            invalid.append((line, owner))
+    return valid, invalid
+
+
+def format_system_line(entry, owner):
+    # put the owner back in for writing to a system crontab
+    fields = 1 if entry.startswith('@') else 5
+    parts = entry.split(None, fields)
+    if owner and len(parts) == fields + 1 and not ENV_RE.match(entry):
+        return " ".join(parts[:fields] + [owner, parts[fields]])
+    return entry
+
+
+def patch_crontab_text(text, entries, system=False):
+    # text with its entries swapped for entries, (line, owner) pairs, changing
+    # only the lines that differ. comments, blank lines and the entries that
+    # are still there stay exactly as they were written
+    lines = text.split('\n') if text else []
+    if lines and lines[-1] == "":
+        lines.pop()
+    
+    positions, old = [], []
+    for i, raw in enumerate(lines):
+        for line, owner in parse_crontab_lines(raw, system):
+            positions.append(i)
+            old.append((line, owner or ""))
+    new = [(line, owner or "" if system else "") for line, owner in entries]
+    
+    def render(entry):
+        return format_system_line(*entry) if system else entry[0]
+    
+    out = []
+    cursor = 0
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        # whatever sits before the block stays, new entries after the last old one
+        anchor = positions[i1] if i1 < len(positions) else positions[-1] + 1 if positions else len(lines)
+        out += lines[cursor:anchor]
+        cursor = max(cursor, anchor)
+        if tag == "equal":
+            out += lines[cursor:positions[i2 - 1] + 1]
+            cursor = positions[i2 - 1] + 1
+            continue
+        
+        out += [render(entry) for entry in new[j1:j2]]
+        # the old entries go, comments between them stay
+        for k in range(i1, i2):
+            out += lines[cursor:positions[k]]
+            cursor = positions[k] + 1
+    out += lines[cursor:]
+    return "".join(f"{line}\n" for line in out)
+
+
+def cron_d_files(directory=None):
+    # cron skips editor backups and package manager leftovers
+    directory = directory or CRON_D_DIR
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    
+    return [os.path.join(directory, name) for name in names
+            if not name.startswith('.') and not name.endswith('~') and ".dpkg-" not in name
+            and ".rpm" not in name and os.path.isfile(os.path.join(directory, name))]
+
+
+def read_text(path):
+    try:
+        with open(path, 'r', errors='replace') as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def user_source(user):
+    # other users' crontabs, which are only loaded when running as root
+    return f"{USER_SOURCE}:{user}"
+
+
+def spool_file(user):
+    # debian has a crontabs/ subdirectory, rhel keeps them straight in /var/spool/cron
+    for directory in SPOOL_DIRS:
+        if os.path.isdir(directory):
+            return os.path.join(directory, user)
+    return None
+
+
+def run_captured(args):
+    return subprocess.run(args, capture_output=True, text=True)
+
+
+def is_user_crontab(source):
+    return source == USER_SOURCE or source.startswith(USER_SOURCE + ":")
+
+
+def crontab_args(source):
+    # the crontab command for a user's crontab
+    if source == USER_SOURCE:
+        return ["crontab"]
+    return ["crontab", "-u", source.split(":", 1)[1]]
+
+
+def source_owner(source, user):
+    # who a user crontab belongs to, user being whoever crongui runs for
+    return user if source == USER_SOURCE else source.split(":", 1)[1]
+
+
+def effective_user():
+    # whose crontab plain `crontab -l` reads, root's under sudo
+    try:
+        import pwd
+        return pwd.getpwuid(os.geteuid()).pw_name
+    except (ImportError, KeyError):
+        return os.environ.get("USER", "unknown")
+
+
+def other_user_source(name):
+    # the source for a file in the crontab spool, when running as root
+    if os.geteuid() != 0 or name.startswith('.') or name == effective_user():
+        return None
+    return user_source(name)
+
+
+def other_user_sources():
+    # root can see and edit everyone's crontab, listed from the spool
+    spool = spool_file(effective_user())
+    if os.geteuid() != 0 or not spool:
+        return []
+    try:
+        names = sorted(os.listdir(os.path.dirname(spool)))
+    except OSError:
+        return []
+    return [source for source in map(other_user_source, names) if source]
+
+
+def read_source_text(source, run_command=run_captured):
+    # a source's raw text, None if it doesn't exist
+    if is_user_crontab(source):
+        try:
+            result = run_command(crontab_args(source) + ["-l"])
+        except FileNotFoundError:
+            # no crontab command, so no user crontabs either
+            return None
+        
+        if result.returncode != 0:
+            if "no crontab" in result.stderr:
+                return None
+            name = "crontab" if source == USER_SOURCE else f"{source_owner(source, '')}'s crontab"
+            raise RuntimeError(f"Failed to load {name}: {result.stderr}")
+        return result.stdout
+    
+    if not os.path.exists(source):
+        return None
+    text = read_text(source)
+    if text is None:
+        raise RuntimeError(f"Failed to read {source}")
+    return text
+
+
+def read_source(source, user, run_command=run_captured):
+    # (line, owner) pairs for a source as it is on disk, None if a file can't be read
+    if is_user_crontab(source):
+        text = read_source_text(source, run_command)
+        owner = source_owner(source, user)
+        return [(line, owner) for line, _ in parse_crontab_lines(text or "")]
+    
+    text = read_text(source)
+    if text is None:
+        return None
+    return [(line, owner or "") for line, owner in parse_crontab_lines(text, system=True)]
+
+
+def load_sources(user, run_command=run_captured):
+    # {source: [(line, owner), ...]} for everything crongui shows, in the order
+    # it's shown: the user's crontab, /etc/cron.d, then other users' for root
+    sources = {USER_SOURCE: read_source(USER_SOURCE, user, run_command)}
+    
+    for path in cron_d_files():
+        sources[path] = read_source(path, user, run_command) or []
+    
+    for source in other_user_sources():
+        try:
+            sources[source] = read_source(source, user, run_command)
+        except RuntimeError:
+            continue
+    return sources
+
+
+
+# other hosts are reached through a transport: something that runs a shell
+# script on the host and hands back a CompletedProcess. reading or writing
+# everything crongui shows for a host is one script, so one round trip
+LOCAL_HOST = "localhost"
+
+# one ssh connection per host, opened on first use and shared by every later
+# command (ControlMaster), it closes itself after ControlPersist idle
+SSH_OPTIONS = ["-o", "BatchMode=yes", "-o", "ConnectTimeout=10",
+               "-o", "ControlMaster=auto", "-o", "ControlPersist=10m"]
+
+
+class SSHTransport:
+    def __init__(self, host):
+        self.host = host
+        # %C is a hash of the connection, short enough for a socket path
+        self.control_path = os.path.join(CACHE_DIR, "ssh-%C")
+    
+    def run(self, script):
+        # the script goes in on stdin, so there is nothing to quote
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        return subprocess.run(["ssh", *SSH_OPTIONS, "-o", f"ControlPath={self.control_path}", self.host, "sh -s"],
+                              input=script, capture_output=True, text=True)
+    
+    def close(self):
+        subprocess.run(["ssh", "-o", f"ControlPath={self.control_path}", "-O", "exit", self.host],
+                       capture_output=True, text=True)
+
+
+# crontab for a directory host, its crontab is the file <directory>/crontab
+DIRECTORY_CRONTAB = """crontab() {
+    case "$1" in
+        -l) [ -f "$CRONGUI_ROOT/crontab" ] || { echo "no crontab for $(id -un)" >&2; return 1; }
+            cat "$CRONGUI_ROOT/crontab" ;;
+        -r) rm -f "$CRONGUI_ROOT/crontab" ;;
+        *) cat "$1" > "$CRONGUI_ROOT/crontab" ;;
+    esac
+}
+"""
+
+
+class DirectoryTransport:
+    # a host that is a local directory laid out the way crongui fetch writes
+    # one: <directory>/crontab and <directory>/etc/cron.d/. scripts run
+    # locally with everything under it, for trying things without a network
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.host = os.path.basename(self.directory)
+    
+    def run(self, script):
+        return subprocess.run(["sh", "-s"], input=DIRECTORY_CRONTAB + script, capture_output=True, text=True,
+                              cwd=self.directory, env=dict(os.environ, CRONGUI_ROOT=self.directory))
+    
+    def close(self):
+        pass
+
+
+def host_transport(spec):
+    # dir:<path> for a directory host, anything else is an ssh destination
+    if spec.startswith("dir:"):
+        return DirectoryTransport(spec[4:])
+    return SSHTransport(spec)
+
+
+def directory_hosts(directory):
+    # every subdirectory of a fetch directory, as dir: specs
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return ["dir:" + os.path.join(directory, name) for name in names
+            if not name.startswith('.') and os.path.isdir(os.path.join(directory, name))]
+
+
+# prints who we are, the user's crontab and every /etc/cron.d file, each after
+# a "$m <kind> ..." line. $m is set per run so a crontab can't fake one
+FETCH_SCRIPT = """r="${CRONGUI_ROOT:-}"
+echo "$m user $(id -un)"
+if out=$(crontab -l 2>&1); then
+    echo "$m crontab"
+    printf '%s\\n' "$out"
+else
+    case "$out" in *"no crontab"*) ;; *) echo "$m error $out" | head -n 1 ;; esac
+fi
+for f in "$r/etc/cron.d"/*; do
+    case "${f##*/}" in .*|*~|*.dpkg-*|*.rpm*) continue ;; esac
+    [ -f "$f" ] || continue
+    if [ -w "$f" ] && [ -w "$r/etc/cron.d" ]; then w=rw; else w=ro; fi
+    echo "$m file $w ${f#"$r"}"
+    cat "$f" 2>/dev/null
+    echo
+done
+exit 0
+"""
+
+
+def run_script(transport, script):
+    # (marker, stdout) for a script run on a host, $m is the marker
+    marker = f"@@crongui-{secrets.token_hex(8)}"
+    try:
+        result = transport.run(f"m={marker}\n" + script)
+    except OSError as e:
+        raise RuntimeError(f"{transport.host}: {e}")
+    if result.returncode != 0:
+        raise RuntimeError(f"{transport.host}: {result.stderr.strip() or f'exit status {result.returncode}'}")
+    return marker, result.stdout
+
+
+def fetch_host(transport):
+    # (user, {source: text}, sources the user can write) for a host. sources
+    # are named as they are locally, crontab and /etc/cron.d/<name>
+    marker, output = run_script(transport, FETCH_SCRIPT)
+    user, texts, writable = transport.host, {}, {USER_SOURCE}
+    section = None
+    
+    for line in output.split('\n'):
+        if not line.startswith(marker + " "):
+            if section:
+                texts[section].append(line)
+            continue
+        
+        kind, _, rest = line[len(marker) + 1:].partition(" ")
+        section = None
+        if kind == "user":
+            user = rest
+        elif kind == "error":
+            raise RuntimeError(f"Failed to load crontab on {transport.host}: {rest}")
+        elif kind == "crontab":
+            section = USER_SOURCE
+        elif kind == "file":
+            access, _, section = rest.partition(" ")
+            if access == "rw":
+                writable.add(section)
+        if section:
+            texts[section] = []
+    
+    return user, {source: "\n".join(lines) for source, lines in texts.items()}, writable
+
+
+def host_sources(user, texts):
+    # fetched texts as load_sources() would have read them
+    sources = {USER_SOURCE: [(line, user) for line, _ in parse_crontab_lines(texts.get(USER_SOURCE) or "")]}
+    for source, text in texts.items():
+        if source != USER_SOURCE:
+            sources[source] = [(line, owner or "") for line, owner in parse_crontab_lines(text, system=True)]
+    return sources
+
+
+def push_script(texts):
+    # replace each source with its text, None removes it. every write reports
+    # "$m ok <n>" or "$m fail <n> <first line of the error>"
+    lines = ['r="${CRONGUI_ROOT:-}"']
+    for number, (source, text) in enumerate(texts.items()):
+        data = base64.b64encode(text.encode("utf-8")).decode("ascii") if text is not None else ""
+        if source == USER_SOURCE and text is None:
+            # fails only when crontab -r says something other than "no crontab"
+            command = '! crontab -r 2>&1 | grep -v "no crontab"'
+        elif source == USER_SOURCE:
+            command = f"printf %s {data} | base64 -d | crontab -"
+        elif text is None:
+            command = f'rm -f "$r"{shlex.quote(source)}'
+        else:
+            # swapped in whole so cron never reads half a file
+            directory = shlex.quote(os.path.dirname(source))
+            command = (f't=$(mktemp "$r"{directory}/.crongui-XXXXXX) && '
+                       f'{{ printf %s {data} | base64 -d > "$t" && chmod 644 "$t" && mv -f "$t" "$r"{shlex.quote(source)} '
+                       f'|| {{ rm -f "$t"; false; }}; }}')
+        lines.append(f'if out=$({command} 2>&1); then echo "$m ok {number}"; '
+                     f'else echo "$m fail {number} $out" | head -n 1; fi')
+    lines.append("exit 0")
+    return "\n".join(lines) + "\n"
+
+
+def push_host(transport, texts):
+    # write {source: text} to a host in one round trip, {source: error} back
+    if not texts:
+        return {}
+    sources = list(texts)
+    try:
+        marker, output = run_script(transport, push_script(texts))
+    except RuntimeError as e:
+        return {source: str(e) for source in sources}
+    
+    errors = {source: "no reply" for source in sources}
+    for line in output.split('\n'):
+        if line.startswith(marker + " "):
+            status, number, message = (line[len(marker) + 1:].split(" ", 2) + [""])[:3]
+            if status == "ok":
+                errors.pop(sources[int(number)], None)
+            else:
+                errors[sources[int(number)]] = message or "failed"
+    return errors
+
+
+def for_hosts(work, transports, workers=64):
+    # {host: work(transport) or the error it raised}, every host at once so
+    # a fleet takes about as long as its slowest host
+    def attempt(transport):
+        try:
+            return work(transport)
+        except RuntimeError as e:
+            return e
+    
+    if not transports:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(len(transports), workers)) as pool:
+        return dict(zip((transport.host for transport in transports), pool.map(attempt, transports)))
+
+
+# what counts as a backup job for crongui audit
+BACKUP_PATTERN = r"backup|borg|restic|duplicity|rsnapshot|rsync|pg_dump|mysqldump|xtrabackup"
+
+
+def audit_host(root, path):
+    # dumps are either <root>/<host>/... or <root>/<host>.<ext>
+    parts = os.path.relpath(path, root).split(os.sep)
+    return parts[0] if len(parts) > 1 else os.path.splitext(parts[0])[0]
+
+
+def audit_files(root, paths, backup_pattern=BACKUP_PATTERN, max_invalid=20):
+    # audit a batch of crontab dumps in a worker process. only counts and a
+    # few sample lines come back, so the parent's memory doesn't grow with
+    # the size of the fleet
+    backup_re = re.compile(backup_pattern)
+    schedules = Counter()
+    result = {"files": 0, "entries": 0, "unreadable": [], "invalid_count": 0, "invalid": [],
+              "minutes": Counter(), "commands": Counter(), "hosts": {}}
+    
+    for path in paths:
+        host = audit_host(root, path)
+        has_backup = result["hosts"].get(host, False)
+        text = read_text(path)
+        if text is None:
+            result["unreadable"].append(path)
+            result["hosts"][host] = has_backup
+            continue
+        
+        # /etc/crontab and cron.d files have a user field
+        parts = os.path.relpath(path, root).split(os.sep)
+        system = "cron.d" in parts or parts[-1] == "crontab" and "etc" in parts
+        valid, invalid = check_crontab(text, system)
+        
+        result["files"] += 1
+        result["invalid_count"] += len(invalid)
+        room = max_invalid - len(result["invalid"])
+        result["invalid"] += [(path, line) for line, _ in invalid[:max(room, 0)]]
+        
+        commands = set()
+        for line, _ in valid:
+            schedule, command, _ = split_entry(line)
+            if schedule is None:
+                continue
+            result["entries"] += 1
+            command = unwrap_command(unwrap_recorded(command))
+            commands.add(command)
+            has_backup = has_backup or bool(backup_re.search(command))
+            schedules[schedule] += 1
+        
+        # commands count once per file so one busy crontab doesn't dominate
+        result["commands"].update(commands)
+        result["hosts"][host] = has_backup
+    
+    # the same few schedules turn up everywhere, so expand each one once
+    for schedule, count in schedules.items():
+        for minute in compile_schedule(schedule).times_of_day():
+            result["minutes"][minute] += count
+    return result
+
+
+def walk_crontabs(root):
+    # every file under root, in a stable order, without listing it all up front
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        for name in sorted(files):
+            if not name.startswith('.'):
+                yield os.path.join(directory, name)
+
+
+def run_audit(root, workers=None, batch_size=16, top=20, backup_pattern=BACKUP_PATTERN,
+              as_json=False, output=None):
+    # crongui audit: fan batches of files out to a process pool, keeping a
+    # few batches per worker in flight, and fold each result in as it lands
+    output = output or sys.stdout
+    if not os.path.isdir(root):
+        print(f"crongui audit: {root} is not a directory", file=sys.stderr)
+        return 2
+    
+    totals = {"files": 0, "entries": 0, "unreadable": [], "invalid_count": 0, "invalid": [],
+              "minutes": Counter(), "commands": Counter(), "hosts": {}}
+    max_commands = 100000
+    
+    def merge(result):
+        for key in ("files", "entries", "invalid_count"):
+            totals[key] += result[key]
+        totals["unreadable"] += result["unreadable"]
+        totals["invalid"] += result["invalid"][:max(top - len(totals["invalid"]), 0)]
+        totals["minutes"].update(result["minutes"])
+        totals["commands"].update(result["commands"])
+        for host, has_backup in result["hosts"].items():
+            totals["hosts"][host] = totals["hosts"].get(host, False) or has_backup
+        # keep the command counts bounded, dropping the rarest ones
+        if len(totals["commands"]) > max_commands:
+            totals["commands"] = Counter(dict(totals["commands"].most_common(max_commands // 2)))
+    
+    try:
+        re.compile(backup_pattern)
+    except re.error as e:
+        print(f"crongui audit: bad --backup-pattern: {e}", file=sys.stderr)
+        return 2
+    
+    workers = workers or os.cpu_count() or 1
+    paths = walk_crontabs(root)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        limit = workers * 4
+        pending = set()
+        while True:
+            while len(pending) < limit:
+                batch = [path for _, path in zip(range(batch_size), paths)]
+                if not batch:
+                    break
+                pending.add(pool.submit(audit_files, root, batch, backup_pattern, top))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                merge(future.result())
+    
+    hosts = sorted(totals["hosts"])
+    report = {
+        "files": totals["files"],
+        "hosts": len(hosts),
+        "entries": totals["entries"],
+        "unreadable": totals["unreadable"],
+        "invalid_lines": totals["invalid_count"],
+        "invalid_samples": [{"path": path, "line": line} for path, line in totals["invalid"]],
+        "peak_minutes": [{"time": f"{minute // 60:02d}:{minute % 60:02d}", "jobs": count}
+                         for minute, count in totals["minutes"].most_common(top)],
+        "common_commands": [{"command": command, "files": count}
+                            for command, count in totals["commands"].most_common(top)],
+        "hosts_without_backups": [host for host in hosts if not totals["hosts"][host]],
+    }
+    
+    if as_json:
+        json.dump(report, output, indent=2)
+        output.write("\n")
+        return 0
+    
+    print(f"{report['files']} files from {report['hosts']} hosts, {report['entries']} jobs", file=output)
+    if report["unreadable"]:
+        print(f"{len(report['unreadable'])} files could not be read", file=output)
+    
+    print(f"\nInvalid lines: {report['invalid_lines']}", file=output)
+    for sample in report["invalid_samples"]:
+        print(f"  {sample['path']}: {sample['line']}", file=output)
+    
+    print("\nBusiest start times (jobs starting at that minute of the day):", file=output)
+    for peak in report["peak_minutes"]:
+        print(f"  {peak['time']}  {peak['jobs']}", file=output)
+    
+    print("\nMost common commands (files they appear in):", file=output)
+    for common in report["common_commands"]:
+        print(f"  {common['files']:>6}  {common['command']}", file=output)
+    
+    print(f"\nHosts without a backup job: {len(report['hosts_without_backups'])}", file=output)
+    for host in report["hosts_without_backups"]:
+        print(f"  {host}", file=output)
+    return 0
+
+
+def source_fingerprint(source, run_command=run_captured):
+    # changes whenever the source does. the file's stat where it can be seen,
+    # `crontab -l` output for the user's own crontab where it can't
+    path = source
+    if is_user_crontab(source):
+        spool = spool_file(effective_user())
+        path = spool and os.path.join(os.path.dirname(spool), source_owner(source, effective_user()))
+    
+    try:
+        if not path:
+            raise PermissionError
+        stat = os.stat(path)
+        text = f"{path} {stat.st_ino} {stat.st_size} {stat.st_mtime_ns}"
+    except FileNotFoundError:
+        text = f"{path} missing"
+    except OSError:
+        # the spool is usually closed to everyone but root
+        if source != USER_SOURCE:
+            text = f"{path} unreadable"
+        else:
+            try:
+                result = run_command(["crontab", "-l"])
+                text = f"{result.returncode}\n{result.stdout}"
+            except OSError:
+                # no crontab command on this host
+                text = f"{path} unavailable"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def source_fingerprints(run_command=run_captured):
+    # {source: fingerprint} for everything load_sources() reads
+    sources = [USER_SOURCE] + cron_d_files() + other_user_sources()
+    return {source: source_fingerprint(source, run_command) for source in sources}
+
+
+def sources_fingerprint(run_command=run_captured):
+    # changes whenever anything load_sources() reads does, a file appearing
+    # in /etc/cron.d or the spool included
+    digest = hashlib.sha1()
+    for source, fingerprint in sorted(source_fingerprints(run_command).items()):
+        digest.update(f"{source} {fingerprint}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def refresh_sources(known, user, run_command=run_captured):
+    # read again only the sources whose fingerprint isn't the known one.
+    # returns the current fingerprints and {source: entries} for each source
+    # that changed, appeared or went away (empty then)
+    fingerprints = source_fingerprints(run_command)
+    fresh = {}
+    for source, fingerprint in fingerprints.items():
+        if known.get(source) != fingerprint:
+            try:
+                fresh[source] = read_source(source, user, run_command) or []
+            except RuntimeError:
+                fingerprints.pop(source)
+    for source in known:
+        if source not in fingerprints and source not in fresh:
+            fresh[source] = []
+    return fingerprints, fresh
+
+
+# the last session's sources and next run times, so the next one can show
+# them straight away. see write_snapshot()
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(user):
+    return os.path.join(CACHE_DIR, f"snapshot-{user}.json")
+
+
+def read_snapshot(user):
+    # {"sources": [[source, fingerprint, [[line, owner], ...]], ...], ...}
+    # or None if there isn't one for this user and setup
+    try:
+        with open(snapshot_path(user)) as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("cron_d") != CRON_D_DIR:
+        return None
+    return snapshot
+
+
+def write_snapshot(user, sources):
+    # sources maps source -> (fingerprint, [(line, owner), ...]) as read from
+    # disk, a fingerprint of None meaning "check it next time". next runs
+    # still in the future stay good until then
+    now = time.time()
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "cron_d": CRON_D_DIR,
+        "sources": [[source, fingerprint, entries] for source, (fingerprint, entries) in
+                    sorted(sources.items(), key=lambda item: (item[0] != USER_SOURCE, item[0]))],
+        "next_runs": [[schedule, zone, after, until, run] for (schedule, zone), (after, until, run)
+                      in list(NEXT_RUNS.items()) if until > now],
+    }
+    
+    # mkstemp makes it readable by its owner only, root's has everyone's crontab in it
+    path = snapshot_path(user)
+    temp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".snapshot-", suffix=".tmp")
+        with os.fdopen(fd, 'w') as file:
+            json.dump(snapshot, file)
+        os.replace(temp_path, path)
+    except OSError:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
+def metric_label(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def compute_metrics(user, window_start, window_end):
+    # the parts of the metrics that only change when the crontabs do: counts,
+    # and job starts per utc minute over the window
+    sources = load_sources(user)
+    lines = [line for entries in sources.values() for line, _ in entries]
+    meta = [(source, owner) for source, entries in sources.items() for _, owner in entries]
+    zones = entry_zones(lines, meta)
+    
+    entries = invalid = 0
+    reboot = []
+    owners = Counter()
+    schedules = Counter()
+    for line, (_, owner), zone in zip(lines, meta, zones):
+        if ENV_RE.match(line):
+            continue
+        schedule = split_entry(line)[0]
+        if not schedule or not compile_schedule(schedule):
+            invalid += 1
+            continue
+        entries += 1
+        owners[owner or "unknown"] += 1
+        if compile_schedule(schedule).reboot:
+            reboot.append(split_entry(line)[1])
+            continue
+        schedules[(schedule, zone)] += 1
+    
+    # each distinct schedule is expanded once, however many jobs share it
+    minutes = Counter()
+    for (schedule, zone), count in schedules.items():
+        table = zone_table(zone)
+        if table:
+            for start in compile_schedule(schedule).run_times(window_start, window_end, table):
+                minutes[start // 60 * 60] += count
+    
+    return {"entries": entries, "invalid": invalid, "owners": dict(owners),
+            "minutes": sorted(minutes.items()), "reboot": len(reboot), "boot_burst": boot_burst(reboot)}
+
+
+def run_metrics(output, heavy=5, state_path=None):
+    # crongui metrics: a node_exporter textfile. the crontabs are only parsed
+    # again when their fingerprint changes (or the cached day runs out), so it
+    # is cheap enough to run every minute
+    user = effective_user()
+    state_path = state_path or os.path.join(
+        CACHE_DIR, f"metrics-{hashlib.sha1(os.path.abspath(output).encode('utf-8')).hexdigest()[:12]}.json")
+    now = int(time.time())
+    
+    try:
+        with open(state_path) as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        state = {}
+    
+    fingerprint = sources_fingerprint()
+    if state.get("fingerprint") != fingerprint or now + 86400 > state.get("window_end", 0):
+        # two days from the start of today, so the next 24 hours are always covered
+        midnight = int(time.mktime(date.today().timetuple()))
+        try:
+            state = compute_metrics(user, midnight, midnight + 2 * 86400)
+        except RuntimeError as e:
+            print(f"crongui metrics: {e}", file=sys.stderr)
+            return 1
+        state.update(fingerprint=fingerprint, window_end=midnight + 2 * 86400, computed=now)
+        try:
+            os.makedirs(os.path.dirname(state_path), exist_ok=True)
+            with open(state_path, 'w') as file:
+                json.dump(state, file)
+        except OSError:
+            pass
+    
+    upcoming = [(start, count) for start, count in state["minutes"] if now - 60 < start < now + 86400]
+    peak = max((count for _, count in upcoming), default=0)
+    next_heavy = next((start - now for start, count in upcoming if start >= now and count >= heavy), -1)
+    
+    lines = [
+        "# HELP crongui_entries Cron jobs in every crontab crongui can read.",
+        "# TYPE crongui_entries gauge",
+        f"crongui_entries {state['entries']}",
+        "# HELP crongui_invalid_entries Crontab lines cron would reject.",
+        "# TYPE crongui_invalid_entries gauge",
+        f"crongui_invalid_entries {state['invalid']}",
+        "# HELP crongui_peak_starts_per_minute Most jobs starting in the same minute over the next 24 hours.",
+        "# TYPE crongui_peak_starts_per_minute gauge",
+        f"crongui_peak_starts_per_minute {peak}",
+        f"# HELP crongui_next_heavy_minute_seconds Seconds until {heavy} or more jobs start in the same minute, "
+        "-1 if not in the next 24 hours.",
+        "# TYPE crongui_next_heavy_minute_seconds gauge",
+        f"crongui_next_heavy_minute_seconds {next_heavy}",
+        "# HELP crongui_reboot_entries Cron jobs that run at boot (@reboot).",
+        "# TYPE crongui_reboot_entries gauge",
+        f"crongui_reboot_entries {state.get('reboot', 0)}",
+        "# HELP crongui_boot_burst Most @reboot jobs that can be running at once at boot.",
+        "# TYPE crongui_boot_burst gauge",
+        f"crongui_boot_burst {state.get('boot_burst', 0)}",
+        "# HELP crongui_entries_by_owner Cron jobs per user they run as.",
+        "# TYPE crongui_entries_by_owner gauge",
+    ]
+    lines += [f'crongui_entries_by_owner{{owner="{metric_label(owner)}"}} {count}'
+              for owner, count in sorted(state["owners"].items())]
+    lines += [
+        "# HELP crongui_metrics_computed_timestamp_seconds When the crontabs were last parsed.",
+        "# TYPE crongui_metrics_computed_timestamp_seconds gauge",
+        f"crongui_metrics_computed_timestamp_seconds {state['computed']}",
+    ]
+    text = "\n".join(lines) + "\n"
+    
+    if output == "-":
+        sys.stdout.write(text)
+        return 0
+    
+    # node_exporter only reads *.prom, so the temp file is never picked up half written
+    directory = os.path.dirname(os.path.abspath(output))
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".crongui-", suffix=".tmp")
+        with os.fdopen(fd, 'w') as file:
+            file.write(text)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, output)
+    except OSError as e:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+        print(f"crongui metrics: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+# inotify flags, from <sys/inotify.h>
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class SourceWatcher:
+    # tells the gui which crontab sources changed on disk. watches are
+    # (directory, name_to_source) pairs, name_to_source maps a file name in the
+    # directory to a source id or None. uses inotify through ctypes where it
+    # can, and falls back to polling stats, or to a callback for sources whose
+    # files can't be seen at all (a user's spool file, usually)
+    def __init__(self, watches, fallback_checks=None, poll_interval=2.0, fallback_interval=15.0):
+        self.watches = watches
+        self.fallback_checks = fallback_checks or {}
+        self.poll_interval = poll_interval
+        self.fallback_interval = fallback_interval
+        self.changes = queue.Queue()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.mode = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.stopped.set()
+    
+    def run(self):
+        fd, by_wd, unwatched = self.setup_inotify()
+        polled = {directory: self.snapshot(directory) for directory, _ in unwatched}
+        self.mode = "inotify" if by_wd and not unwatched else "inotify+poll" if by_wd else "poll"
+        last_fallback = time.monotonic()
+        
+        try:
+            while not self.stopped.is_set():
+                if fd is not None:
+                    ready, _, _ = select.select([fd], [], [], self.poll_interval)
+                    if ready:
+                        self.read_events(fd, by_wd)
+                else:
+                    self.stopped.wait(self.poll_interval)
+                
+                # directories inotify couldn't watch are compared stat by stat
+                for directory, name_to_source in unwatched:
+                    current = self.snapshot(directory)
+                    previous = polled[directory]
+                    for name in set(current) | set(previous):
+                        if current.get(name) != previous.get(name):
+                            self.report(name_to_source(name))
+                    polled[directory] = current
+                
+                if self.fallback_checks and time.monotonic() - last_fallback >= self.fallback_interval:
+                    last_fallback = time.monotonic()
+                    for source, changed in self.fallback_checks.items():
+                        if changed():
+                            self.report(source)
+        finally:
+            if fd is not None:
+                os.close(fd)
+    
+    def setup_inotify(self):
+        by_wd = {}
+        unwatched = []
+        fd = None
+        
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            libc = None
+        
+        if fd is not None and fd < 0:
+            fd = None
+        
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        for directory, name_to_source in self.watches:
+            wd = -1
+            if fd is not None:
+                wd = libc.inotify_add_watch(fd, os.fsencode(directory), mask)
+            if wd >= 0:
+                by_wd[wd] = name_to_source
+            else:
+                unwatched.append((directory, name_to_source))
+        
+        if fd is not None and not by_wd:
+            os.close(fd)
+            fd = None
+        return fd, by_wd, unwatched
+    
+    def read_events(self, fd, by_wd):
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        
+        pos = 0
+        while pos + INOTIFY_EVENT.size <= len(data):
+            wd, _, _, length = INOTIFY_EVENT.unpack_from(data, pos)
+            name = data[pos + INOTIFY_EVENT.size:pos + INOTIFY_EVENT.size + length].rstrip(b"\0")
+            pos += INOTIFY_EVENT.size + length
+            if wd in by_wd and name:
+                self.report(by_wd[wd](os.fsdecode(name)))
+    
+    def snapshot(self, directory):
+        stats = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    stats[entry.name] = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        return stats
+    
+    def report(self, source):
+        if source:
+            self.changes.put(source)
+
+
+# the PATH cron starts jobs with, before the crontab's own settings
+CRON_PATH = "/usr/bin:/bin"
+
+
+def parse_env_line(line):
+    # NAME=value from a crontab, cron drops matching quotes around the value
+    name, value = line.split('=', 1)
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    return name.strip(), value
+
+
+def split_percent(command):
+    # cron ends the command at the first unescaped %, the rest is fed to it
+    # as input with each further % as a newline
+    parts = re.split(r"(?<!\\)%", command)
+    text = "\n".join(parts[1:]).replace("\\%", "%")
+    return parts[0].replace("\\%", "%"), text + "\n" if len(parts) > 1 else ""
+
+
+class JobRunner:
+    # runs jobs on demand on a few worker threads. output is read from
+    # non-blocking pipes as it arrives and handed to the Tk loop through
+    # events, as (run, "start", time), (run, "stdout" or "stderr", text)
+    # and (run, "exit", exit code, duration)
+    def __init__(self, workers=4, stats=None):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crongui-run")
+        self.events = queue.Queue()
+        self.stats = stats
+        self.lock = threading.Lock()
+        self.processes = {}
+        self.stopped = set()
+        self.next_run = 0
+    
+    def submit(self, command, env, cwd=None, user=None, job=None):
+        # queue a run, recorded under job in the stats db if given
+        with self.lock:
+            self.next_run += 1
+            run = self.next_run
+        self.pool.submit(self.run, run, command, env, cwd, user, job)
+        return run
+    
+    def stop(self, run):
+        with self.lock:
+            self.stopped.add(run)
+            process = self.processes.get(run)
+        if process:
+            # the job runs in its own session, take anything it started with it
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    def shutdown(self):
+        with self.lock:
+            runs = list(self.processes)
+        for run in runs:
+            self.stop(run)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+    
+    def run(self, run, command, env, cwd, user, job):
+        if run in self.stopped:
+            self.events.put((run, "exit", None, 0.0))
+            return
+        
+        command, stdin = split_percent(command)
+        start = time.time()
+        try:
+            process = subprocess.Popen(["/bin/sh", "-c", command], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE, env=env, cwd=cwd, start_new_session=True,
+                                       **({"user": user} if user else {}))
+        except (OSError, ValueError, KeyError) as e:
+            # KeyError is a user that doesn't exist on this host
+            self.events.put((run, "stderr", f"{e}\n"))
+            self.events.put((run, "exit", 127, 0.0))
+            return
+        
+        with self.lock:
+            self.processes[run] = process
+        self.events.put((run, "start", start))
+        
+        exit_code, duration = 127, 0.0
+        try:
+            self.pump(run, process, stdin.encode("utf-8"))
+            
+            _, status, usage = os.wait4(process.pid, 0)
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code < 0:
+                exit_code = 128 - exit_code
+            process.returncode = exit_code
+            duration = time.time() - start
+            
+            if self.stats and job:
+                try:
+                    self.stats.append(job, start, duration, exit_code, usage.ru_utime + usage.ru_stime, usage.ru_maxrss)
+                except OSError:
+                    pass
+        except Exception as e:
+            # don't leave the job behind, or the run showing as running
+            self.events.put((run, "stderr", f"{e}\n"))
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            exit_code = process.wait()
+            if exit_code < 0:
+                exit_code = 128 - exit_code
+            duration = time.time() - start
+        finally:
+            with self.lock:
+                self.processes.pop(run, None)
+            self.events.put((run, "exit", exit_code, duration))
+    
+    def pump(self, run, process, data):
+        # feed the job its input and pass its output on until both pipes close,
+        # never blocking on a job that isn't reading or writing
+        streams = {process.stdout.fileno(): "stdout", process.stderr.fileno(): "stderr"}
+        decoders = {fd: codecs.getincrementaldecoder("utf-8")("replace") for fd in streams}
+        for fd in streams:
+            os.set_blocking(fd, False)
+        
+        writers = []
+        if data:
+            os.set_blocking(process.stdin.fileno(), False)
+            writers.append(process.stdin.fileno())
+        else:
+            process.stdin.close()
+        
+        while streams:
+            readable, writable, _ = select.select(list(streams), writers, [], 0.5)
+            
+            if writable:
+                try:
+                    data = data[os.write(writers[0], data):]
+                except BlockingIOError:
+                    pass
+                except BrokenPipeError:
+                    data = b""
+                if not data:
+                    process.stdin.close()
+                    writers = []
+            
+            for fd in readable:
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                text = decoders[fd].decode(chunk, final=not chunk)
+                if text:
+                    self.events.put((run, streams[fd], text))
+                if not chunk:
+                    del streams[fd]
+        
+        if writers:
+            process.stdin.close()
+        process.stdout.close()
+        process.stderr.close()
+
+
+# a cron log line, e.g.
+#   Oct 19 10:00:01 host CRON[1234]: (euan) CMD (/usr/bin/backup.sh)
+#   2026-10-19T10:00:01+0000 host crond[1234]: (root) CMDEND (/usr/bin/backup.sh)
+#   Oct 19 10:00:02 host CRON[1233]: (CRON) error (grandchild #1234 failed with exit status 1)
+CRON_LOG_RE = re.compile(
+    rb"^(?P<ts>[A-Z][a-z]{2}\s+\d+\s+\d\d:\d\d:\d\d|\d{4}-\d\d-\d\dT\S+)\s+\S+\s+"
+    rb"(?:CRON|CROND|cron|crond)\[(?P<pid>\d+)\]:\s+\((?P<user>[^)]*)\)\s+"
+    rb"(?P<kind>CMD|CMDEND|error)\s+\((?P<msg>.*)\)\s*$"
+)
+CRON_LOG_HINT_RE = re.compile(rb"CMD|grandchild")
+GRANDCHILD_RE = re.compile(rb"grandchild #(\d+) failed with exit status (\d+)")
+
+
+def parse_log_time(stamp):
+    # syslog stamps have no year, so assume the most recent one that isn't in the future
+    try:
+        if stamp[:4].isdigit():
+            return datetime.fromisoformat(stamp).timestamp()
+        now = datetime.now()
+        parsed = datetime.strptime(f"{now.year} {' '.join(stamp.split())}", "%Y %b %d %H:%M:%S")
+        if parsed.timestamp() > now.timestamp() + 86400:
+            parsed = parsed.replace(year=now.year - 1)
+        return parsed.timestamp()
+    except ValueError:
+        return None
+
+
+class CronLogIndex:
+    # run history per command, built from cron log files. the byte offset reached
+    # in each file is saved with the results so the next scan only reads the tail
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "cronlog-index.json")
+        self.files = {}
+        self.commands = {}
+        
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+            self.files = data.get("files", {})
+            self.commands = data.get("commands", {})
+        except (OSError, ValueError):
+            pass
+
+    def scan(self, paths):
+        for path in paths:
+            try:
+                self.scan_file(path)
+            except OSError:
+                continue
+
+    def scan_file(self, path):
+        st = os.stat(path)
+        state = self.files.get(path)
+        
+        # rotated or truncated, start again from the top
+        if not state or state["inode"] != st.st_ino or st.st_size < state["offset"]:
+            state = {"inode": st.st_ino, "offset": 0, "pending": {}}
+        self.files[path] = state
+        
+        if st.st_size == state["offset"]:
+            return
+        
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # only read up to the last complete line, a half written one
+                # gets picked up next time
+                end = mm.rfind(b"\n", state["offset"]) + 1
+                pos = state["offset"]
+                
+                while pos < end:
+                    hit = CRON_LOG_HINT_RE.search(mm, pos, end)
+                    if not hit:
+                        break
+                    
+                    line_start = mm.rfind(b"\n", pos, hit.start()) + 1 or pos
+                    line_end = mm.find(b"\n", hit.end(), end)
+                    self.parse_line(mm[line_start:line_end], state["pending"])
+                    pos = line_end + 1
+                
+                if end > state["offset"]:
+                    state["offset"] = end
+        
+        # pids are only needed until the failure message turns up
+        pending = state["pending"]
+        if len(pending) > 1000:
+            state["pending"] = dict(list(pending.items())[-1000:])
+
+    def parse_line(self, line, pending):
+        match = CRON_LOG_RE.match(line)
+        if not match:
+            return
+        
+        stamp = parse_log_time(match.group("ts").decode("ascii", "replace"))
+        pid = match.group("pid").decode("ascii")
+        msg = match.group("msg").decode("utf-8", "replace")
+        kind = match.group("kind")
+        
+        if kind == b"CMD":
+            stats = self.commands.setdefault(msg, {"runs": 0, "failures": 0, "last_run": None, "last_exit": None})
+            stats["runs"] += 1
+            if stamp and (stats["last_run"] is None or stamp >= stats["last_run"]):
+                stats["last_run"] = stamp
+                stats["last_exit"] = 0
+            pending[pid] = msg
+        elif kind == b"error":
+            failed = GRANDCHILD_RE.search(match.group("msg"))
+            command = pending.pop(failed.group(1).decode("ascii"), None) if failed else None
+            if command in self.commands:
+                stats = self.commands[command]
+                stats["failures"] += 1
+                stats["last_exit"] = int(failed.group(2))
+
+    def lookup(self, command, comment=""):
+        # cron logs whatever follows the schedule, inline comment included
+        if comment:
+            stats = self.commands.get(f"{command} # {comment}") or self.commands.get(f"{command} #{comment}")
+            if stats:
+                return stats
+        return self.commands.get(command)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(mode='w', dir=os.path.dirname(self.path), delete=False) as temp_file:
+            json.dump({"files": self.files, "commands": self.commands}, temp_file)
+        os.replace(temp_file.name, self.path)
+
 
 class ModernCronGUI:
-    def __init__(self, root):
+    def __init__(self, root, profiler=None, hosts=()):
         self.root = root
+        self.profiler = profiler
+        self.profile_label = None
         self.root.title("CronGUI - Graphical Crontab Editor")
         self.root.geometry("1450x1000")  
         
@@ -22,6 +2560,63 @@ class ModernCronGUI:
         self.crontab_entries = []
         self.current_user = self.get_username()
         
+        # where each entry came from, as (source, owner) alongside crontab_entries.
+        # other users' crontabs and /etc/cron.d are read-only without root.
+        # entry_zones is the CRON_TZ each entry is read in, "" for host time
+        self.entry_meta = []
+        self.entry_zones = []
+        
+        # sort keys for each entry, worked out with its row so sorting is just a
+        # sort. rows are put in order (and under group rows) with set_children
+        self.entry_keys = []
+        self.sort_column = None
+        self.sort_reverse = False
+        self.group_by = tk.StringVar(value="None")
+        self.dirty_sources = set()
+        
+        # each source as last read from disk, (fingerprint, entries), kept
+        # for the next session's snapshot
+        self.snapshot_sources = {}
+        
+        # undo/redo for edits made in this session
+        self.history = EditHistory()
+        
+        # the host being edited and how to reach the others, by name. hosts
+        # are fetched together in the background and kept until shown
+        self.hosts = {LOCAL_HOST: None}
+        self.hosts.update((transport.host, transport) for transport in hosts)
+        self.host = LOCAL_HOST
+        self.host_var = tk.StringVar(value=LOCAL_HOST)
+        self.host_user = self.current_user
+        self.host_writable = set()
+        self.fetched_hosts = {}
+        
+        # optional auto-refresh when crontabs change on disk
+        self.watcher = None
+        self.pending_sources = set()
+        self.last_change = 0.0
+        self.notice_label = None
+        self.auto_refresh = tk.BooleanVar(value=bool(load_settings().get("auto_refresh")))
+        
+        # when jobs last ran, from the cron logs
+        self.run_history = CronLogIndex()
+        self.history_scan = None
+        self.pending_logs = []
+        
+        # durations and failures recorded by the runtime wrapper
+        self.run_stats = RunStats()
+        self.job_stats = {}
+        
+        # jobs started with Run Now, by run number
+        self.job_runner = None
+        self.runs = {}
+        self.run_window = None
+        
+        # catch-up runs waiting for a free slot, as (index, entry)
+        self.replay_queue = deque()
+        self.replay_limit = 4
+        self.replay_runs = set()
+        
         # main container
         self.main_container = ttk.Frame(self.root)
         self.main_container.pack(fill=tk.BOTH, expand=True, padx=50, pady=40)
@@ -45,11 +2640,21 @@ class ModernCronGUI:
         # editor
         self.create_editor_section()
         
-        # Load user's crontab
-        self.load_crontab()
+        # Load user's crontab, straight from the last session's snapshot if
+        # there is one and checked against disk in the background
+        if not self.open_snapshot():
+            self.load_crontab()
         
         # status bar
         self.create_status_bar()
+        
+        if self.auto_refresh.get():
+            self.start_watcher()
+        
+        if len(self.hosts) > 1:
+            self.fetch_hosts()
+        
+        self.root.after(self.next_minute_delay(), self.tick_next_runs)
 
     def apply_modern_theme(self):
         
@@ -249,10 +2854,99 @@ class ModernCronGUI:
         )
         refresh_btn.pack(side=tk.LEFT, padx=(0, 8))
         
-        add_btn = tk.Button(
-            left_buttons, 
-            text="+ New Entry", 
-            command=self.add_new_entry,
+        auto_check = tk.Checkbutton(
+            left_buttons, 
+            text="Auto-refresh",
+            variable=self.auto_refresh,
+            command=self.toggle_auto_refresh,
+            bg=self.bg_dark,
+            fg=self.text_light,
+            selectcolor=self.bg_medium,
+            activebackground=self.bg_dark,
+            activeforeground=self.text_light,
+            font=("Orbitron", 10, "bold")
+        )
+        auto_check.pack(side=tk.LEFT, padx=(0, 8))
+        
+        add_btn = tk.Button(
+            left_buttons, 
+            text="+ New Entry", 
+            command=self.add_new_entry,
+            bg=self.bg_dark,
+            fg=self.text_light,
+            bd=2,
+            relief="solid",
+            highlightbackground=self.text_light,  
+            highlightcolor=self.text_light,       
+            activebackground=self.bg_dark,
+            activeforeground=self.text_light,
+            font=("Orbitron", 10, "bold"),
+            padx=12,
+            pady=6
+        )
+        add_btn.pack(side=tk.LEFT, padx=4)
+        
+        undo_btn = tk.Button(
+            left_buttons, 
+            text="↶ Undo", 
+            command=self.undo,
+            bg=self.bg_dark,
+            fg=self.text_light,
+            bd=2,
+            relief="solid",
+            highlightbackground=self.text_light,  
+            highlightcolor=self.text_light,       
+            activebackground=self.bg_dark,
+            activeforeground=self.text_light,
+            font=("Orbitron", 10, "bold"),
+            padx=12,
+            pady=6
+        )
+        undo_btn.pack(side=tk.LEFT, padx=4)
+        
+        redo_btn = tk.Button(
+            left_buttons, 
+            text="↷ Redo", 
+            command=self.redo,
+            bg=self.bg_dark,
+            fg=self.text_light,
+            bd=2,
+            relief="solid",
+            highlightbackground=self.text_light,  
+            highlightcolor=self.text_light,       
+            activebackground=self.bg_dark,
+            activeforeground=self.text_light,
+            font=("Orbitron", 10, "bold"),
+            padx=12,
+            pady=6
+        )
+        redo_btn.pack(side=tk.LEFT, padx=4)
+        
+        # keyboard shortcuts
+        self.root.bind("<Control-z>", lambda event: self.undo())
+        self.root.bind("<Control-y>", lambda event: self.redo())
+        self.root.bind("<Control-Z>", lambda event: self.redo())
+        
+        # right buttons
+        right_buttons = ttk.Frame(top_frame)
+        right_buttons.pack(side=tk.RIGHT)
+        
+        # host selector, when there are other hosts to edit
+        if len(self.hosts) > 1:
+            host_combo = ttk.Combobox(
+                right_buttons,
+                width=18,
+                values=list(self.hosts),
+                textvariable=self.host_var,
+                state="readonly",
+                style="TCombobox"
+            )
+            host_combo.pack(side=tk.LEFT, padx=(0, 8))
+            host_combo.bind("<<ComboboxSelected>>", lambda event: self.switch_host())
+        
+        tools_btn = tk.Menubutton(
+            right_buttons, 
+            text="Tools ▾", 
             bg=self.bg_dark,
             fg=self.text_light,
             bd=2,
@@ -265,11 +2959,21 @@ class ModernCronGUI:
             padx=12,
             pady=6
         )
-        add_btn.pack(side=tk.LEFT, padx=4)
-        
-        # right buttons
-        right_buttons = ttk.Frame(top_frame)
-        right_buttons.pack(side=tk.RIGHT)
+        tools_btn.pack(side=tk.LEFT, padx=4)
+        
+        self.tools_menu = tk.Menu(tools_btn, tearoff=0, bg=self.bg_medium, fg=self.text_light)
+        self.tools_menu.add_command(label="Check for Overlaps...", command=self.show_overlaps)
+        self.tools_menu.add_command(label="Resource Limits Audit...", command=self.show_governor_audit)
+        self.tools_menu.add_command(label="Find Duplicate Jobs...", command=self.show_duplicates)
+        self.tools_menu.add_command(label="Missed Runs...", command=self.show_missed_runs)
+        self.tools_menu.add_command(label="Boot Burst...", command=self.show_boot_burst)
+        self.tools_menu.add_command(label="Compare With File...", command=self.compare_with_file)
+        if len(self.hosts) > 1:
+            self.tools_menu.add_command(label="Fleet Drift...", command=self.show_fleet_drift)
+        self.tools_menu.add_command(label="Resource Limit Defaults...", command=self.edit_governor_settings)
+        self.tools_menu.add_command(label="Load Cron Log File...", command=self.load_log_file)
+        self.tools_menu.add_command(label="Clear Run History", command=self.clear_run_history)
+        tools_btn.configure(menu=self.tools_menu)
         
         help_btn = tk.Button(
             right_buttons, 
@@ -353,12 +3057,30 @@ class ModernCronGUI:
         )
         entries_frame.pack(fill=tk.BOTH, expand=False, pady=(0, 25))
         
+        # grouping
+        group_frame = ttk.Frame(entries_frame)
+        group_frame.pack(fill=tk.X, padx=25, pady=(15, 0))
+        
+        group_label = ttk.Label(group_frame, text="Group by")
+        group_label.pack(side=tk.LEFT, padx=(0, 10))
+        
+        group_combo = ttk.Combobox(
+            group_frame,
+            width=14,
+            values=list(GROUPINGS),
+            textvariable=self.group_by,
+            state="readonly",
+            style="TCombobox"
+        )
+        group_combo.pack(side=tk.LEFT)
+        group_combo.bind("<<ComboboxSelected>>", lambda event: self.arrange_rows())
+        
         # container for treeview and scrollbar 
         tree_container = ttk.Frame(entries_frame)
         tree_container.pack(fill=tk.BOTH, expand=True, padx=25, pady=20)  
         
         # setup treeview columns
-        columns = ("schedule", "command", "comment")
+        columns = ("schedule", "command", "comment", "owner", "tz", "next_run", "last_run", "status", "p50", "p95", "fail_rate")
         self.entries_tree = ttk.Treeview(
             tree_container, 
             columns=columns, 
@@ -371,11 +3093,32 @@ class ModernCronGUI:
         self.entries_tree.heading("schedule", text="Schedule")
         self.entries_tree.heading("command", text="Command")
         self.entries_tree.heading("comment", text="Comment")
+        self.entries_tree.heading("owner", text="Owner")
+        self.entries_tree.heading("tz", text="TZ")
+        self.entries_tree.heading("next_run", text="Next Run")
+        self.entries_tree.heading("last_run", text="Last Run")
+        self.entries_tree.heading("status", text="Status")
+        self.entries_tree.heading("p50", text="p50")
+        self.entries_tree.heading("p95", text="p95")
+        self.entries_tree.heading("fail_rate", text="Fail %")
+        
+        # sortable columns
+        for column in SORT_COLUMNS:
+            self.entries_tree.heading(column, command=lambda column=column: self.sort_by(column))
         
         # columns config
         self.entries_tree.column("schedule", width=130, minwidth=100)
-        self.entries_tree.column("command", width=750, minwidth=500)
-        self.entries_tree.column("comment", width=380, minwidth=250)
+        self.entries_tree.column("command", width=500, minwidth=300)
+        self.entries_tree.column("comment", width=280, minwidth=150)
+        self.entries_tree.column("owner", width=110, minwidth=80)
+        self.entries_tree.column("tz", width=130, minwidth=80)
+        self.entries_tree.column("next_run", width=150, minwidth=120)
+        self.entries_tree.column("last_run", width=190, minwidth=150)
+        self.entries_tree.column("status", width=130, minwidth=100)
+        self.entries_tree.column("p50", width=80, minwidth=60)
+        self.entries_tree.column("p95", width=80, minwidth=60)
+        self.entries_tree.column("fail_rate", width=90, minwidth=70)
+        self.entries_tree.column("#0", width=0, stretch=False)
         
         
         # scrollbar
@@ -558,101 +3301,1335 @@ class ModernCronGUI:
         status_frame = ttk.Frame(status_container, style="Container.TFrame")
         status_frame.pack(fill=tk.X, padx=15, pady=8)
         
-        # status with user info
-        status_text = f"User: {self.current_user}"
-        if not self.is_elevated:
-            status_text += " (limited permissions)"
+        # status with user info
+        status_text = f"User: {self.current_user}"
+        if not self.is_elevated:
+            status_text += " (limited permissions)"
+        
+        status_label = ttk.Label(
+            status_frame, 
+            text=status_text,
+            style="StatusBar.TLabel"
+        )
+        status_label.pack(side=tk.LEFT)
+        
+        # notes from the auto-refresh
+        self.notice_label = ttk.Label(
+            status_frame, 
+            text="",
+            style="StatusBar.TLabel"
+        )
+        self.notice_label.pack(side=tk.LEFT, padx=(30, 0))
+        
+        # live timings when profiling
+        if self.profiler:
+            self.profile_label = ttk.Label(
+                status_frame, 
+                text="profiling on",
+                style="StatusBar.TLabel"
+            )
+            self.profile_label.pack(side=tk.LEFT, padx=(30, 0))
+            self.profiler.listeners.append(self.show_profile)
+            if self.profiler.last:
+                self.show_profile(self.profiler.last)
+        
+        # version info
+        version_label = ttk.Label(
+            status_frame, 
+            text="CronGUI v2.0",
+            style="StatusBar.TLabel"
+        )
+        version_label.pack(side=tk.RIGHT)
+
+    def show_profile(self, record):
+        def ms(seconds):
+            return f"{seconds * 1000:.0f}ms"
+        
+        self.profile_label.configure(text=(
+            f"⏱ {record['action']} {ms(record['wall'])} · proc {ms(record['subprocess'])} · "
+            f"tk {ms(record['render'])} · py {ms(record['other'])}"
+        ))
+    
+    def apply_preset(self, schedule):
+        parts = schedule.split()
+        fields = ["minute", "hour", "day", "month", "weekday"]
+        
+        for i, field in enumerate(fields):
+            self.time_entries[field].delete(0, tk.END)
+            self.time_entries[field].insert(0, parts[i])
+    
+    def clear_fields(self):
+        fields = ["minute", "hour", "day", "month", "weekday"]
+        for field in fields:
+            self.time_entries[field].delete(0, tk.END)
+            self.time_entries[field].insert(0, "*")
+        
+        self.command_entry.delete(0, tk.END)
+        self.comment_entry.delete(0, tk.END)
+        self.raw_entry.delete(0, tk.END)
+    
+    def run_command(self, args, **kwargs):
+        # subprocess.run with captured text output, timed separately when profiling
+        start = time.perf_counter()
+        try:
+            return subprocess.run(args, capture_output=True, text=True, **kwargs)
+        finally:
+            if self.profiler:
+                self.profiler.add("subprocess", time.perf_counter() - start)
+    
+    def source_label(self, source):
+        if self.host != LOCAL_HOST:
+            return f"{self.host_user}'s crontab on {self.host}" if source == USER_SOURCE else f"{self.host}:{source}"
+        if source == USER_SOURCE:
+            return "your crontab"
+        if is_user_crontab(source):
+            return f"{source_owner(source, self.current_user)}'s crontab"
+        return source
+    
+    def source_editable(self, source):
+        if self.host != LOCAL_HOST:
+            return source in self.host_writable
+        if source == USER_SOURCE:
+            return True
+        if is_user_crontab(source):
+            return self.is_elevated
+        # files are replaced atomically, which needs the directory to be writable too
+        return os.access(source, os.W_OK) and os.access(os.path.dirname(source), os.W_OK)
+    
+    @profiled("refresh")
+    def load_crontab(self):
+        if self.host != LOCAL_HOST:
+            self.load_host()
+            return
+        
+        try:
+            try:
+                # fingerprints first, a change while reading shows up next time
+                fingerprints = source_fingerprints(self.run_command)
+                sources = load_sources(self.current_user, self.run_command)
+            except RuntimeError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            
+            self.show_sources({source: (fingerprints.get(source), entries) for source, entries in sources.items()})
+            write_snapshot(self.current_user, self.snapshot_sources)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+    
+    def load_host(self):
+        # the host being edited, fetched in one round trip unless the
+        # background fetch already has it
+        fetched = self.fetched_hosts.pop(self.host, None)
+        if not isinstance(fetched, tuple):
+            try:
+                fetched = fetch_host(self.hosts[self.host])
+            except RuntimeError as e:
+                messagebox.showerror("Error", str(e))
+                return False
+        
+        self.host_user, texts, self.host_writable = fetched
+        self.show_sources({source: (None, entries) for source, entries in host_sources(self.host_user, texts).items()})
+        return True
+    
+    def fetch_hosts(self):
+        # open a connection to every host at once and keep what they send
+        results = queue.Queue(maxsize=1)
+        transports = [transport for transport in self.hosts.values() if transport]
+        threading.Thread(target=lambda: results.put(for_hosts(fetch_host, transports)), daemon=True).start()
+        self.set_notice(f"Connecting to {len(transports)} host(s)...")
+        self.root.after(100, self.poll_fetch_hosts, results)
+    
+    def poll_fetch_hosts(self, results):
+        try:
+            fetched = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.poll_fetch_hosts, results)
+            return
+        
+        self.fetched_hosts.update(fetched)
+        failed = sorted(host for host, result in fetched.items() if not isinstance(result, tuple))
+        self.set_notice(f"Can't reach {', '.join(failed)}" if failed else "")
+    
+    def switch_host(self):
+        host = self.host_var.get()
+        if host == self.host:
+            return
+        if self.dirty_sources and not messagebox.askyesno(
+                "Unsaved Edits", f"Your edits on {self.host} haven't been saved.\n\nSwitch to {host} and drop them?",
+                icon='warning'):
+            self.host_var.set(self.host)
+            return
+        
+        # the watcher and the snapshot are for this machine only
+        if self.host == LOCAL_HOST:
+            write_snapshot(self.current_user, self.snapshot_sources)
+            self.stop_watcher()
+        
+        previous, self.host = self.host, host
+        if host == LOCAL_HOST:
+            self.load_crontab()
+        elif not self.load_host():
+            # still showing the previous host
+            self.host = previous
+            self.host_var.set(previous)
+        
+        if self.host == LOCAL_HOST and self.auto_refresh.get():
+            self.start_watcher()
+    
+    def show_sources(self, sources):
+        # replace the model with {source: (fingerprint, entries)}, in order
+        self.crontab_entries = []
+        self.entry_meta = []
+        
+        for source, (_, entries) in sources.items():
+            for line, owner in entries:
+                self.crontab_entries.append(line)
+                self.entry_meta.append((source, owner))
+        self.snapshot_sources = dict(sources)
+        
+        # a fresh load is the new baseline for undo
+        self.history.clear()
+        self.dirty_sources.clear()
+        
+        # runtime stats and cron logs are this machine's
+        if self.host != LOCAL_HOST:
+            self.job_stats = {}
+            self.update_entries_display()
+            return
+        
+        self.load_job_stats()
+        self.update_entries_display()
+        
+        # catch up on the cron logs in the background
+        self.scan_run_history()
+    
+    def open_snapshot(self):
+        # show the last session's sources, then read again in the background
+        # only the ones whose fingerprint has changed
+        snapshot = read_snapshot(self.current_user)
+        if not snapshot:
+            return False
+        
+        for schedule, zone, after, until, run in snapshot.get("next_runs", []):
+            NEXT_RUNS.setdefault((schedule, zone), (after, until, run))
+        self.show_sources({source: (fingerprint, [tuple(entry) for entry in entries])
+                           for source, fingerprint, entries in snapshot["sources"]})
+        self.set_notice("Showing the last session, checking for changes...")
+        
+        known = {source: fingerprint for source, (fingerprint, _) in self.snapshot_sources.items()}
+        results = queue.Queue(maxsize=1)
+        
+        def worker():
+            try:
+                results.put(refresh_sources(known, self.current_user))
+            except Exception as e:
+                results.put(e)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_snapshot_refresh, results)
+        return True
+    
+    def poll_snapshot_refresh(self, results):
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.poll_snapshot_refresh, results)
+            return
+        
+        # another host is showing by now
+        if self.host != LOCAL_HOST:
+            return
+        
+        if isinstance(result, Exception):
+            # start over the slow way
+            self.set_notice("")
+            self.load_crontab()
+            return
+        
+        fingerprints, fresh = result
+        for source, entries in fresh.items():
+            if source in fingerprints:
+                self.snapshot_sources[source] = (fingerprints[source], entries)
+            else:
+                self.snapshot_sources.pop(source, None)
+        
+        self.set_notice("")
+        if fresh:
+            self.merge_sources(fresh)
+        write_snapshot(self.current_user, self.snapshot_sources)
+    
+    def entry_row_values(self, entry, meta=(USER_SOURCE, ""), zone=""):
+        # split entry into schedule, command and inline comment
+        schedule, command, comment = split_entry(entry)
+        
+        # next start in host time, worked out in the entry's CRON_TZ
+        tz = next_start = ""
+        if schedule == "@reboot":
+            next_start = "at boot"
+        elif schedule is not None:
+            tz = zone or "local"
+            if not zone_table(zone):
+                tz += " (unknown)"
+            start = next_run(schedule, zone, int(time.time()) // 60 * 60)
+            if start is not None:
+                next_start = time.strftime("%Y-%m-%d %H:%M", time.localtime(start))
+        else:
+            schedule = "Invalid schedule"
+        
+        # last run and result, if cron has logged this command
+        last_run = status = ""
+        stats = self.run_history.lookup(command, comment) if self.host == LOCAL_HOST else None
+        if stats and stats["last_run"]:
+            last_run = time.strftime("%Y-%m-%d %H:%M", time.localtime(stats["last_run"]))
+            status = "ok" if not stats["last_exit"] else f"failed ({stats['last_exit']})"
+        
+        # recorded runtimes, the wrapper itself is hidden behind a marker
+        p50 = p95 = fail_rate = ""
+        original = unwrap_recorded(command)
+        stats = self.job_stats.get(job_id(original))
+        if stats:
+            p50 = format_duration(stats["p50"])
+            p95 = format_duration(stats["p95"])
+            fail_rate = f"{stats['failure_rate'] * 100:.1f}%"
+        if original != command:
+            command = f"⏱ {split_stagger(command)[0]}{original}"
+        
+        return (schedule, command, comment, meta[1], tz, next_start, last_run, status, p50, p95, fail_rate)
+    
+    def update_entries_display(self):
+        # clear current entries
+        for item in self.entries_tree.get_children():
+            self.entries_tree.delete(item)
+        
+        # add entries to treeview
+        self.entry_zones = entry_zones(self.crontab_entries, self.entry_meta)
+        self.entry_keys = []
+        for i, entry in enumerate(self.crontab_entries):
+            values = self.entry_row_values(entry, self.entry_meta[i], self.entry_zones[i])
+            self.entry_keys.append(self.entry_sort_keys(entry, values))
+            self.entries_tree.insert("", tk.END, values=values, iid=str(i))
+        
+        if self.sort_column or self.group_by.get() != "None":
+            self.arrange_rows()
+    
+    def apply_ops(self, ops):
+        # apply edit ops to the entries and patch the treeview rows they touch,
+        # rather than rebuilding the whole view
+        old_count = len(self.crontab_entries)
+        first_shifted = None
+        modified = set()
+        zone_changed = False
+        
+        for op in ops:
+            kind, index = op[0], op[1]
+            zone_changed = zone_changed or any(CRON_TZ_RE.match(line) for line in op[2:-1])
+            if kind == "modify":
+                self.crontab_entries[index] = op[3]
+                modified.add(index)
+            elif kind == "insert":
+                self.crontab_entries.insert(index, op[2])
+                self.entry_meta.insert(index, op[3])
+            else:
+                del self.crontab_entries[index]
+                del self.entry_meta[index]
+            
+            if kind != "modify" and (first_shifted is None or index < first_shifted):
+                first_shifted = index
+        
+        # rows are keyed by index, so add or drop rows at the end then
+        # rewrite everything from the first insert/delete onwards
+        new_count = len(self.crontab_entries)
+        for i in range(new_count, old_count):
+            self.entries_tree.delete(str(i))
+        for i in range(old_count, new_count):
+            self.entries_tree.insert("", tk.END, iid=str(i))
+        
+        if first_shifted is not None:
+            modified = {i for i in modified if i < first_shifted}
+            modified.update(range(first_shifted, new_count))
+        
+        # a CRON_TZ line moves every entry below it to another zone
+        self.entry_zones = entry_zones(self.crontab_entries, self.entry_meta)
+        if zone_changed:
+            modified.update(range(min(modified, default=first_shifted or 0), new_count))
+        
+        self.refresh_rows(i for i in modified if i < new_count)
+        
+        # new rows went in at the end, put them where they sort
+        if self.sort_column or self.group_by.get() != "None":
+            self.arrange_rows()
+        
+        return first_shifted if first_shifted is not None else min(modified, default=None)
+    
+    def refresh_rows(self, indices=None):
+        # recompute the values of existing rows in place
+        if indices is None:
+            indices = range(len(self.crontab_entries))
+        
+        # rows only ever change from the first insert or delete onwards, so the
+        # keys just need trimming or padding to size first
+        del self.entry_keys[len(self.crontab_entries):]
+        self.entry_keys += [None] * (len(self.crontab_entries) - len(self.entry_keys))
+        
+        for i in indices:
+            values = self.entry_row_values(self.crontab_entries[i], self.entry_meta[i], self.entry_zones[i])
+            self.entry_keys[i] = self.entry_sort_keys(self.crontab_entries[i], values)
+            self.entries_tree.item(str(i), values=values)
+    
+    def entry_sort_keys(self, entry, values):
+        # one key per SORT_COLUMNS entry, in that order
+        schedule, command, _ = split_entry(entry)
+        compiled = compile_schedule(schedule) if schedule else None
+        original = unwrap_recorded(command) if command is not None else ""
+        stats = self.job_stats.get(job_id(original))
+        return (
+            # most often first
+            -compiled.runs_per_day() if compiled else math.inf,
+            # soonest first, the formatted time sorts as it is and "at boot"
+            # after it
+            values[5] or "~",
+            original.lower(),
+            values[2].lower(),
+            values[3],
+            # longest first
+            -stats["p50"] if stats else math.inf,
+        )
+    
+    def sort_by(self, column):
+        # clicking the sorted column again turns the order around
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = column, False
+        
+        for name in SORT_COLUMNS:
+            text = self.entries_tree.heading(name, "text").rstrip(" ▲▼")
+            if name == column:
+                text += " ▼" if self.sort_reverse else " ▲"
+            self.entries_tree.heading(name, text=text)
+        self.arrange_rows()
+    
+    def entry_group(self, index):
+        grouping = self.group_by.get()
+        if grouping == "Owner":
+            return self.entry_meta[index][1] or "(none)"
+        if grouping == "Source":
+            return self.source_label(self.entry_meta[index][0])
+        # next run hour, from the sort key's formatted time so groups sort by date
+        next_start = self.entry_keys[index][1]
+        if not next_start[:1].isdigit():
+            return "at boot" if next_start == "at boot" else "not scheduled"
+        return f"{next_start[:13]}:00"
+    
+    def refresh_next_runs(self):
+        # rows whose next run has come round get their next run (and its sort
+        # key) moved on, returns whether there were any
+        now = time.strftime("%Y-%m-%d %H:%M")
+        stale = [i for i, keys in enumerate(self.entry_keys) if keys and keys[1][:1].isdigit() and keys[1] <= now]
+        self.refresh_rows(stale)
+        return bool(stale)
+    
+    def next_minute_delay(self):
+        # ms until just past the start of the next minute, when runs are due
+        return 60000 - int(time.time() * 1000) % 60000 + 100
+    
+    def tick_next_runs(self):
+        # keep the Next Run column, and anything sorted or grouped by it, current
+        if self.refresh_next_runs() and (self.sort_column == "next_run" or self.group_by.get() == "Next Run Hour"):
+            self.arrange_rows()
+        self.root.after(self.next_minute_delay(), self.tick_next_runs)
+    
+    def arrange_rows(self):
+        # order the rows by the sort column and put them under their group.
+        # set_children reorders a whole level in one call, moving a row at a
+        # time walks the list for every row
+        tree = self.entries_tree
+        if self.sort_column == "next_run" or self.group_by.get() == "Next Run Hour":
+            self.refresh_next_runs()
+        order = range(len(self.crontab_entries))
+        if self.sort_column:
+            column = SORT_COLUMNS.index(self.sort_column)
+            order = sorted(order, key=lambda i: self.entry_keys[i][column], reverse=self.sort_reverse)
+        
+        old_groups = [item_id for item_id in tree.get_children() if item_id.startswith("group:")]
+        
+        if self.group_by.get() == "None":
+            tree.set_children("", *map(str, order))
+            tree.delete(*old_groups)
+            tree.configure(show="headings")
+            tree.column("#0", width=0, stretch=False)
+            return
+        
+        members = {}
+        for i in order:
+            members.setdefault(self.entry_group(i), []).append(str(i))
+        
+        # groups that are still needed keep their open or closed state
+        group_ids = []
+        for group in sorted(members):
+            group_id = f"group:{group}"
+            label = f"{group} ({len(members[group])})"
+            if tree.exists(group_id):
+                tree.item(group_id, text=label)
+            else:
+                tree.insert("", tk.END, iid=group_id, text=label, open=True)
+            group_ids.append(group_id)
+        
+        tree.set_children("", *group_ids)
+        for group_id in group_ids:
+            tree.set_children(group_id, *members[group_id[6:]])
+        tree.delete(*[item_id for item_id in old_groups if item_id[6:] not in members])
+        tree.configure(show="tree headings")
+        tree.column("#0", width=220, stretch=False)
+    
+    def selected_rows(self):
+        # the selected entry rows, without any group rows
+        return [item_id for item_id in self.entries_tree.selection() if not item_id.startswith("group:")]
+    
+    def modify_op(self, index, new_entry):
+        return ("modify", index, self.crontab_entries[index], new_entry, self.entry_meta[index])
+    
+    def op_sources(self, ops):
+        # sources an edit touches, every op carries its entry's meta last
+        return {op[-1][0] for op in ops}
+    
+    def commit_ops(self, ops):
+        # record a user edit for undo and apply it
+        if not ops:
+            return None
+        
+        sources = self.op_sources(ops)
+        read_only = sorted(source for source in sources if not self.source_editable(source))
+        if read_only:
+            messagebox.showwarning("Read Only", "\n".join(self.source_label(source) for source in read_only) +
+                                   "\n\ncan't be changed without root. Duplicate an entry to copy it into your crontab.")
+            return None
+        
+        self.history.record(ops)
+        self.dirty_sources.update(sources)
+        return self.apply_ops(ops)
+    
+    def undo(self):
+        ops = self.history.undo()
+        if ops is None:
+            return
+        self.dirty_sources.update(self.op_sources(ops))
+        self.show_touched_row(self.apply_ops(ops))
+    
+    def redo(self):
+        ops = self.history.redo()
+        if ops is None:
+            return
+        self.dirty_sources.update(self.op_sources(ops))
+        self.show_touched_row(self.apply_ops(ops))
+    
+    def source_range(self, source):
+        # entries of a source are kept together, start and end of its block
+        start = end = None
+        for i, meta in enumerate(self.entry_meta):
+            if meta[0] == source:
+                if start is None:
+                    start = i
+                end = i + 1
+            elif start is not None:
+                break
+        
+        if start is None:
+            # an empty source goes where it would sort, the user's crontab first
+            start = end = 0 if source == USER_SOURCE else next(
+                (i for i, meta in enumerate(self.entry_meta)
+                 if meta[0] != USER_SOURCE and meta[0] > source), len(self.entry_meta))
+        return start, end
+    
+    def source_entries(self, source):
+        start, end = self.source_range(source)
+        return self.crontab_entries[start:end]
+    
+    def show_touched_row(self, index):
+        if index is None or not self.crontab_entries:
+            return
+        
+        index = min(index, len(self.crontab_entries) - 1)
+        self.entries_tree.selection_set(str(index))
+        self.entries_tree.see(str(index))
+    
+    def toggle_auto_refresh(self):
+        settings = load_settings()
+        settings["auto_refresh"] = self.auto_refresh.get()
+        try:
+            save_settings(settings)
+        except OSError:
+            pass
+        
+        if self.auto_refresh.get() and self.host == LOCAL_HOST:
+            self.start_watcher()
+        else:
+            self.stop_watcher()
+    
+    def start_watcher(self):
+        if self.watcher:
+            return
+        
+        watches = [(CRON_D_DIR, lambda name: os.path.join(CRON_D_DIR, name))]
+        fallback_checks = {}
+        
+        spool = spool_file(effective_user())
+        if spool and os.access(os.path.dirname(spool), os.R_OK | os.X_OK):
+            user_name = os.path.basename(spool)
+            watches.append((os.path.dirname(spool),
+                            lambda name: USER_SOURCE if name == user_name else other_user_source(name)))
+        else:
+            # the spool isn't readable without root, so ask crontab itself now and then
+            last_output = [None]
+            
+            def user_crontab_changed():
+                result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
+                digest = hashlib.sha1(result.stdout.encode("utf-8")).hexdigest()
+                changed = last_output[0] is not None and digest != last_output[0]
+                last_output[0] = digest
+                return changed
+            
+            user_crontab_changed()
+            fallback_checks[USER_SOURCE] = user_crontab_changed
+        
+        self.watcher = SourceWatcher(watches, fallback_checks)
+        self.watcher.start()
+        self.root.after(250, self.poll_watcher, self.watcher)
+    
+    def stop_watcher(self):
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+        self.pending_sources.clear()
+        self.set_notice("")
+    
+    def poll_watcher(self, watcher):
+        # stop once this watcher has been switched off or replaced
+        if watcher is not self.watcher:
+            return
+        
+        while True:
+            try:
+                self.pending_sources.add(watcher.changes.get_nowait())
+                self.last_change = time.monotonic()
+            except queue.Empty:
+                break
+        
+        # editors and config management write in bursts, wait for it to settle
+        if self.pending_sources and time.monotonic() - self.last_change >= 0.5:
+            sources, self.pending_sources = self.pending_sources, set()
+            self.reload_sources(sources)
+        
+        self.root.after(250, self.poll_watcher, watcher)
+    
+    def reload_sources(self, sources):
+        # read the sources that changed on disk and merge them into the view
+        fresh = {}
+        for source in sources:
+            if source in self.dirty_sources:
+                fresh[source] = None
+                continue
+            try:
+                fresh[source] = read_source(source, self.current_user, self.run_command) or []
+            except RuntimeError:
+                continue
+            # checked again when the snapshot is next opened
+            self.snapshot_sources[source] = (None, fresh[source])
+        self.merge_sources(fresh)
+    
+    def merge_sources(self, fresh):
+        # merge {source: entries} read from disk into the view, leaving sources
+        # with unsaved edits alone and keeping the selection
+        selected = [(self.crontab_entries[int(item_id)], self.entry_meta[int(item_id)])
+                    for item_id in self.selected_rows()]
+        kept = []
+        changed = False
+        
+        for source in sorted(fresh, key=lambda source: (source != USER_SOURCE, source)):
+            if source in self.dirty_sources:
+                kept.append(source)
+                continue
+            
+            start, end = self.source_range(source)
+            lines = [line for line, _ in fresh[source]]
+            old_lines = self.crontab_entries[start:end]
+            old_owners = [meta[1] for meta in self.entry_meta[start:end]]
+            if lines == old_lines and [owner for _, owner in fresh[source]] == old_owners:
+                continue
+            
+            # undo history from here on would point at the wrong entries
+            if self.history.reaches(start):
+                self.history.clear()
+            
+            self.apply_ops(self.merge_ops(source, start, end, fresh[source]))
+            changed = True
+        
+        if changed:
+            # put the selection back on the same entries
+            positions = {}
+            for i, key in enumerate(zip(self.crontab_entries, self.entry_meta)):
+                positions.setdefault(key, i)
+            still_there = [str(positions[key]) for key in selected if key in positions]
+            if still_there:
+                self.entries_tree.selection_set(still_there)
+        
+        if kept:
+            self.set_notice("Changed on disk, your unsaved edits were kept: " + ", ".join(kept))
+        elif changed:
+            self.set_notice("Reloaded " + ", ".join(sorted(fresh)) + time.strftime(" at %H:%M:%S"))
+    
+    def merge_ops(self, source, start, end, fresh):
+        # a line level diff keeps unchanged rows where they are, that needs
+        # every entry in the source to have the same owner
+        owners = {owner for _, owner in fresh} | {meta[1] for meta in self.entry_meta[start:end]}
+        if len(owners) <= 1:
+            owner = owners.pop() if owners else ""
+            return diff_ops(self.crontab_entries[start:end], [line for line, _ in fresh], start, (source, owner))
+        
+        ops = [("delete", i, self.crontab_entries[i], self.entry_meta[i]) for i in range(end - 1, start - 1, -1)]
+        ops += [("insert", start + offset, line, (source, owner)) for offset, (line, owner) in enumerate(fresh)]
+        return ops
+    
+    def set_notice(self, text):
+        if self.notice_label:
+            self.notice_label.configure(text=text)
+    
+    def load_job_stats(self):
+        jobs = {job_id(unwrap_recorded(split_entry(entry)[1])) for entry in self.crontab_entries}
+        
+        try:
+            self.job_stats = self.run_stats.summary(jobs)
+        except Exception:
+            # stats are a nice-to-have, don't stop the crontab loading
+            self.job_stats = {}
+    
+    def toggle_recording(self):
+        selected_items = self.selected_rows()
+        
+        if not selected_items:
+            return
+        
+        ops = []
+        skipped = []
+        for item_id in selected_items:
+            index = int(item_id)
+            entry = self.crontab_entries[index]
+            schedule, command, comment = split_entry(entry)
+            if schedule is None:
+                continue
+            
+            # wrap unwrapped commands, unwrap wrapped ones
+            original = unwrap_recorded(command)
+            if original != command:
+                new_command = original
+            else:
+                try:
+                    new_command = wrap_recorded(command, self.run_stats.path)
+                except ValueError:
+                    skipped.append(command)
+                    continue
+            
+            ops.append(self.modify_op(index, join_entry(schedule, new_command, comment)))
+        
+        self.commit_ops(ops)
+        
+        if skipped:
+            message = "These commands contain % and can't be wrapped for recording:\n"
+            for command in skipped[:5]:
+                message += f"- {command}\n"
+            messagebox.showwarning("Runtime Recording", message)
+    
+    def make_button(self, parent, text, command):
+        # same white bordered tk.Button as the main window
+        return tk.Button(
+            parent, 
+            text=text, 
+            command=command,
+            bg=self.bg_dark,
+            fg=self.text_light,
+            bd=2,
+            relief="solid",
+            highlightbackground=self.text_light,  
+            highlightcolor=self.text_light,       
+            activebackground=self.bg_dark,
+            activeforeground=self.text_light,
+            font=("Orbitron", 10, "bold"),
+            padx=12,
+            pady=6
+        )
+    
+    def open_report_window(self, title, columns):
+        # a toplevel with a title, a results table and a row for buttons
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("1100x600")
+        window.configure(bg=self.bg_dark)
+        
+        container = ttk.Frame(window)
+        container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        title_label = ttk.Label(container, text=title, style="Header.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 10))
+        
+        buttons_frame = ttk.Frame(container)
+        buttons_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        
+        tree_container = ttk.Frame(container)
+        tree_container.pack(fill=tk.BOTH, expand=True)
+        
+        tree = ttk.Treeview(tree_container, columns=[key for key, _, _ in columns], show="headings", style="Treeview")
+        for key, text, width in columns:
+            tree.heading(key, text=text)
+            tree.column(key, width=width, minwidth=60)
+        
+        scrollbar = ttk.Scrollbar(tree_container, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        return window, tree, buttons_frame
+    
+    def entry_durations(self):
+        # run time per entry, a duration= in the comment wins over the recorded p95
+        durations = {}
+        for index, entry in enumerate(self.crontab_entries):
+            schedule, command, comment = split_entry(entry)
+            if schedule is None:
+                continue
+            
+            duration = declared_duration(comment)
+            if duration is None:
+                stats = self.job_stats.get(job_id(unwrap_recorded(command)))
+                duration = stats["p95"] if stats else None
+            if duration is not None:
+                durations[index] = duration
+        return durations
+    
+    def show_overlaps(self, overlaps=None):
+        if overlaps is None:
+            overlaps = find_overlaps(self.crontab_entries, self.entry_durations())
+        
+        if not overlaps:
+            messagebox.showinfo("Overlap Check", "No jobs can overlap, based on the known run times.\n\n"
+                                "Add duration=10m to a comment, or record runtimes, to include a job.")
+            return
+        
+        window, tree, buttons_frame = self.open_report_window("Overlapping Jobs", [
+            ("schedule", "Schedule", 150),
+            ("command", "Command", 450),
+            ("problem", "Problem", 250),
+            ("gap", "Shortest Gap", 130),
+            ("duration", "Run Time", 110),
+        ])
+        
+        for i, overlap in enumerate(overlaps):
+            schedule, command, _ = split_entry(self.crontab_entries[overlap["index"]])
+            tree.insert("", tk.END, iid=str(i), values=(
+                schedule, unwrap_recorded(command), overlap["problem"],
+                format_duration(overlap["gap"] * 60), format_duration(overlap["duration"])))
+        
+        def selected_overlaps():
+            return [overlaps[int(item_id)] for item_id in tree.selection()] or overlaps
+        
+        def wrap_flock():
+            ops = []
+            for overlap in selected_overlaps():
+                index = overlap["index"]
+                entry = self.crontab_entries[index]
+                schedule, command, comment = split_entry(entry)
+                if flock_path(unwrap_recorded(command)):
+                    continue
+                try:
+                    new_command = wrap_command(command, self.governor_settings(), kinds=("flock",))
+                except ValueError:
+                    continue
+                ops.append(self.modify_op(index, join_entry(schedule, new_command, comment)))
+            self.commit_ops(ops)
+            window.destroy()
+        
+        def adjust_interval():
+            ops = []
+            for overlap in selected_overlaps():
+                index = overlap["index"]
+                entry = self.crontab_entries[index]
+                schedule, command, comment = split_entry(entry)
+                new_schedule = suggest_interval(schedule, overlap["duration"])
+                if new_schedule and new_schedule != schedule:
+                    ops.append(self.modify_op(index, join_entry(new_schedule, command, comment)))
+            self.commit_ops(ops)
+            window.destroy()
+        
+        self.make_button(buttons_frame, "Wrap with flock -n", wrap_flock).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Adjust Interval", adjust_interval).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Close", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def governor_settings(self):
+        settings = dict(GOVERNOR_DEFAULTS)
+        settings.update(load_settings().get("governor", {}))
+        return settings
+    
+    def rewrite_commands(self, indices, rewrite):
+        # apply rewrite(command) to the given entries as one undoable edit
+        ops = []
+        for index in indices:
+            entry = self.crontab_entries[index]
+            schedule, command, comment = split_entry(entry)
+            if schedule is None:
+                continue
+            new_command = rewrite(command)
+            if new_command != command:
+                ops.append(self.modify_op(index, join_entry(schedule, new_command, comment)))
+        self.commit_ops(ops)
+        return len(ops)
+    
+    def apply_governor(self, indices=None):
+        # commands with a bare % can't go under /bin/sh -c, they are left alone
+        settings = self.governor_settings()
+        if indices is None:
+            indices = [int(item_id) for item_id in self.selected_rows()]
+        skipped = []
+        
+        def wrap(command):
+            try:
+                return wrap_command(command, settings)
+            except ValueError:
+                skipped.append(command)
+                return command
+        
+        self.rewrite_commands(indices, wrap)
+        if skipped:
+            message = "These commands contain % and can't be wrapped with resource limits:\n"
+            for command in skipped[:5]:
+                message += f"- {command}\n"
+            messagebox.showwarning("Resource Limits", message)
+    
+    def remove_governor(self):
+        # a boot stagger isn't a resource limit, it stays
+        def remove(command):
+            original = unwrap_recorded(command)
+            if original != command:
+                stripped = remove(original)
+                if stripped == original:
+                    return command
+                return wrap_recorded(split_stagger(command)[0] + stripped, recorded_db(command))
+            
+            wrappers, inner = strip_wrappers(command)
+            kept = [text for kind, text in wrappers if kind == "stagger" or BOOT_LOCK_RE.match(text)]
+            if len(kept) < len(wrappers) and not any(BOOT_LOCK_RE.match(text) for text in kept):
+                inner = unwrap_shell(inner)
+            return "".join(kept) + inner
+        
+        indices = [int(item_id) for item_id in self.selected_rows()]
+        self.rewrite_commands(indices, remove)
+    
+    def edit_governor_settings(self):
+        settings = self.governor_settings()
+        
+        window = tk.Toplevel(self.root)
+        window.title("Resource Limit Defaults")
+        window.configure(bg=self.bg_dark)
+        
+        container = ttk.Frame(window)
+        container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        fields = [
+            ("nice", "Nice level (blank to skip)"),
+            ("ionice_class", "ionice class (blank to skip)"),
+            ("timeout", "Timeout, e.g. 30m (blank to skip)"),
+            ("lock_dir", "Lock file directory"),
+        ]
+        entries = {}
+        for row, (key, text) in enumerate(fields):
+            ttk.Label(container, text=text).grid(row=row, column=0, sticky=tk.W, pady=5)
+            entry = ttk.Entry(container, style="TEntry")
+            entry.insert(0, str(settings.get(key, "")))
+            entry.grid(row=row, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
+            entries[key] = entry
+        
+        use_flock = tk.BooleanVar(value=bool(settings.get("flock")))
+        flock_check = tk.Checkbutton(
+            container, 
+            text="Skip a run while the previous one holds its lock (flock -n)",
+            variable=use_flock,
+            bg=self.bg_dark,
+            fg=self.text_light,
+            selectcolor=self.bg_medium,
+            activebackground=self.bg_dark,
+            activeforeground=self.text_light,
+            font=("Orbitron", 10)
+        )
+        flock_check.grid(row=len(fields), column=0, columnspan=2, sticky=tk.W, pady=5)
+        
+        def save():
+            governor = {key: entry.get().strip() for key, entry in entries.items()}
+            governor["flock"] = use_flock.get()
+            
+            all_settings = load_settings()
+            all_settings["governor"] = governor
+            try:
+                save_settings(all_settings)
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
+                return
+            window.destroy()
+        
+        buttons_frame = ttk.Frame(container)
+        buttons_frame.grid(row=len(fields) + 1, column=0, columnspan=2, sticky=tk.EW, pady=(10, 0))
+        self.make_button(buttons_frame, "Save", save).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Cancel", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def show_governor_audit(self):
+        # jobs missing any resource limit, the ones that run most often first
+        rows = []
+        for index, entry in enumerate(self.crontab_entries):
+            schedule, command, _ = split_entry(entry)
+            compiled = compile_schedule(schedule) if schedule else None
+            if not compiled:
+                continue
+            
+            # a boot lock queues @reboot jobs, it isn't the flock limit
+            present = {kind for kind, text in strip_wrappers(unwrap_recorded(command))[0] if not BOOT_LOCK_RE.match(text)}
+            missing = [kind for kind in LIMIT_KINDS if kind not in present]
+            if missing:
+                rows.append((compiled.runs_per_day(), index, schedule, command, missing))
+        
+        rows.sort(key=lambda row: -row[0])
+        
+        window, tree, buttons_frame = self.open_report_window("Resource Limits Audit", [
+            ("runs", "Runs/Day", 110),
+            ("schedule", "Schedule", 150),
+            ("command", "Command", 550),
+            ("missing", "Missing", 250),
+        ])
+        
+        for runs, index, schedule, command, missing in rows:
+            tree.insert("", tk.END, iid=str(index), values=(
+                f"{runs:g}" if runs >= 1 else f"{runs:.2f}", schedule, unwrap_recorded(command), ", ".join(missing)))
+        
+        def wrap_selected():
+            window.destroy()
+            self.apply_governor([int(item_id) for item_id in tree.selection()])
+        
+        self.make_button(buttons_frame, "Apply Limits to Selected", wrap_selected).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Close", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def show_duplicates(self):
+        # jobs that run the same command at the same times, and schedules that
+        # have a shorter way of being written
+        groups = find_duplicates(self.crontab_entries, self.entry_meta, self.entry_zones)
+        shorter = {}
+        editable = {source for source in set(meta[0] for meta in self.entry_meta) if self.source_editable(source)}
+        for index, entry in enumerate(self.crontab_entries):
+            schedule, command, comment = split_entry(entry)
+            if schedule is None or self.entry_meta[index][0] not in editable:
+                continue
+            canonical = canonical_schedule(schedule)
+            if len(canonical) < len(schedule):
+                shorter[index] = join_entry(canonical, command, comment)
+        
+        if not groups and not shorter:
+            messagebox.showinfo("Duplicate Jobs", "No duplicate jobs, and every schedule is already in its shortest form.")
+            return
         
-        status_label = ttk.Label(
-            status_frame, 
-            text=status_text,
-            style="StatusBar.TLabel"
+        window, tree, buttons_frame = self.open_report_window("Duplicate Jobs", [
+            ("group", "Group", 70),
+            ("kind", "Match", 100),
+            ("schedule", "Schedule", 150),
+            ("shortest", "Shortest Form", 150),
+            ("command", "Command", 450),
+            ("owner", "Owner", 100),
+        ])
+        
+        # rows are keyed "group:index", or "short:index" for a schedule with a
+        # shorter form that isn't a duplicate
+        grouped = set()
+        for group, indices in enumerate(groups):
+            exact = len({split_entry(self.crontab_entries[index])[:2] for index in indices}) == 1
+            for index in indices:
+                schedule, command, _ = split_entry(self.crontab_entries[index])
+                tree.insert("", tk.END, iid=f"{group}:{index}", values=(
+                    group + 1, "exact" if exact else "equivalent", schedule, canonical_schedule(schedule),
+                    unwrap_recorded(command), self.entry_meta[index][1]))
+                grouped.add(index)
+        for index in shorter:
+            if index not in grouped:
+                schedule, command, _ = split_entry(self.crontab_entries[index])
+                tree.insert("", tk.END, iid=f"short:{index}", values=(
+                    "", "shorter", schedule, canonical_schedule(schedule), unwrap_recorded(command),
+                    self.entry_meta[index][1]))
+        
+        def merge_selected():
+            # keep one job of each group, taking a comment from the others if it has none.
+            # read-only jobs can't be removed, so one of those is kept if there is one
+            # and any others are left alone
+            selected = [item_id.split(':')[0] for item_id in tree.selection()]
+            chosen = {int(group) for group in selected if group != "short"} if selected else range(len(groups))
+            modifies, deletes, skipped = [], [], []
+            for group in chosen:
+                locked = [index for index in groups[group] if self.entry_meta[index][0] not in editable]
+                keep = locked[0] if locked else groups[group][0]
+                rest = [index for index in groups[group] if index != keep and index not in locked]
+                skipped += [index for index in locked if index != keep]
+                schedule, command, comment = split_entry(self.crontab_entries[keep])
+                if not comment and not locked:
+                    comment = next((split_entry(self.crontab_entries[index])[2] for index in rest
+                                    if split_entry(self.crontab_entries[index])[2]), "")
+                    if comment:
+                        modifies.append(self.modify_op(keep, join_entry(schedule, command, comment)))
+                deletes += rest
+            
+            # highest index first so the others stay put
+            ops = modifies + [("delete", index, self.crontab_entries[index], self.entry_meta[index])
+                              for index in sorted(deletes, reverse=True)]
+            skipped_sources = sorted({self.source_label(self.entry_meta[index][0]) for index in skipped})
+            self.commit_ops(ops)
+            window.destroy()
+            if skipped:
+                messagebox.showinfo("Read Only", f"{len(skipped)} duplicate(s) in\n\n" + "\n".join(skipped_sources) +
+                                    "\n\ncan't be removed without root and were left as they are.")
+        
+        def shorten_schedules():
+            # the selected rows, or every one listed
+            selected = {int(item_id.split(':')[1]) for item_id in tree.selection()}
+            self.commit_ops([self.modify_op(index, entry) for index, entry in shorter.items()
+                             if not selected or index in selected])
+            window.destroy()
+        
+        if groups:
+            self.make_button(buttons_frame, "Merge Duplicates", merge_selected).pack(side=tk.LEFT, padx=5)
+        if shorter:
+            self.make_button(buttons_frame, f"Shorten {len(shorter)} Schedules",
+                             shorten_schedules).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Close", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def compare_with_file(self):
+        # an export or a backup against the crontab as it is in the editor
+        file_path = filedialog.askopenfilename(
+            title="Compare With File",
+            filetypes=[("Crontab files", "*.cron"), ("Text files", "*.txt"), ("All files", "*.*")]
         )
-        status_label.pack(side=tk.LEFT)
+        if not file_path:
+            return
         
-        # version info
-        version_label = ttk.Label(
-            status_frame, 
-            text="CronGUI v2.0",
-            style="StatusBar.TLabel"
-        )
-        version_label.pack(side=tk.RIGHT)
-
-    def apply_preset(self, schedule):
-        parts = schedule.split()
-        fields = ["minute", "hour", "day", "month", "weekday"]
+        text = read_text(file_path)
+        if text is None:
+            messagebox.showerror("Compare Error", f"Failed to read {file_path}")
+            return
         
-        for i, field in enumerate(fields):
-            self.time_entries[field].delete(0, tk.END)
-            self.time_entries[field].insert(0, parts[i])
+        entries = [(line, None) for line in self.source_entries(USER_SOURCE)]
+        self.show_diff("Compare With File", [os.path.basename(file_path), self.source_label(USER_SOURCE)],
+                       [parse_crontab_lines(text), entries])
     
-    def clear_fields(self):
-        fields = ["minute", "hour", "day", "month", "weekday"]
-        for field in fields:
-            self.time_entries[field].delete(0, tk.END)
-            self.time_entries[field].insert(0, "*")
-        
-        self.command_entry.delete(0, tk.END)
-        self.comment_entry.delete(0, tk.END)
-        self.raw_entry.delete(0, tk.END)
+    def show_fleet_drift(self):
+        # every host side by side, this one as it is in the editor. the others
+        # are fetched all at once in the background
+        host = self.host
+        others = [transport for name, transport in self.hosts.items() if name != host and transport]
+        view = view_diff_entries(self.crontab_entries, self.entry_meta)
+        results = queue.Queue(maxsize=1)
+        
+        def worker():
+            fetched = for_hosts(fetch_host, others)
+            if host != LOCAL_HOST:
+                try:
+                    fetched[LOCAL_HOST] = load_sources(self.current_user)
+                except RuntimeError as e:
+                    fetched[LOCAL_HOST] = e
+            results.put(fetched)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.set_notice(f"Fetching {len(self.hosts) - 1} host(s) for Fleet Drift...")
+        self.root.after(100, self.poll_fleet_drift, results, host, view)
     
-    def load_crontab(self):
+    def poll_fleet_drift(self, results, host, view):
         try:
-            result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                if "no crontab" in result.stderr:
-                    self.crontab_entries = []
-                else:
-                    messagebox.showerror("Error", f"Failed to load crontab: {result.stderr}")
-                    return
-            
-            lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
-            self.crontab_entries = []
-            
-            for line in lines:
-                line = line.strip()
-                
-                if not line or line.startswith('#'):
+            fetched = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.poll_fleet_drift, results, host, view)
+            return
+        self.set_notice("")
+        
+        labels = [host]
+        sides = [view]
+        failed = []
+        for name in self.hosts:
+            result = fetched.get(name)
+            if isinstance(result, RuntimeError):
+                failed.append(name)
+            elif isinstance(result, tuple):
+                labels.append(name)
+                sides.append(host_diff_entries(result[1]))
+            elif result is not None:
+                labels.append(name)
+                sides.append(view_diff_entries([line for entries in result.values() for line, _ in entries],
+                                               [(source, owner) for source, entries in result.items()
+                                                for _, owner in entries]))
+        
+        title = "Fleet Drift" + (f" (can't reach {', '.join(failed)})" if failed else "")
+        self.show_diff(title, labels, sides)
+    
+    def show_diff(self, title, labels, sides):
+        # crontabs side by side, a row for each job that differs between them
+        rows = [(diff_status(cells, labels), cells) for cells in crontab_diff(sides)]
+        same = sum(status == "same" for status, _ in rows)
+        if same == len(rows):
+            messagebox.showinfo(title, f"No differences between {', '.join(labels)}.")
+            return
+        
+        window, tree, buttons_frame = self.open_report_window(f"{title}: {len(rows) - same} differ, {same} the same", [
+            ("status", "Status", 140),
+            ("what", "Command", 300),
+        ] + [(f"side{number}", label, 200) for number, label in enumerate(labels)])
+        
+        # rows are keyed by their place in the diff
+        for number, (status, cells) in enumerate(rows):
+            if status == "same":
+                continue
+            what = next(diff_cell(cell)[0] for cell in cells if cell)
+            tree.insert("", tk.END, iid=str(number), values=(status, what, *(diff_cell(cell)[1] for cell in cells)))
+        
+        self.make_button(buttons_frame, "Close", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def show_boot_burst(self):
+        # @reboot jobs all start the moment cron does. shows how many can be
+        # running at once, and spreads them out with sleeps or a few locks
+        jobs = [index for index, entry in enumerate(self.crontab_entries) if split_entry(entry)[0] == "@reboot"]
+        if not jobs:
+            messagebox.showinfo("Boot Burst", "No jobs run at boot.")
+            return
+        
+        commands = [split_entry(self.crontab_entries[index])[1] for index in jobs]
+        window, tree, buttons_frame = self.open_report_window(
+            f"Boot Burst: {len(jobs)} jobs start at boot, up to {boot_burst(commands)} at once", [
+                ("delay", "Delay", 80),
+                ("lock", "Boot Lock", 220),
+                ("command", "Command", 500),
+                ("owner", "Owner", 100),
+                ("source", "Source", 200),
+            ])
+        
+        # rows are keyed by entry index
+        for index, command in zip(jobs, commands):
+            delay, lock = boot_stagger(command)
+            tree.insert("", tk.END, iid=str(index), values=(
+                format_duration(delay) if delay else "", lock or "", unwrap_recorded(stagger_command(command)),
+                self.entry_meta[index][1],
+                self.source_label(self.entry_meta[index][0])))
+        
+        ttk.Label(buttons_frame, text="Seconds apart").pack(side=tk.LEFT, padx=(5, 5))
+        step_entry = ttk.Entry(buttons_frame, width=5, style="TEntry")
+        step_entry.insert(0, "15")
+        step_entry.pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Label(buttons_frame, text="At most at once").pack(side=tk.LEFT, padx=(5, 5))
+        slots_entry = ttk.Entry(buttons_frame, width=5, style="TEntry")
+        slots_entry.insert(0, "2")
+        slots_entry.pack(side=tk.LEFT, padx=(0, 10))
+        
+        def restagger(rewrite):
+            # jobs keep their order, only the ones that can be saved are changed
+            ops = []
+            for position, index in enumerate(jobs):
+                if not self.source_editable(self.entry_meta[index][0]):
                     continue
-                
-                self.crontab_entries.append(line)
-            
-            self.update_entries_display()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+                schedule, command, comment = split_entry(self.crontab_entries[index])
+                new_command = rewrite(position, command)
+                if new_command != command:
+                    ops.append(self.modify_op(index, join_entry(schedule, new_command, comment)))
+            self.commit_ops(ops)
+            window.destroy()
+        
+        def read_number(entry, name):
+            try:
+                value = int(entry.get())
+            except ValueError:
+                value = 0
+            if value < 1:
+                messagebox.showerror("Boot Burst", f"{name} has to be a whole number above 0.")
+                return None
+            return value
+        
+        def stagger():
+            step = read_number(step_entry, "Seconds apart")
+            if step:
+                restagger(lambda position, command: stagger_command(command, position * step))
+        
+        def serialize():
+            slots = read_number(slots_entry, "At most at once")
+            if slots:
+                lock_dir = self.governor_settings().get("lock_dir") or "/tmp"
+                restagger(lambda position, command: stagger_command(
+                    command, lock=os.path.join(lock_dir, f"crongui-boot-{position % slots}.lock")))
+        
+        self.make_button(buttons_frame, "Stagger With Sleeps", stagger).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Queue On Locks", serialize).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Remove Stagger",
+                         lambda: restagger(lambda position, command: stagger_command(command))).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Close", window.destroy).pack(side=tk.RIGHT, padx=5)
     
-    def update_entries_display(self):
-        # clear current entries
-        for item in self.entries_tree.get_children():
-            self.entries_tree.delete(item)
+    def scan_run_history(self, extra_paths=()):
+        self.pending_logs.extend(extra_paths)
         
-        # add entries to treeview
-        for i, entry in enumerate(self.crontab_entries):
-            # check for inline comments
-            comment = ""
-            if '#' in entry:
-                entry_parts, comment = entry.split('#', 1)
-                entry_parts = entry_parts.strip()
-                comment = comment.strip()
-            else:
-                entry_parts = entry
-            
-            # split entry into schedule and command
-            parts = entry_parts.split(None, 5)
-            
-            if len(parts) >= 6:
-                schedule = " ".join(parts[:5])
-                command = parts[5]
-            else:
-                schedule = "Invalid schedule"
-                command = entry_parts
-            
-            self.entries_tree.insert("", tk.END, values=(schedule, command, comment), iid=str(i))
+        # one scan at a time, anything new is picked up when it finishes
+        if self.history_scan and self.history_scan.is_alive():
+            return
+        
+        # the default logs plus any file that has been loaded before
+        paths = [path for path in DEFAULT_CRON_LOGS if os.access(path, os.R_OK)]
+        paths += [path for path in list(self.run_history.files) + self.pending_logs if path not in paths]
+        self.pending_logs = []
+        
+        def worker():
+            self.run_history.scan(paths)
+            try:
+                self.run_history.save()
+            except OSError:
+                pass
+        
+        self.history_scan = threading.Thread(target=worker, daemon=True)
+        self.history_scan.start()
+        self.root.after(200, self.poll_run_history)
+    
+    def poll_run_history(self):
+        # tk isn't thread safe, so wait for the scan here and refresh from the main loop
+        if self.history_scan.is_alive():
+            self.root.after(200, self.poll_run_history)
+            return
+        
+        self.refresh_rows()
+        
+        if self.pending_logs:
+            self.scan_run_history()
+    
+    def load_log_file(self):
+        file_path = filedialog.askopenfilename(
+            title="Load Cron Log",
+            filetypes=[("Log files", "*.log"), ("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        
+        if not file_path:
+            return
+        
+        self.scan_run_history(extra_paths=[file_path])
+    
+    def clear_run_history(self):
+        if self.history_scan and self.history_scan.is_alive():
+            return
+        
+        self.run_history.files = {}
+        self.run_history.commands = {}
+        
+        try:
+            os.unlink(self.run_history.path)
+        except OSError:
+            pass
+        
+        self.refresh_rows()
     
+    @profiled("select")
     def on_entry_select(self, event):
-        selected_items = self.entries_tree.selection()
+        selected_items = self.selected_rows()
         
         if not selected_items:
             return
@@ -662,37 +4639,33 @@ class ModernCronGUI:
         entry = self.crontab_entries[int(item_id)]
         
         # parse it
-        comment = ""
-        if '#' in entry:
-            entry_parts, comment = entry.split('#', 1)
-            entry_parts = entry_parts.strip()
-            comment = comment.strip()
-        else:
-            entry_parts = entry
+        schedule, command, comment = split_entry(entry)
         
-        parts = entry_parts.split(None, 5)
-        
-        if len(parts) >= 6:
-            # fill time fields
+        if schedule is not None:
+            # fill time fields, a macro's with what it stands for (none for @reboot)
+            parts = (SCHEDULE_MACROS.get(schedule, schedule) or "").split()
             fields = ["minute", "hour", "day", "month", "weekday"]
             for i, field in enumerate(fields):
                 self.time_entries[field].delete(0, tk.END)
-                self.time_entries[field].insert(0, parts[i])
+                self.time_entries[field].insert(0, parts[i] if parts else "")
             
             # fill command
             self.command_entry.delete(0, tk.END)
-            self.command_entry.insert(0, parts[5])
+            self.command_entry.insert(0, command)
             
             # fill comment
             self.comment_entry.delete(0, tk.END)
             self.comment_entry.insert(0, comment)
             
-            # fill raw entry
+            # fill raw entry, the only place a macro can be edited as it is
             self.raw_entry.delete(0, tk.END)
-            self.raw_entry.insert(0, entry_parts)
+            self.raw_entry.insert(0, f"{schedule} {command}")
+            if schedule.startswith('@'):
+                self.notebook.select(1)
     
+    @profiled("update")
     def update_entry(self):
-        selected_items = self.entries_tree.selection()
+        selected_items = self.selected_rows()
         
         if not selected_items:
             messagebox.showwarning("Warning", "No entry selected to edit")
@@ -726,8 +4699,9 @@ class ModernCronGUI:
         else: 
             entry = self.raw_entry.get()
             
-            if not entry or len(entry.split()) < 6:
-                messagebox.showwarning("Warning", "Invalid crontab format. Need at least 6 components")
+            if not entry or split_entry(entry)[0] is None:
+                messagebox.showwarning("Warning", "Invalid crontab format. Need a schedule (5 fields or @reboot, "
+                                       "@daily...) and a command")
                 return
             
             # get comment
@@ -738,21 +4712,18 @@ class ModernCronGUI:
             entry = f"{entry} # {comment}"
         
         # update entry
-        item_id = selected_items[0]
-        self.crontab_entries[int(item_id)] = entry
+        index = int(selected_items[0])
+        old_entry = self.crontab_entries[index]
         
-        # update the display
-        self.update_entries_display()
+        if entry != old_entry:
+            self.commit_ops([self.modify_op(index, entry)])
     
     def add_new_entry(self):
         # have a default entry
-        self.crontab_entries.append("* * * * * echo 'New job'")
-        
-        # update display
-        self.update_entries_display()
+        new_id = self.source_range(USER_SOURCE)[1]
+        self.commit_ops([("insert", new_id, "* * * * * echo 'New job'", (USER_SOURCE, self.current_user))])
         
         # select the new entry
-        new_id = len(self.crontab_entries) - 1
         self.entries_tree.selection_set(str(new_id))
         self.entries_tree.see(str(new_id))
         
@@ -763,12 +4734,18 @@ class ModernCronGUI:
     def show_context_menu(self, event):
         item = self.entries_tree.identify_row(event.y)
         
-        if item:
-            self.entries_tree.selection_set(item)
+        if item and not item.startswith("group:"):
+            # keep a multi selection if the click was inside it
+            if item not in self.entries_tree.selection():
+                self.entries_tree.selection_set(item)
             
             self.context_menu = tk.Menu(self.root, tearoff=0, bg=self.bg_medium, fg=self.text_light)
             self.context_menu.add_command(label="Delete Entry", command=self.delete_selected_entry)
             self.context_menu.add_command(label="Duplicate Entry", command=self.duplicate_selected_entry)
+            self.context_menu.add_command(label="Run Now", command=self.run_selected_now)
+            self.context_menu.add_command(label="Toggle Runtime Recording", command=self.toggle_recording)
+            self.context_menu.add_command(label="Apply Resource Limits", command=self.apply_governor)
+            self.context_menu.add_command(label="Remove Resource Limits", command=self.remove_governor)
             
             # bindings to close the menu when clicking elsewhere
             self.root.bind("<Button-1>", self.close_context_menu)
@@ -788,8 +4765,301 @@ class ModernCronGUI:
         # restore original treeview binding
         self.entries_tree.bind("<Button-3>", self.show_context_menu)
         
+    def job_environment(self, index):
+        # what cron would start a job with: its own few variables, then the
+        # crontab's settings above the entry. returns (env, home, run as user)
+        source, owner = self.entry_meta[index]
+        owner = owner or effective_user()
+        try:
+            import pwd
+            home = pwd.getpwnam(owner).pw_dir
+        except (ImportError, KeyError):
+            home = os.path.expanduser("~")
+        
+        env = {"PATH": CRON_PATH, "SHELL": "/bin/sh", "HOME": home, "LOGNAME": owner, "USER": owner}
+        start, _ = self.source_range(source)
+        for line in self.crontab_entries[start:index]:
+            if ENV_RE.match(line):
+                name, value = parse_env_line(line)
+                env[name] = value
+        
+        # only root can start it as someone else
+        user = owner if self.is_elevated and owner != effective_user() else None
+        return env, home, user
+    
+    def run_selected_now(self):
+        if self.host != LOCAL_HOST:
+            messagebox.showinfo("Run Now", f"Run Now starts jobs on this machine, not on {self.host}.")
+            return
+        indices = sorted(int(item_id) for item_id in self.selected_rows())
+        indices = [index for index in indices if split_entry(self.crontab_entries[index])[0] is not None]
+        if not indices:
+            return
+        
+        self.open_run_window()
+        for index in indices:
+            self.start_run(index)
+        
+        self.run_tree.selection_set(str(max(self.runs)))
+        self.show_run_output()
+    
+    def start_run(self, index):
+        # hand an entry to the job runner and give it a row in the run panel
+        if self.job_runner is None:
+            self.job_runner = JobRunner(workers=4, stats=self.run_stats)
+            self.root.after(100, self.poll_runs)
+        
+        command = split_entry(self.crontab_entries[index])[1]
+        env, home, user = self.job_environment(index)
+        owner = self.entry_meta[index][1] or effective_user()
+        
+        # a recorded job records itself
+        job = None if unwrap_recorded(command) != command else job_id(command)
+        run = self.job_runner.submit(command, env, cwd=home, user=user, job=job)
+        
+        note = "" if user or owner == effective_user() else f"(as {effective_user()}, not {owner})\n"
+        self.runs[run] = {"command": unwrap_recorded(command), "status": "queued", "duration": "",
+                          "output": [("info", f"$ {unwrap_recorded(command)}\n{note}")], "size": 0}
+        if self.run_window and self.run_window.winfo_exists():
+            self.run_tree.insert("", 0, iid=str(run), values=(run, unwrap_recorded(command), "queued", ""))
+        return run
+    
+    def feed_replays(self):
+        # start queued catch-up runs while fewer than replay_limit are going
+        self.replay_runs &= self.runs.keys()
+        active = sum(self.runs[run]["status"] in ("queued", "running") for run in self.replay_runs)
+        while self.replay_queue and active < self.replay_limit:
+            index, entry = self.replay_queue.popleft()
+            # the entry may have moved if the crontab was edited meanwhile
+            if index >= len(self.crontab_entries) or self.crontab_entries[index] != entry:
+                if entry not in self.crontab_entries:
+                    continue
+                index = self.crontab_entries.index(entry)
+            self.replay_runs.add(self.start_run(index))
+            active += 1
+    
+    def show_missed_runs(self):
+        # ask for the downtime window. it ends at boot by default, and starts
+        # at the last run cron logged before then
+        if self.host != LOCAL_HOST:
+            messagebox.showinfo("Missed Runs", f"Missed runs come from this machine's cron logs, not {self.host}'s.")
+            return
+        up = boot_time() or int(time.time())
+        logged = [stats["last_run"] for stats in self.run_history.commands.values()
+                  if stats.get("last_run") and stats["last_run"] < up]
+        down = max(logged) if logged else up - 3600
+        
+        window = tk.Toplevel(self.root)
+        window.title("Missed Runs")
+        window.configure(bg=self.bg_dark)
+        
+        container = ttk.Frame(window)
+        container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        fields = [
+            ("start", "Down from (YYYY-MM-DD HH:MM)", time.strftime("%Y-%m-%d %H:%M", time.localtime(down))),
+            ("end", "Back up at", time.strftime("%Y-%m-%d %H:%M", time.localtime(up))),
+            ("concurrency", "Catch-up runs at once (1-4)", str(self.replay_limit)),
+        ]
+        entries = {}
+        for row, (key, text, value) in enumerate(fields):
+            ttk.Label(container, text=text).grid(row=row, column=0, sticky=tk.W, pady=5)
+            entry = ttk.Entry(container, style="TEntry")
+            entry.insert(0, value)
+            entry.grid(row=row, column=1, sticky=tk.EW, padx=(10, 0), pady=5)
+            entries[key] = entry
+        
+        def find():
+            try:
+                start = parse_local_time(entries["start"].get())
+                end = parse_local_time(entries["end"].get())
+                concurrency = int(entries["concurrency"].get())
+            except ValueError as e:
+                messagebox.showerror("Missed Runs", str(e))
+                return
+            if end <= start:
+                messagebox.showerror("Missed Runs", "The window ends before it starts.")
+                return
+            
+            # the runner has four workers, more at once wouldn't run any sooner
+            self.replay_limit = max(1, min(concurrency, 4))
+            window.destroy()
+            self.show_replay_plan(start, end)
+        
+        buttons_frame = ttk.Frame(container)
+        buttons_frame.grid(row=len(fields), column=0, columnspan=2, sticky=tk.EW, pady=(10, 0))
+        self.make_button(buttons_frame, "Find Missed Runs", find).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Cancel", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def show_replay_plan(self, start, end):
+        missed = missed_runs(self.crontab_entries, self.entry_zones, start, end)
+        stamp = lambda timestamp: time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+        if not missed:
+            messagebox.showinfo("Missed Runs", f"No jobs were due between {stamp(start)} and {stamp(end)}.")
+            return
+        
+        plan = replay_plan(missed, self.replay_limit, self.entry_durations())
+        window, tree, buttons_frame = self.open_report_window(
+            f"Missed Runs, {stamp(start)} to {stamp(end)}", [
+                ("order", "#", 50),
+                ("slot", "Slot", 60),
+                ("after", "Starts After", 110),
+                ("count", "Missed", 80),
+                ("first", "First Missed", 150),
+                ("last", "Last Missed", 150),
+                ("command", "Command", 400),
+                ("owner", "Owner", 100),
+            ])
+        
+        # rows are keyed by entry index, in replay order
+        for order, action in enumerate(plan, 1):
+            index = action["index"]
+            tree.insert("", tk.END, iid=str(index), values=(
+                order, action["slot"], format_offset(action["offset"]), action["count"], stamp(action["first"]),
+                stamp(action["last"]), unwrap_recorded(split_entry(self.crontab_entries[index])[1]),
+                self.entry_meta[index][1]))
+        
+        def replay(indices):
+            # once per job however many starts it missed, in plan order
+            self.replay_queue.extend((index, self.crontab_entries[index]) for index in indices)
+            self.open_run_window()
+            self.feed_replays()
+            if self.runs:
+                self.run_tree.selection_set(str(max(self.runs)))
+                self.show_run_output()
+            window.destroy()
+        
+        def replay_selected():
+            selected = set(tree.selection())
+            replay([action["index"] for action in plan if str(action["index"]) in selected])
+        
+        self.make_button(buttons_frame, "Replay Selected", replay_selected).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, f"Replay All {len(plan)}",
+                         lambda: replay([action["index"] for action in plan])).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Close", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def open_run_window(self):
+        if self.run_window and self.run_window.winfo_exists():
+            self.run_window.lift()
+            return
+        
+        window, self.run_tree, buttons_frame = self.open_report_window("Run Now", [
+            ("run", "#", 50),
+            ("command", "Command", 650),
+            ("status", "Status", 150),
+            ("duration", "Run Time", 120),
+        ])
+        self.run_tree.configure(height=6)
+        self.run_window = window
+        
+        # output of the selected run, fed in from poll_runs as it arrives
+        self.run_output = tk.Text(buttons_frame.master, height=18, bg=self.bg_medium, fg=self.text_light,
+                                  insertbackground=self.text_light, relief=tk.FLAT, wrap=tk.NONE,
+                                  font=("Courier", 10))
+        self.run_output.tag_configure("stderr", foreground="#F85149")
+        self.run_output.tag_configure("info", foreground=self.text_muted)
+        self.run_output.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True, pady=(10, 0))
+        
+        for run, info in sorted(self.runs.items()):
+            self.run_tree.insert("", 0, iid=str(run), values=(run, info["command"], info["status"], info["duration"]))
+        self.run_tree.bind("<<TreeviewSelect>>", lambda event: self.show_run_output())
+        
+        def stop_selected():
+            for item_id in self.run_tree.selection():
+                if self.runs[int(item_id)]["status"] in ("queued", "running"):
+                    self.job_runner.stop(int(item_id))
+        
+        def stop_replay():
+            # drop the catch-up runs that haven't started and stop the rest
+            self.replay_queue.clear()
+            for run in self.replay_runs:
+                if self.runs.get(run, {}).get("status") in ("queued", "running"):
+                    self.job_runner.stop(run)
+        
+        def clear_finished():
+            for run in [run for run, info in self.runs.items() if info["status"] not in ("queued", "running")]:
+                del self.runs[run]
+                self.run_tree.delete(str(run))
+            self.show_run_output()
+        
+        self.make_button(buttons_frame, "Stop", stop_selected).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Stop Catch-up", stop_replay).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Clear Finished", clear_finished).pack(side=tk.LEFT, padx=5)
+        self.make_button(buttons_frame, "Close", window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def shown_run(self):
+        if not (self.run_window and self.run_window.winfo_exists()):
+            return None
+        selection = self.run_tree.selection()
+        return int(selection[0]) if selection else None
+    
+    def show_run_output(self):
+        run = self.shown_run()
+        self.run_output.delete("1.0", tk.END)
+        if run in self.runs:
+            for tag, text in self.runs[run]["output"]:
+                self.run_output.insert(tk.END, text, tag)
+            self.run_output.see(tk.END)
+    
+    def poll_runs(self):
+        # hand run output to the panel a batch at a time, so a chatty job
+        # can't hold up the main loop
+        shown = self.shown_run()
+        finished = False
+        
+        for _ in range(500):
+            try:
+                event = self.job_runner.events.get_nowait()
+            except queue.Empty:
+                break
+            
+            run, kind = event[0], event[1]
+            info = self.runs.get(run)
+            if info is None:
+                continue
+            
+            if kind == "start":
+                info["status"] = "running"
+            elif kind == "exit":
+                exit_code, duration = event[2], event[3]
+                if exit_code is None:
+                    info["status"] = "cancelled"
+                elif run in self.job_runner.stopped:
+                    info["status"] = "stopped"
+                else:
+                    info["status"] = "ok" if exit_code == 0 else f"exit {exit_code}"
+                info["duration"] = format_duration(duration) if exit_code is not None else ""
+                finished = True
+                event = (run, "info", f"\n[{info['status']} after {format_duration(duration)}]\n")
+                kind = "info"
+            
+            if kind in ("stdout", "stderr", "info"):
+                text = event[2]
+                # keep the first megabyte of a run's output, and always its status line
+                if kind != "info":
+                    if info["size"] > 1024 * 1024:
+                        continue
+                    info["size"] += len(text)
+                    if info["size"] > 1024 * 1024:
+                        text += "\n[output truncated]\n"
+                info["output"].append((kind, text))
+                if run == shown:
+                    self.run_output.insert(tk.END, text, kind)
+                    self.run_output.see(tk.END)
+            
+            if self.run_window and self.run_window.winfo_exists() and self.run_tree.exists(str(run)):
+                self.run_tree.item(str(run), values=(run, info["command"], info["status"], info["duration"]))
+        
+        if finished:
+            # pick up the recorded durations and exit codes
+            self.load_job_stats()
+            self.refresh_rows()
+            self.feed_replays()
+        
+        self.root.after(100, self.poll_runs)
+    
     def duplicate_selected_entry(self):
-        selected_items = self.entries_tree.selection()
+        selected_items = self.selected_rows()
         
         if not selected_items:
             return
@@ -797,19 +5067,16 @@ class ModernCronGUI:
         item_id = selected_items[0]
         index = int(item_id)
         
-        # duplicate entry
-        self.crontab_entries.append(self.crontab_entries[index])
-        
-        # update display
-        self.update_entries_display()
+        # duplicate entry, copies of system entries go into the user's crontab
+        new_id = self.source_range(USER_SOURCE)[1]
+        self.commit_ops([("insert", new_id, self.crontab_entries[index], (USER_SOURCE, self.current_user))])
         
         # select the new entry
-        new_id = len(self.crontab_entries) - 1
         self.entries_tree.selection_set(str(new_id))
         self.entries_tree.see(str(new_id))
     
     def delete_selected_entry(self):
-        selected_items = self.entries_tree.selection()
+        selected_items = self.selected_rows()
         
         if not selected_items:
             return
@@ -825,11 +5092,9 @@ class ModernCronGUI:
             index = int(item_id)
             
             # remove the entry
-            del self.crontab_entries[index]
-            
-            # Update display
-            self.update_entries_display()
+            self.commit_ops([("delete", index, self.crontab_entries[index], self.entry_meta[index])])
 
+    @profiled("import")
     def import_crontab(self):
         # ask for a file to import
         file_path = filedialog.askopenfilename(
@@ -843,27 +5108,10 @@ class ModernCronGUI:
         try:
             # read the file
             with open(file_path, 'r') as file:
-                lines = file.readlines()
-            
-            # parse the entries
-            valid_entries = []
-            invalid_entries = []
+                valid, invalid = check_crontab(file.read())
             
-            for line in lines:
-                line = line.strip()
-                
-                # skkip empty or comment lines
-                if not line or line.startswith('#'):
-                    continue
-                
-                # validate the entry
-                parts = line.split()
-                
-                # check if the entry has enough parts (5 times and a command)
-                if len(parts) >= 6:
-                    valid_entries.append(line)
-                else:
-                    invalid_entries.append(line)
+            valid_entries = [line for line, _ in valid]
+            invalid_entries = [line for line, _ in invalid]
             
             # handle dud entries if any
             if invalid_entries:
@@ -885,9 +5133,10 @@ class ModernCronGUI:
                 confirm = messagebox.askyesno("Confirm Import", confirm_message)
                 
                 if confirm:
-                    # replace current with imported 
-                    self.crontab_entries = valid_entries
-                    self.update_entries_display()
+                    # replace current with imported, recorded as a diff so it can be undone
+                    start, _ = self.source_range(USER_SOURCE)
+                    self.commit_ops(diff_ops(self.source_entries(USER_SOURCE), valid_entries,
+                                             start, (USER_SOURCE, self.current_user)))
                     messagebox.showinfo("Import Successful", f"Successfully imported {len(valid_entries)} crontab entries.")
             else:
                 messagebox.showinfo("Import Result", "No valid crontab entries found in the file.")
@@ -895,9 +5144,11 @@ class ModernCronGUI:
         except Exception as e:
             messagebox.showerror("Import Error", f"Failed to import crontab: {str(e)}")
 
+    @profiled("export")
     def export_crontab(self):
         # no entries to export
-        if not self.crontab_entries:
+        entries = self.source_entries(USER_SOURCE)
+        if not entries:
             messagebox.showinfo("Export", "There are no crontab entries to export.")
             return
         
@@ -918,10 +5169,10 @@ class ModernCronGUI:
                 file.write("# Exported from CronGUI\n")
                 file.write("# Format: minute hour day month weekday command # comment\n\n")
                 
-                for entry in self.crontab_entries:
+                for entry in entries:
                     file.write(f"{entry}\n")
             
-            messagebox.showinfo("Export Successful", f"Successfully exported {len(self.crontab_entries)} crontab entries to:\n{file_path}")
+            messagebox.showinfo("Export Successful", f"Successfully exported {len(entries)} crontab entries to:\n{file_path}")
         
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export crontab: {str(e)}")
@@ -1044,56 +5295,568 @@ When a cron job runs, it uses a minimal environment. If your commands require sp
         )
         close_btn.pack(pady=(10, 0))
 
+    @profiled("save")
     def save_crontab(self):
         try:
-            # create a temp file with the entries
-            with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-                for entry in self.crontab_entries:
-                    temp_file.write(f"{entry}\n")
-                temp_file_name = temp_file.name
-            
-            # use the temp file to update crontab
-            result = subprocess.run(["crontab", temp_file_name], capture_output=True, text=True)
-            
-            # clean up temp file
-            os.unlink(temp_file_name)
-            
-            if result.returncode == 0:
-                messagebox.showinfo(
-                    "Success", 
-                    "Crontab updated successfully",
-                    icon='info'
-                )
-            else:
-                error_msg = result.stderr if result.stderr else "Unknown error"
-                messagebox.showerror(
-                    "Error", 
-                    f"Failed to update crontab: {error_msg}",
-                    icon='error'
-                )
-                
-                if not self.is_elevated:
-                    messagebox.showinfo(
-                        "Permission Issue", 
-                        "You may need elevated permissions to edit the crontab.\n"
-                        "Try running with sudo or as root.",
-                        icon='warning'
-                    )
-        
+            self.save_sources()
         except Exception as e:
             messagebox.showerror(
                 "Error", 
                 f"An error occurred: {str(e)}",
                 icon='error'
             )
+    
+    def save_sources(self):
+        # warn about jobs that can pile up on themselves before they go live
+        overlaps = find_overlaps(self.crontab_entries, self.entry_durations())
+        if overlaps:
+            confirm = messagebox.askyesno(
+                "Overlapping Jobs",
+                f"{len(overlaps)} job(s) can start again before the previous run has finished.\n\n"
+                "Save anyway?",
+                icon='warning'
+            )
+            if not confirm:
+                self.show_overlaps(overlaps)
+                return
+        
+        # everything with unsaved edits goes out together, or nothing does
+        targets = sorted(self.dirty_sources or {USER_SOURCE}, key=lambda source: (source != USER_SOURCE, source))
+        
+        problems = [problem for source in targets for problem in self.validate_source(source)]
+        if problems:
+            messagebox.showerror("Nothing Saved", "Fix these first, nothing has been written:\n\n" +
+                                 "\n".join(problems[:15]) +
+                                 (f"\n... and {len(problems) - 15} more" if len(problems) > 15 else ""))
+            return
+        
+        # what each target looks like now, to put back if a write fails
+        try:
+            if self.host != LOCAL_HOST:
+                current = fetch_host(self.hosts[self.host])[1]
+                snapshots = {source: current.get(source) for source in targets}
+            else:
+                snapshots = {source: read_source_text(source, self.run_command) for source in targets}
+        except RuntimeError as e:
+            messagebox.showerror("Nothing Saved", f"{e}\n\nNothing has been written.")
+            return
+        
+        # someone else changed a target since it was loaded, saving would
+        # quietly throw their edit away
+        def loaded(entries, system):
+            return [(line, owner or "" if system else "") for line, owner in entries]
+        
+        changed = [source for source in targets
+                   if loaded(parse_crontab_lines(snapshots[source] or "", not is_user_crontab(source)),
+                             not is_user_crontab(source))
+                   != loaded(self.snapshot_sources.get(source, (None, []))[1], not is_user_crontab(source))]
+        if changed and not messagebox.askyesno(
+                "Changed On Disk",
+                "Changed by something else since crongui loaded it:\n\n" +
+                "\n".join(self.source_label(source) for source in changed) +
+                "\n\nOverwrite those changes with yours?",
+                icon='warning', default='no'):
+            messagebox.showinfo("Nothing Saved", "Nothing has been written. Your edits are still here, "
+                                "copy them somewhere before refreshing to see the other changes.")
+            return
+        
+        texts = {source: self.source_text(source, snapshots[source]) for source in targets}
+        errors = self.write_sources(texts)
+        
+        if not errors:
+            self.dirty_sources.difference_update(targets)
+            for source in targets:
+                start, end = self.source_range(source)
+                self.snapshot_sources[source] = (None, [(line, meta[1]) for line, meta in
+                                                        zip(self.crontab_entries[start:end], self.entry_meta[start:end])])
+            messagebox.showinfo("Success", "Saved " + ", ".join(self.source_label(source) for source in targets),
+                                icon='info')
+            return
+        
+        # a failed write leaves its target as it was, put the others back too
+        rollback_errors = self.write_sources({source: snapshots[source] for source in targets
+                                              if source not in errors and snapshots[source] != texts[source]})
+        
+        report = []
+        for source in targets:
+            if source in errors:
+                report.append(f"✗ {self.source_label(source)}: {errors[source]}")
+            else:
+                report.append(f"• {self.source_label(source)}: written, then rolled back")
+            if source in rollback_errors:
+                report.append(f"   rollback failed, check it by hand: {rollback_errors[source]}")
+        
+        heading = "Nothing was saved" if not rollback_errors else "Saving failed and couldn't be fully undone"
+        message = heading + ":\n\n" + "\n".join(report)
+        if not self.is_elevated:
+            message += "\n\nYou may need elevated permissions. Try running with sudo or as root."
+        messagebox.showerror("Save Failed", message, icon='error')
+    
+    def validate_source(self, source):
+        # reasons cron would reject a source's entries, before anything is written
+        problems = []
+        system = not is_user_crontab(source)
+        start, end = self.source_range(source)
+        for entry, (_, owner) in zip(self.crontab_entries[start:end], self.entry_meta[start:end]):
+            if ENV_RE.match(entry):
+                continue
+            schedule = split_entry(entry)[0]
+            if not schedule or not compile_schedule(schedule):
+                problems.append(f"{self.source_label(source)}: invalid schedule: {entry}")
+            elif system and not owner:
+                problems.append(f"{self.source_label(source)}: no user to run as: {entry}")
+            elif '\n' in entry:
+                problems.append(f"{self.source_label(source)}: line break in entry: {entry!r}")
+        return problems
+    
+    def source_text(self, source, base=None):
+        # a source's entries as they'd be written out, as a patch of base (the
+        # text on disk) so its comments and blank lines survive the save
+        start, end = self.source_range(source)
+        entries = [(entry, meta[1]) for entry, meta in zip(self.crontab_entries[start:end], self.entry_meta[start:end])]
+        return patch_crontab_text(base or "", entries, system=not is_user_crontab(source))
+    
+    def write_sources(self, texts):
+        # write every source at once, {source: error} for the ones that failed
+        if not texts:
+            return {}
+        if self.host != LOCAL_HOST:
+            return push_host(self.hosts[self.host], texts)
+        
+        errors = {}
+        with ThreadPoolExecutor(max_workers=min(len(texts), 8)) as pool:
+            futures = {source: pool.submit(self.write_source, source, text) for source, text in texts.items()}
+            for source, future in futures.items():
+                try:
+                    future.result()
+                except (OSError, RuntimeError) as e:
+                    errors[source] = str(e)
+        return errors
+    
+    def write_source(self, source, text):
+        # replace a source with text, or remove it when text is None
+        if is_user_crontab(source):
+            if text is None:
+                result = self.run_command(crontab_args(source) + ["-r"])
+                if result.returncode != 0 and "no crontab" not in result.stderr:
+                    raise RuntimeError(result.stderr.strip() or "crontab -r failed")
+                return
+            
+            # use a temp file with the entries to update crontab
+            with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
+                temp_file.write(text)
+                temp_file_name = temp_file.name
+            try:
+                result = self.run_command(crontab_args(source) + [temp_file_name])
+            finally:
+                os.unlink(temp_file_name)
+            
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or "Unknown error")
+            return
+        
+        if text is None:
+            if os.path.exists(source):
+                os.unlink(source)
+            return
+        
+        # cron.d files are swapped in whole so cron never reads half a file
+        try:
+            mode = os.stat(source).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(source), prefix=".crongui-")
+        try:
+            with os.fdopen(fd, 'w') as file:
+                file.write(text)
+                file.flush()
+                os.fsync(file.fileno())
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, source)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+def missed_runs(entries, zones, start, end):
+    # jobs that should have started in [start, end), as one catch-up action
+    # each with how many starts it missed, earliest first. each schedule and
+    # zone pair is only worked out once
+    counted = {}
+    missed = []
+    for index, entry in enumerate(entries):
+        schedule = split_entry(entry)[0]
+        compiled = compile_schedule(schedule) if schedule else None
+        table = zone_table(zones[index])
+        if not compiled or not table:
+            continue
+        
+        key = (schedule, zones[index])
+        if key not in counted:
+            count = compiled.run_count(start, end, table)
+            counted[key] = (count, next(compiled.run_times(start, end, table), None) if count else None,
+                            compiled.last_run(start, end, table) if count else None)
+        count, first, last = counted[key]
+        if count:
+            missed.append({"index": index, "count": count, "first": first, "last": last})
+    
+    missed.sort(key=lambda action: (action["first"], action["index"]))
+    return missed
+
+
+def replay_plan(missed, concurrency, durations):
+    # when each catch-up starts, in seconds from the start of the replay, if
+    # they run in order with at most concurrency at once. durations maps
+    # entry index -> expected run time. a job without one is guessed at the
+    # median of the others (or a minute) to pick slots by, and the starts
+    # after it in its slot get an offset of None rather than a made up time.
+    # ties go to the slot that has started fewest jobs, the way the first
+    # few all start at once
+    known = [durations[action["index"]] for action in missed if action["index"] in durations]
+    guess = statistics.median(known) if known else 60
+    slots = [(0, 0, slot) for slot in range(max(concurrency, 1))]
+    unknown = set()
+    plan = []
+    for action in missed:
+        free, started, slot = heapq.heappop(slots)
+        plan.append(dict(action, slot=slot + 1, offset=None if slot in unknown else free))
+        if action["index"] not in durations:
+            unknown.add(slot)
+        heapq.heappush(slots, (free + durations.get(action["index"], guess), started + 1, slot))
+    return plan
+
+
+def format_offset(offset):
+    # a replay_plan offset, which is None when an earlier job's run time isn't known
+    return "unknown" if offset is None else format_duration(offset)
+
+
+def boot_time():
+    # when the host last booted, or None if /proc/stat can't say
+    try:
+        with open("/proc/stat") as stat_file:
+            for line in stat_file:
+                if line.startswith("btime "):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def parse_local_time(text):
+    # "YYYY-MM-DD HH:MM" in host time, or "now" or "boot"
+    text = text.strip()
+    if text == "now":
+        return int(time.time())
+    if text == "boot":
+        return boot_time() or int(time.time())
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return int(datetime.strptime(text, fmt).timestamp())
+        except ValueError:
+            continue
+    raise ValueError(f"can't read {text!r} as a time, use YYYY-MM-DD HH:MM")
+
+
+def fetch_path(directory, host, source):
+    # where a host's source goes in a fetch directory
+    return os.path.join(directory, host, "crontab" if source == USER_SOURCE else source.lstrip("/"))
+
+
+def run_fetch(directory, specs, output=None):
+    # crongui fetch: every host's crontabs into <directory>/<host>/, which is
+    # what crongui audit, crongui push and dir: hosts read
+    output = output or sys.stdout
+    status = 0
+    for host, result in for_hosts(fetch_host, [host_transport(spec) for spec in specs]).items():
+        if isinstance(result, RuntimeError):
+            print(f"crongui fetch: {result}", file=sys.stderr)
+            status = 1
+            continue
+        
+        # files removed on the host go from the copy too
+        _, texts, _ = result
+        os.makedirs(os.path.join(directory, host), exist_ok=True)
+        old = [fetch_path(directory, host, USER_SOURCE)] + cron_d_files(os.path.join(directory, host, "etc", "cron.d"))
+        for path in old:
+            if os.path.exists(path):
+                os.unlink(path)
+        for source, text in texts.items():
+            path = fetch_path(directory, host, source)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(text.rstrip("\n") + "\n")
+        print(f"{host}: {len(texts)} file(s)", file=output)
+    return status
+
+
+def run_push(directory, specs, output=None):
+    # crongui push: write each host's crontabs back from <directory>/<host>/.
+    # a host with a line cron would reject is left alone
+    output = output or sys.stdout
+    status = 0
+    changes = {}
+    for transport in map(host_transport, specs):
+        texts = {}
+        text = read_text(fetch_path(directory, transport.host, USER_SOURCE))
+        if text is not None:
+            texts[USER_SOURCE] = text
+        for path in cron_d_files(os.path.join(directory, transport.host, "etc", "cron.d")):
+            text = read_text(path)
+            if text is not None:
+                texts[os.path.join(CRON_D_DIR, os.path.basename(path))] = text
+        
+        invalid = [line for source, text in texts.items() for line, _ in check_crontab(text, source != USER_SOURCE)[1]]
+        if not texts or invalid:
+            problem = f"cron would reject {invalid[0]!r}" if invalid else "nothing to push"
+            print(f"crongui push: {transport.host}: {problem}", file=sys.stderr)
+            status = 1
+            continue
+        changes[transport] = texts
+    
+    results = for_hosts(lambda transport: push_host(transport, changes[transport]), list(changes))
+    for transport, texts in changes.items():
+        errors = results[transport.host]
+        for source, error in errors.items():
+            print(f"crongui push: {transport.host}:{source}: {error}", file=sys.stderr)
+            status = 1
+        print(f"{transport.host}: {len(texts) - len(errors)} of {len(texts)} file(s) written", file=output)
+    return status
+
+
+def run_diff(paths, hosts=(), show_all=False, as_json=False, output=None):
+    # crongui diff: what differs between crontab files, fetch directories and
+    # hosts, lined up by job. a single one is compared with the live crontab
+    output = output or sys.stdout
+    labels, sides = [], []
+    try:
+        for path in paths:
+            if os.path.isdir(path):
+                labels.append(os.path.basename(os.path.normpath(path)))
+                sides.append(host_diff_entries(fetch_host(DirectoryTransport(path))[1]))
+                continue
+            text = read_text(path)
+            if text is None:
+                raise RuntimeError(f"Failed to read {path}")
+            parts = os.path.abspath(path).split(os.sep)
+            labels.append(path)
+            sides.append(parse_crontab_lines(text, "cron.d" in parts or parts[-1] == "crontab" and "etc" in parts))
+        
+        for host, result in for_hosts(fetch_host, [host_transport(spec) for spec in hosts]).items():
+            if isinstance(result, RuntimeError):
+                raise result
+            labels.append(host)
+            sides.append(host_diff_entries(result[1]))
+        
+        if len(sides) == 1:
+            labels.append("live")
+            sides.append(parse_crontab_lines(read_source_text(USER_SOURCE) or ""))
+    except RuntimeError as e:
+        print(f"crongui diff: {e}", file=sys.stderr)
+        return 2
+    if len(sides) < 2:
+        print("crongui diff: give a crontab file, or two or more things to compare", file=sys.stderr)
+        return 2
+    
+    # lines cron would reject aren't jobs, they're listed on their own like audit does
+    invalid = [(label, line) for label, entries in zip(labels, sides) for line, _ in entries if not valid_entry(line)]
+    sides = [[entry for entry in entries if valid_entry(entry[0])] for entries in sides]
+    
+    rows = [(diff_status(cells, labels), cells) for cells in crontab_diff(sides)]
+    counts = Counter(status for status, _ in rows)
+    shown = [(status, cells) for status, cells in rows if show_all or status != "same"]
+    
+    if as_json:
+        json.dump({"sides": labels, "counts": counts, "rows": [
+            {"status": status, "entries": [cell and {"line": cell[0], "owner": cell[1] or ""} for cell in cells]}
+            for status, cells in shown], "invalid": [{"side": label, "line": line} for label, line in invalid]},
+            output, indent=2)
+        output.write("\n")
+    else:
+        for status, cells in shown:
+            print(f"{status}:", file=output)
+            for label, cell in zip(labels, cells):
+                text = "-" if cell is None else f"{cell[0]}  (as {cell[1]})" if cell[1] else cell[0]
+                print(f"  {label}: {text}", file=output)
+        if invalid:
+            print("invalid, not compared:", file=output)
+            for label, line in invalid:
+                print(f"  {label}: {line}", file=output)
+        summary = [f"{count} {status}" for status, count in counts.most_common()]
+        summary += [f"{len(invalid)} invalid"] if invalid else []
+        print(", ".join(summary) or "both empty", file=output)
+    
+    # like diff(1), 1 when they differ. writing a schedule differently doesn't count
+    return int(any(status not in ("same", "equivalent") for status, _ in rows))
+
+
+def run_missed(start, end, concurrency=4, as_json=False, output=None):
+    # crongui missed: the jobs that didn't start while the host was down and
+    # the order to catch them up in
+    output = output or sys.stdout
+    try:
+        start, end = parse_local_time(start), parse_local_time(end)
+    except ValueError as e:
+        print(f"crongui missed: {e}", file=sys.stderr)
+        return 2
+    if end <= start:
+        print("crongui missed: the window ends before it starts", file=sys.stderr)
+        return 2
+    
+    try:
+        sources = load_sources(effective_user())
+    except RuntimeError as e:
+        print(f"crongui missed: {e}", file=sys.stderr)
+        return 1
+    lines = [line for entries in sources.values() for line, _ in entries]
+    meta = [(source, owner) for source, entries in sources.items() for _, owner in entries]
+    zones = entry_zones(lines, meta)
+    missed = missed_runs(lines, zones, start, end)
+    
+    # a duration= in the comment wins over the recorded p95, like the GUI
+    commands = {action["index"]: unwrap_recorded(split_entry(lines[action["index"]])[1]) for action in missed}
+    try:
+        stats = RunStats().summary({job_id(command) for command in commands.values()})
+    except Exception:
+        stats = {}
+    durations = {}
+    for index, command in commands.items():
+        duration = declared_duration(split_entry(lines[index])[2])
+        if duration is None and job_id(command) in stats:
+            duration = stats[job_id(command)]["p95"]
+        if duration is not None:
+            durations[index] = duration
+    
+    plan = replay_plan(missed, concurrency, durations)
+    stamp = lambda timestamp: time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+    
+    if as_json:
+        json.dump({"start": start, "end": end, "concurrency": concurrency, "plan": [
+            dict(action, command=commands[action["index"]], owner=meta[action["index"]][1],
+                 source=meta[action["index"]][0]) for action in plan]}, output, indent=2)
+        output.write("\n")
+        return 0
+    
+    print(f"jobs missed between {stamp(start)} and {stamp(end)}: {len(plan)}", file=output)
+    if plan:
+        print(f"\nreplay order, at most {concurrency} at once:", file=output)
+        print(f"  {'slot':>4}  {'after':>8}  {'missed':>6}  {'first missed':16}  {'last missed':16}  command",
+              file=output)
+    for action in plan:
+        print(f"  {action['slot']:>4}  {format_offset(action['offset']):>8}  {action['count']:>6}  "
+              f"{stamp(action['first']):16}  {stamp(action['last']):16}  {commands[action['index']]}", file=output)
+    return 0
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="crongui", description="a GUI editor for cron")
+    modes = parser.add_subparsers(dest="mode")
+    
+    record_parser = modes.add_parser("record", help="run a command and record its runtime stats")
+    record_parser.add_argument("--db", default=STATS_DB, help="stats database")
+    record_parser.add_argument("--job", required=True, help="job id the run is recorded under")
+    record_parser.add_argument("job_command", nargs=argparse.REMAINDER, help="-- command [args...]")
+    
+    audit_parser = modes.add_parser("audit", help="report on a directory of crontab dumps from many hosts")
+    audit_parser.add_argument("directory", help="dumps as <directory>/<host>/... or <directory>/<host>.cron")
+    audit_parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    audit_parser.add_argument("--batch", type=int, default=16, help="files per worker task")
+    audit_parser.add_argument("--top", type=int, default=20, help="rows per report section")
+    audit_parser.add_argument("--backup-pattern", default=BACKUP_PATTERN,
+                              help="regex for commands that count as backups")
+    audit_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    
+    metrics_parser = modes.add_parser("metrics", help="write schedule metrics for node_exporter's textfile collector")
+    metrics_parser.add_argument("output", help="e.g. /var/lib/node_exporter/textfile_collector/crongui.prom, - for stdout")
+    metrics_parser.add_argument("--heavy", type=int, default=5,
+                                help="job starts in one minute that count as a heavy minute")
+    metrics_parser.add_argument("--state", help="where to cache results between runs")
+    
+    missed_parser = modes.add_parser("missed", help="list the jobs that didn't start during downtime, in replay order")
+    missed_parser.add_argument("start", help="when the host went down, YYYY-MM-DD HH:MM in host time")
+    missed_parser.add_argument("end", nargs="?", default="boot",
+                               help="when it came back, YYYY-MM-DD HH:MM, now or boot (default: boot)")
+    missed_parser.add_argument("--concurrency", type=int, default=4, help="catch-up jobs to run at once")
+    missed_parser.add_argument("--json", action="store_true", help="print the plan as JSON")
+    
+    fetch_parser = modes.add_parser("fetch", help="copy many hosts' crontabs into a directory, all at once")
+    fetch_parser.add_argument("directory", help="written as <directory>/<host>/crontab and .../etc/cron.d/")
+    fetch_parser.add_argument("hosts", nargs="*", help="ssh destinations or dir:<path> (default: hosts in settings.json)")
+    
+    push_parser = modes.add_parser("push", help="write crontabs from a fetch directory back to their hosts")
+    push_parser.add_argument("directory", help="a directory written by crongui fetch")
+    push_parser.add_argument("hosts", nargs="*", help="hosts to push to (default: every host in the directory)")
+    
+    diff_parser = modes.add_parser("diff", help="compare crontabs job by job, e.g. an export with the live crontab")
+    diff_parser.add_argument("paths", nargs="*",
+                             help="crontab files or crongui fetch host directories, oldest first")
+    diff_parser.add_argument("--host", dest="diff_hosts", action="append", default=[],
+                             help="a host to compare, an ssh destination or dir:<path> (repeatable)")
+    diff_parser.add_argument("--all", action="store_true", help="list jobs that are the same too")
+    diff_parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    
+    parser.add_argument("--host", action="append", default=[],
+                        help="another host to edit, an ssh destination or dir:<path> (repeatable)")
+    parser.add_argument("--host-dir", help="edit every host in a crongui fetch directory, without a network")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every action and show the timings in the status bar")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="also append each action's timings to FILE as JSON lines")
+    parser.add_argument("--profile-stats", metavar="FILE",
+                        help="also dump cProfile stats for all actions to FILE on exit")
+    
+    args = parser.parse_args(argv)
+    
+    if args.mode == "record":
+        job_command = args.job_command[1:] if args.job_command[:1] == ["--"] else args.job_command
+        if not job_command:
+            parser.error("record needs a command to run")
+        return record_run(args.db, args.job, job_command)
+    
+    if args.mode == "audit":
+        return run_audit(args.directory, args.workers, args.batch, args.top, args.backup_pattern, args.json)
+    
+    if args.mode == "metrics":
+        return run_metrics(args.output, args.heavy, args.state)
+    
+    if args.mode == "missed":
+        return run_missed(args.start, args.end, args.concurrency, args.json)
+    
+    if args.mode == "diff":
+        return run_diff(args.paths, args.diff_hosts, args.all, args.json)
+    
+    if args.mode == "fetch":
+        return run_fetch(args.directory, args.hosts or load_settings().get("hosts", []))
+    
+    if args.mode == "push":
+        hosts = args.hosts or [os.path.basename(spec) for spec in directory_hosts(args.directory)]
+        return run_push(args.directory, hosts)
+    
+    if tk is None:
+        print("crongui: the GUI needs tkinter (python3-tk), the headless modes "
+              "(record, audit, metrics, missed, diff, fetch, push) work without it", file=sys.stderr)
+        return 1
+    
+    # profiling, from the flags or the environment
+    profiler = None
+    trace_path = args.profile_trace or os.environ.get("CRONGUI_PROFILE_TRACE")
+    stats_path = args.profile_stats or os.environ.get("CRONGUI_PROFILE_STATS")
+    if args.profile or os.environ.get("CRONGUI_PROFILE") or trace_path or stats_path:
+        profiler = ActionProfiler(trace_path, stats_path)
+        profiler.time_dialogs(messagebox, filedialog)
+    
     # create root window
     root = tk.Tk()
     
+    # other hosts, from settings.json and the command line
+    specs = load_settings().get("hosts", []) + args.host
+    if args.host_dir:
+        specs += directory_hosts(args.host_dir)
+    hosts = [host_transport(spec) for spec in dict.fromkeys(specs)]
+    
     # initialize the app
-    app = ModernCronGUI(root)
+    app = ModernCronGUI(root, profiler, hosts)
     
     # configure window behavior
     root.protocol("WM_DELETE_WINDOW", lambda: root.destroy())
@@ -1107,7 +5870,19 @@ def main():
     
     # start the main loop
     root.mainloop()
+    
+    if app.job_runner:
+        app.job_runner.shutdown()
+    
+    # what's on disk now, for showing straight away next time
+    if app.host == LOCAL_HOST:
+        write_snapshot(app.current_user, app.snapshot_sources)
+    for transport in hosts:
+        transport.close()
+    
+    if profiler:
+        profiler.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,39 @@
+import crongui
+
+
+def test_steps_lists_and_ranges_agree():
+    for schedule in ("0,15,30,45 * * * *", "0-59/15 * * * *", "*/15 * * * *"):
+        assert crongui.canonical_schedule(schedule) == "*/15 * * * *"
+
+
+def test_full_day_range_ors_with_the_weekday():
+    # the day field doesn't start with *, so any day of the month matches
+    assert crongui.canonical_schedule("0 0 1-31 * 1") == "0 0 * * *"
+
+
+def test_month_and_weekday_names():
+    assert crongui.canonical_schedule("0 0 * jan,JUL sun") == "0 0 * 1,7 0"
+
+
+def test_weekday_seven_is_sunday():
+    assert crongui.canonical_schedule("0 0 * * 7") == "0 0 * * 0"
+
+
+def test_macros():
+    assert crongui.canonical_schedule("@daily") == "0 0 * * *"
+    assert crongui.canonical_schedule("@hourly") == "0 * * * *"
+    assert crongui.canonical_schedule("@reboot") == "@reboot"
+
+
+def test_invalid_fields():
+    for schedule in ("61 * * * *", "* * *", "0 0 * foo *", "*/0 * * * *"):
+        assert crongui.compile_schedule(schedule) is None
+        # left as they are rather than dropped
+        assert crongui.canonical_schedule(schedule) == schedule
+
+
+def test_job_hash():
+    assert crongui.job_hash("0 0 * * 7", "/bin/x") == crongui.job_hash("0 0 * * sun", "/bin/x")
+    assert crongui.job_hash("@daily", "/bin/x") == crongui.job_hash("0 0 * * *", "/bin/x")
+    assert crongui.job_hash("0 0 * * *", "/bin/x") != crongui.job_hash("0 0 * * *", "/bin/y")
+    assert crongui.job_hash("0 0 * * *", "/bin/x") != crongui.job_hash("0 1 * * *", "/bin/x")
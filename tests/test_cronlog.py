@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import crongui
+
+
+RUN = b"Oct 19 10:00:01 host CRON[1234]: (euan) CMD (/usr/bin/backup.sh)\n"
+FAILED = b"Oct 19 10:00:02 host CRON[1233]: (CRON) error (grandchild #1234 failed with exit status 3)\n"
+NOISE = b"Oct 19 10:00:01 host sshd[99]: Accepted publickey for euan\n"
+
+
+def index_for(tmp_path):
+    # save() makes the index's directory, so it needs one
+    return crongui.CronLogIndex(str(tmp_path / "cache" / "cronlog-index.json"))
+
+
+def test_only_the_new_tail_is_read(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_bytes(NOISE + RUN)
+    index = index_for(tmp_path)
+    index.scan([str(log)])
+    assert index.lookup("/usr/bin/backup.sh")["runs"] == 1
+    
+    with open(log, "ab") as file:
+        file.write(NOISE + RUN)
+    index.scan([str(log)])
+    assert index.lookup("/usr/bin/backup.sh")["runs"] == 2
+    assert index.files[str(log)]["offset"] == log.stat().st_size
+
+
+def test_half_written_line_waits(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_bytes(RUN + RUN[:30])
+    index = index_for(tmp_path)
+    index.scan([str(log)])
+    assert index.files[str(log)]["offset"] == len(RUN)
+    assert index.lookup("/usr/bin/backup.sh")["runs"] == 1
+    
+    with open(log, "ab") as file:
+        file.write(RUN[30:])
+    index.scan([str(log)])
+    assert index.lookup("/usr/bin/backup.sh")["runs"] == 2
+
+
+def test_failure_follows_its_pid(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_bytes(RUN + FAILED)
+    index = index_for(tmp_path)
+    index.scan([str(log)])
+    stats = index.lookup("/usr/bin/backup.sh")
+    assert (stats["failures"], stats["last_exit"]) == (1, 3)
+
+
+def test_iso_journal_timestamps(tmp_path):
+    log = tmp_path / "journal"
+    log.write_bytes(b"2026-10-19T10:00:01+0000 host crond[1234]: (root) CMD (/usr/bin/backup.sh # nightly)\n")
+    index = index_for(tmp_path)
+    index.scan([str(log)])
+    stats = index.lookup("/usr/bin/backup.sh", "nightly")
+    assert stats["last_run"] == datetime.fromisoformat("2026-10-19T10:00:01+00:00").timestamp()
+
+
+def test_saved_offsets_carry_over(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_bytes(RUN)
+    index = index_for(tmp_path)
+    index.scan([str(log)])
+    index.save()
+    
+    with open(log, "ab") as file:
+        file.write(RUN)
+    index = index_for(tmp_path)
+    index.scan([str(log)])
+    assert index.lookup("/usr/bin/backup.sh")["runs"] == 2
+
+
+def test_truncated_log_starts_again(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_bytes(NOISE * 3 + RUN)
+    index = index_for(tmp_path)
+    index.scan([str(log)])
+    log.write_bytes(RUN)
+    index.scan([str(log)])
+    assert index.lookup("/usr/bin/backup.sh")["runs"] == 2
@@ -0,0 +1,74 @@
+import io
+import json
+
+import crongui
+
+
+OLD = """MAILTO=ops
+0 * * * * /bin/a
+*/15 * * * * /bin/b
+0 1 * * * /bin/c
+0 2 * * * /bin/d
+"""
+
+NEW = """MAILTO=dev
+0,15,30,45 * * * * /bin/b
+0 3 * * * /bin/c
+0 4 * * * /bin/e
+0 * * * * /bin/a
+"""
+
+
+def statuses(old, new):
+    sides = [crongui.parse_crontab_lines(old), crongui.parse_crontab_lines(new)]
+    return sorted((crongui.diff_status(cells, ["old", "new"]), crongui.diff_cell(next(filter(None, cells)))[0])
+                  for cells in crongui.crontab_diff(sides))
+
+
+def test_grouping():
+    assert statuses(OLD, NEW) == [
+        ("added", "/bin/e"),
+        ("changed", "/bin/c"),
+        ("changed", "MAILTO"),
+        ("equivalent", "/bin/b"),
+        ("removed", "/bin/d"),
+        ("same", "/bin/a"),
+    ]
+
+
+def test_missing_on_some_hosts():
+    sides = [[("0 * * * * /bin/a", None)], [], [("0 * * * * /bin/a", None)]]
+    assert [crongui.diff_status(cells, ["x", "y", "z"]) for cells in crongui.crontab_diff(sides)] == ["missing on y"]
+
+
+def diff(tmp_path, old, new, as_json=False):
+    (tmp_path / "old.cron").write_text(old)
+    (tmp_path / "new.cron").write_text(new)
+    output = io.StringIO()
+    code = crongui.run_diff([str(tmp_path / "old.cron"), str(tmp_path / "new.cron")], as_json=as_json, output=output)
+    return code, output.getvalue()
+
+
+def test_exit_code(tmp_path):
+    assert diff(tmp_path, OLD, OLD)[0] == 0
+    # writing a schedule differently isn't a difference
+    assert diff(tmp_path, "*/15 * * * * /bin/b\n", "0-59/15 * * * * /bin/b\n")[0] == 0
+    assert diff(tmp_path, OLD, NEW)[0] == 1
+
+
+def test_unreadable_file(tmp_path, capsys):
+    output = io.StringIO()
+    assert crongui.run_diff([str(tmp_path / "nothing.cron"), str(tmp_path / "nor.cron")], output=output) == 2
+    assert capsys.readouterr().err.startswith("crongui diff: ")
+
+
+def test_invalid_lines_are_listed_apart(tmp_path):
+    code, text = diff(tmp_path, OLD, OLD + "bad line\n")
+    assert code == 0
+    assert "invalid, not compared:\n  " in text and text.rstrip().endswith("1 invalid")
+    assert "added" not in text
+    
+    code, text = diff(tmp_path, OLD, OLD + "bad line\n", as_json=True)
+    report = json.loads(text)
+    assert report["invalid"][0]["line"] == "bad line"
+    assert all(row["status"] != "added" for row in report["rows"])
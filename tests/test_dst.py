@@ -0,0 +1,44 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import crongui
+
+
+def local_runs(schedule, zone_name, day, hours=6):
+    # the starts in the first hours of a day, as wall clock times in the zone
+    zone = ZoneInfo(zone_name)
+    start = int(datetime(*day, tzinfo=zone).timestamp())
+    runs = crongui.compile_schedule(schedule).run_times(start, start + hours * 3600, crongui.zone_table(zone_name))
+    return [datetime.fromtimestamp(run, zone).strftime("%H:%M %Z") for run in runs]
+
+
+def test_skipped_time_runs_when_the_clocks_go_forward():
+    # 2:00 to 3:00 doesn't happen on 14 March 2027
+    assert local_runs("30 2 * * *", "America/New_York", (2027, 3, 14)) == ["03:00 EDT"]
+
+
+def test_fixed_time_runs_once_in_the_repeated_hour():
+    # 1:00 to 2:00 happens twice on 7 November 2027
+    assert local_runs("30 1 * * *", "America/New_York", (2027, 11, 7)) == ["01:30 EDT"]
+
+
+def test_hourly_job_runs_in_both_repeated_hours():
+    assert local_runs("15 * * * *", "America/New_York", (2027, 11, 7)) == [
+        "00:15 EDT", "01:15 EDT", "01:15 EST", "02:15 EST", "03:15 EST", "04:15 EST"]
+
+
+def test_cron_tz_reads_the_schedule_in_that_zone():
+    start = int(datetime(2027, 1, 10, tzinfo=ZoneInfo("UTC")).timestamp())
+    run = crongui.next_run("30 9 * * *", "Asia/Tokyo", start)
+    assert datetime.fromtimestamp(run, ZoneInfo("UTC")).strftime("%Y-%m-%d %H:%M") == "2027-01-10 00:30"
+
+
+def test_cron_tz_lines_apply_to_the_entries_below():
+    lines = ["0 1 * * * a", "CRON_TZ=Asia/Tokyo", "0 1 * * * b", "CRON_TZ=", "0 1 * * * c"]
+    meta = [(crongui.USER_SOURCE, "")] * len(lines)
+    zones = crongui.entry_zones(lines, meta)
+    assert (zones[0], zones[2], zones[4]) == ("", "Asia/Tokyo", "")
+
+
+def test_unknown_zone():
+    assert crongui.zone_table("Nowhere/Special") is None
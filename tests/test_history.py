@@ -0,0 +1,77 @@
+import random
+
+import crongui
+
+
+META = (crongui.USER_SOURCE, "")
+
+
+def apply(entries, ops):
+    # what ModernCronGUI.apply_ops does to the entry list
+    entries = list(entries)
+    for op in ops:
+        if op[0] == "modify":
+            entries[op[1]] = op[3]
+        elif op[0] == "insert":
+            entries.insert(op[1], op[2])
+        else:
+            del entries[op[1]]
+    return entries
+
+
+def undo(ops):
+    return [crongui.invert_op(op) for op in reversed(ops)]
+
+
+def round_trip(old, new, start=0):
+    before, after = ["head"] * start, ["tail"]
+    ops = crongui.diff_ops(old, new, start, META)
+    assert apply(before + old + after, ops) == before + new + after
+    assert apply(before + new + after, undo(ops)) == before + old + after
+    return ops
+
+
+def test_insert_delete_and_modify():
+    old = ["0 * * * * a", "0 1 * * * b", "0 2 * * * c", "0 3 * * * d"]
+    new = ["0 * * * * a", "0 1 * * * B", "0 3 * * * d", "0 4 * * * e"]
+    kinds = {op[0] for op in round_trip(old, new)}
+    assert kinds == {"insert", "delete", "modify"}
+
+
+def test_ops_are_small():
+    old = [f"0 {hour} * * * job{hour}" for hour in range(24)]
+    new = old[:5] + ["*/5 * * * * new"] + old[5:12] + old[13:]
+    ops = round_trip(old, new)
+    assert [op[0] for op in ops] == ["delete", "insert"]
+
+
+def test_edits_inside_a_longer_list():
+    round_trip(["a", "b", "c"], ["c", "a", "x", "y"], start=3)
+    round_trip([], ["a", "b"], start=2)
+    round_trip(["a", "b"], [], start=1)
+
+
+def test_random_edits():
+    rng = random.Random(0)
+    for _ in range(200):
+        old = [rng.choice("abcdef") for _ in range(rng.randrange(8))]
+        new = [rng.choice("abcdef") for _ in range(rng.randrange(8))]
+        round_trip(old, new, rng.randrange(3))
+
+
+def test_history_undo_and_redo():
+    history = crongui.EditHistory()
+    entries = ["a", "b", "c"]
+    ops = crongui.diff_ops(entries, ["a", "x", "c", "d"], meta=META)
+    history.record(ops)
+    changed = apply(entries, ops)
+    
+    assert apply(changed, history.undo()) == entries
+    assert history.undo() is None
+    assert apply(entries, history.redo()) == changed
+    assert history.redo() is None
+    
+    # a new edit drops what could have been redone
+    history.undo()
+    history.record(crongui.diff_ops(entries, ["z"], meta=META))
+    assert history.redo() is None
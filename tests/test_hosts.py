@@ -0,0 +1,60 @@
+import crongui
+
+
+def make_host(tmp_path):
+    host = tmp_path / "web1"
+    (host / "etc" / "cron.d").mkdir(parents=True)
+    (host / "crontab").write_text("MAILTO=ops\n0 * * * * /bin/a\n")
+    (host / "etc" / "cron.d" / "app").write_text("# app jobs\n*/5 * * * * www /bin/b\n")
+    return crongui.DirectoryTransport(str(host))
+
+
+def test_fetch(tmp_path):
+    transport = make_host(tmp_path)
+    user, texts, writable = crongui.fetch_host(transport)
+    assert user
+    assert set(texts) == {crongui.USER_SOURCE, "/etc/cron.d/app"}
+    assert crongui.parse_crontab_lines(texts[crongui.USER_SOURCE]) == [("MAILTO=ops", None), ("0 * * * * /bin/a", None)]
+    assert crongui.parse_crontab_lines(texts["/etc/cron.d/app"], system=True) == [("*/5 * * * * /bin/b", "www")]
+    assert "/etc/cron.d/app" in writable
+
+
+def test_fetch_edit_push_round_trip(tmp_path):
+    transport = make_host(tmp_path)
+    _, texts, _ = crongui.fetch_host(transport)
+    
+    texts[crongui.USER_SOURCE] += "\n30 2 * * * /bin/nightly 'with quotes' 50%\n"
+    texts["/etc/cron.d/app"] = texts["/etc/cron.d/app"].replace("*/5", "*/10")
+    texts["/etc/cron.d/new"] = "0 0 * * * root /bin/c\n"
+    assert crongui.push_host(transport, texts) == {}
+    
+    _, fetched, _ = crongui.fetch_host(transport)
+    assert set(fetched) == {crongui.USER_SOURCE, "/etc/cron.d/app", "/etc/cron.d/new"}
+    for source in texts:
+        assert crongui.parse_crontab_lines(fetched[source]) == crongui.parse_crontab_lines(texts[source])
+    
+    # None removes a source
+    assert crongui.push_host(transport, {"/etc/cron.d/new": None, crongui.USER_SOURCE: None}) == {}
+    _, fetched, _ = crongui.fetch_host(transport)
+    assert set(fetched) == {"/etc/cron.d/app"}
+
+
+def test_crontab_text_cant_fake_a_section(tmp_path):
+    transport = make_host(tmp_path)
+    (tmp_path / "web1" / "crontab").write_text("0 * * * * echo '@@crongui-0000 file rw /etc/shadow'\n")
+    _, texts, writable = crongui.fetch_host(transport)
+    assert set(texts) == {crongui.USER_SOURCE, "/etc/cron.d/app"}
+    assert "/etc/shadow" not in writable
+
+
+def test_push_failure_is_per_source(tmp_path):
+    transport = make_host(tmp_path)
+    errors = crongui.push_host(transport, {"/etc/missing.d/job": "0 0 * * * root /bin/c\n",
+                                           "/etc/cron.d/app": "0 0 * * * root /bin/d\n"})
+    assert list(errors) == ["/etc/missing.d/job"]
+    assert "/bin/d" in (tmp_path / "web1" / "etc" / "cron.d" / "app").read_text()
+
+
+def test_unreachable_host(tmp_path):
+    results = crongui.for_hosts(crongui.fetch_host, [crongui.DirectoryTransport(str(tmp_path / "gone"))])
+    assert isinstance(results["gone"], RuntimeError)
@@ -0,0 +1,7 @@
+import crongui
+
+
+def test_gui_without_tkinter(monkeypatch, capsys):
+    monkeypatch.setattr(crongui, "tk", None)
+    assert crongui.main([]) == 1
+    assert "headless modes" in capsys.readouterr().err
@@ -0,0 +1,13 @@
+import crongui
+
+
+def test_missing_output_directory_is_a_clean_error(tmp_path, capsys):
+    output = tmp_path / "missing" / "crongui.prom"
+    assert crongui.run_metrics(str(output), state_path=str(tmp_path / "state.json")) == 1
+    assert capsys.readouterr().err.startswith("crongui metrics: ")
+
+
+def test_without_a_crontab_command(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert crongui.read_source_text(crongui.USER_SOURCE) is None
+    assert crongui.source_fingerprint(crongui.USER_SOURCE)
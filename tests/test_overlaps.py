@@ -0,0 +1,30 @@
+import crongui
+
+
+def problems(command):
+    entry = f"*/5 * * * * {command}"
+    return [overlap["problem"] for overlap in crongui.find_overlaps([entry], {0: 600})]
+
+
+def test_slow_job_overlaps_itself():
+    assert problems("/usr/bin/sync-all") == ["overlaps itself"]
+
+
+def test_flock_nonblock_guard_is_not_reported():
+    assert problems("flock -n /tmp/sync.lock /usr/bin/sync-all") == []
+    assert problems("flock --nonblock /tmp/sync.lock /usr/bin/sync-all") == []
+
+
+def test_blocking_flock_still_piles_up():
+    assert problems("flock /tmp/sync.lock /usr/bin/sync-all") == ["overlaps itself"]
+
+
+def test_guard_inside_the_record_wrapper_counts():
+    assert problems(crongui.wrap_recorded("flock -n /tmp/sync.lock /usr/bin/sync-all", "/tmp/stats.db")) == []
+
+
+def test_macro_schedule_gets_a_suggestion():
+    assert [overlap["index"] for overlap in crongui.find_overlaps(["@hourly /bin/backup # duration=2h"], {0: 7200})] == [0]
+    assert crongui.suggest_interval("@hourly", 7200) == "0 */3 * * *"
+    assert crongui.suggest_interval("@daily", 7200 * 24) is None
+    assert crongui.suggest_interval("@reboot", 60) is None
@@ -0,0 +1,36 @@
+import crongui
+
+
+CRON_D = """# installed by the php package, edit with care
+SHELL=/bin/sh
+
+# clean sessions twice an hour
+09,39 *  * * *  root  [ -x /usr/lib/php/sessionclean ] && /usr/lib/php/sessionclean
+
+# end
+"""
+
+
+def entries(text):
+    return crongui.parse_crontab_lines(text, system=True)
+
+
+def test_unchanged_file_is_written_back_exactly():
+    assert crongui.patch_crontab_text(CRON_D, entries(CRON_D), system=True) == CRON_D
+
+
+def test_comments_and_blank_lines_survive_an_edit():
+    edited = entries(CRON_D) + [("0 4 * * * /usr/bin/new", "www-data")]
+    text = crongui.patch_crontab_text(CRON_D, edited, system=True)
+    assert text.splitlines() == CRON_D.splitlines()[:5] + [
+        "0 4 * * * www-data /usr/bin/new", "", "# end"]
+
+
+def test_removed_entry_keeps_the_comments_around_it():
+    text = crongui.patch_crontab_text(CRON_D, entries(CRON_D)[:1], system=True)
+    assert "sessionclean" not in text
+    assert "# clean sessions twice an hour" in text and "# end" in text
+
+
+def test_user_crontab_from_nothing():
+    assert crongui.patch_crontab_text("", [("*/5 * * * * /bin/true", "me")]) == "*/5 * * * * /bin/true\n"
@@ -0,0 +1,25 @@
+import crongui
+
+
+def actions(*indices):
+    return [{"index": index, "count": 1, "first": 0, "last": 0} for index in indices]
+
+
+def test_known_durations():
+    plan = crongui.replay_plan(actions(0, 1, 2), 2, {0: 60, 1: 30, 2: 10})
+    assert [(action["slot"], action["offset"]) for action in plan] == [(1, 0), (2, 0), (2, 30)]
+
+
+def test_unknown_duration():
+    plan = crongui.replay_plan(actions(0, 1, 2, 3), 2, {1: 30})
+    assert [(action["slot"], action["offset"]) for action in plan] == [(1, 0), (2, 0), (1, None), (2, 30)]
+    assert crongui.format_offset(None) == "unknown"
+
+
+def test_missed_without_a_readable_crontab(tmp_path, monkeypatch, capsys):
+    crontab = tmp_path / "crontab"
+    crontab.write_text("#!/bin/sh\necho 'crontab: permission denied' >&2\nexit 1\n")
+    crontab.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert crongui.run_missed("2026-10-18 22:00", "2026-10-19 06:00") == 1
+    assert capsys.readouterr().err.startswith("crongui missed: ")
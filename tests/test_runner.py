@@ -0,0 +1,36 @@
+import os
+
+import crongui
+
+
+def events_until_exit(runner, run):
+    events = []
+    while True:
+        event = runner.events.get(timeout=10)
+        if event[0] == run:
+            events.append(event)
+            if event[1] == "exit":
+                return events
+
+
+def test_run_exits():
+    runner = crongui.JobRunner(workers=1)
+    run = runner.submit("echo hello", dict(os.environ))
+    events = events_until_exit(runner, run)
+    assert (run, "stdout", "hello\n") in events
+    assert events[-1][2] == 0
+    runner.shutdown()
+
+
+def test_failed_pump_still_exits(monkeypatch):
+    def pump(self, run, process, data):
+        raise OSError("pipe went away")
+    
+    monkeypatch.setattr(crongui.JobRunner, "pump", pump)
+    runner = crongui.JobRunner(workers=1)
+    run = runner.submit("sleep 30", dict(os.environ))
+    events = events_until_exit(runner, run)
+    assert (run, "stderr", "pipe went away\n") in events
+    assert events[-1][2] != 0
+    assert not runner.processes
+    runner.shutdown()
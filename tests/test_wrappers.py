@@ -0,0 +1,76 @@
+import shlex
+
+import crongui
+
+
+SETTINGS = dict(crongui.GOVERNOR_DEFAULTS)
+
+
+def test_shell_syntax_runs_under_a_shell():
+    wrapped = crongui.wrap_command("cd /srv/app && make", SETTINGS)
+    wrappers, inner = crongui.strip_wrappers(wrapped)
+    assert [kind for kind, _ in wrappers] == ["nice", "ionice", "timeout", "flock"]
+    assert inner == "/bin/sh -c 'cd /srv/app && make'"
+    assert crongui.unwrap_shell(inner) == "cd /srv/app && make"
+    # wrapping again changes nothing
+    assert crongui.wrap_command(wrapped, SETTINGS) == wrapped
+
+
+def test_leading_assignment_runs_under_a_shell():
+    wrapped = crongui.wrap_command("FOO=1 bar --now", SETTINGS)
+    inner = crongui.strip_wrappers(wrapped)[1]
+    assert shlex.split(inner) == ["/bin/sh", "-c", "FOO=1 bar --now"]
+
+
+def test_plain_command_is_wrapped_as_is():
+    wrapped = crongui.wrap_command("/usr/bin/backup --full", SETTINGS)
+    assert crongui.strip_wrappers(wrapped)[1] == "/usr/bin/backup --full"
+
+
+def test_recorded_job_stays_recorded():
+    recorded = crongui.wrap_recorded("cd /srv/app && make", "/tmp/stats.db")
+    wrapped = crongui.wrap_command(recorded, SETTINGS)
+    
+    # the record wrapper is still outermost, with the limits inside it
+    inner = crongui.unwrap_recorded(wrapped)
+    assert inner != wrapped
+    assert crongui.recorded_db(wrapped) == "/tmp/stats.db"
+    assert [kind for kind, _ in crongui.strip_wrappers(inner)[0]] == ["nice", "ionice", "timeout", "flock"]
+    assert crongui.unwrap_shell(crongui.strip_wrappers(inner)[1]) == "cd /srv/app && make"
+    
+    # recording it again doesn't wrap it twice
+    assert crongui.wrap_recorded(wrapped) == wrapped
+
+
+def test_bare_percent_is_refused_under_a_shell():
+    try:
+        crongui.wrap_command("date +%s > /tmp/stamp", SETTINGS)
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+def test_staggered_recorded_job_stays_recorded():
+    limited = crongui.wrap_command("/usr/bin/warm-cache", SETTINGS)
+    recorded = crongui.wrap_recorded(limited, "/tmp/stats.db")
+    staggered = crongui.stagger_command(recorded, 30, "/tmp/crongui-boot-1.lock")
+    assert staggered.startswith("sleep 30 && flock /tmp/crongui-boot-1.lock ")
+    
+    # the original comes back, and so does its job id for the stats lookup
+    assert crongui.unwrap_recorded(staggered) == limited
+    assert crongui.recorded_db(staggered) == "/tmp/stats.db"
+    assert crongui.RECORD_RE.match(crongui.split_stagger(staggered)[1]).group(2) == crongui.job_id(limited)
+    
+    # limits already there, recording again and unstaggering leave it as it was
+    assert crongui.wrap_command(staggered, SETTINGS) == staggered
+    assert crongui.wrap_recorded(staggered) == staggered
+    assert crongui.stagger_command(staggered) == recorded
+
+
+def test_limits_go_inside_a_staggered_recorder():
+    recorded = crongui.wrap_recorded("/usr/bin/warm-cache", "/tmp/stats.db")
+    wrapped = crongui.wrap_command(crongui.stagger_command(recorded, 30), SETTINGS)
+    assert wrapped.startswith("sleep 30 && ")
+    inner = crongui.unwrap_recorded(wrapped)
+    assert [kind for kind, _ in crongui.strip_wrappers(inner)[0]] == ["nice", "ionice", "timeout", "flock"]
+    assert crongui.strip_wrappers(inner)[1] == "/usr/bin/warm-cache"